@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Module to take online backups of the Sqlite database while the application keeps serving"""
+
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from utils import read_config
+from worker_pool import worker_pool
+
+# Load configuration
+CONFIG = read_config()
+
+class DatabaseBackup:
+    """Class to copy the database with the SQLite online backup API, verify the copy and rotate old backups"""
+    def __init__(self, db_path, backup_dir, retention=7, compress=True, pages_per_step=256, step_sleep=0.05, max_restarts=5):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.retention = retention
+        self.compress = compress
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.max_restarts = max_restarts
+        self.file_prefix = os.path.splitext(os.path.basename(db_path))[0] + "_"
+        self.lock = threading.Lock()
+        self.last_backup = None
+
+    async def run_backup(self):
+        """Method to back up the database, holding the write lane only while pages are copied. The integrity check,
+        compression and rotation run on the read lane afterwards, so user writes do not wait for them"""
+        if not self.lock.acquire(blocking=False):
+            return False, "A backup is already running"
+
+        started_at = time.perf_counter()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_path = os.path.join(self.backup_dir, f"{self.file_prefix}{timestamp}.sqlite")
+
+        try:
+            success, message = await worker_pool.run_write(self.copy_database, backup_path)
+
+            if success:
+                success, message, backup_path = await worker_pool.run(self.finish_backup, backup_path)
+
+            return self.record_backup(success, message, backup_path if success else None, started_at)
+
+        finally:
+            self.lock.release()
+
+    def copy_database(self, backup_path):
+        """Method to copy the database in steps of a few pages, so writers are only briefly blocked between steps.
+        SQLite restarts the copy from the first page whenever another connection writes between steps, so run this on the write lane
+        to hold back the application's own writes. Gives up after max_restarts restarts caused by other processes"""
+        try:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            logging.info(f"Starting online backup of {self.db_path} to {backup_path}")
+
+            restarts = 0
+            previous_remaining = None
+
+            def count_restarts(status, remaining, total):
+                nonlocal restarts, previous_remaining
+                if previous_remaining is not None and remaining >= previous_remaining:
+                    restarts += 1
+                    logging.warning(f"Backup restarted after a concurrent write ({restarts}/{self.max_restarts})")
+                    if restarts >= self.max_restarts:
+                        raise sqlite3.OperationalError(f"Backup restarted {restarts} times by concurrent writes")
+                previous_remaining = remaining
+
+            source = sqlite3.connect(self.db_path)
+            target = sqlite3.connect(backup_path)
+            try:
+                source.backup(target, pages=self.pages_per_step, progress=count_restarts, sleep=self.step_sleep)
+                target.execute("PRAGMA journal_mode=DELETE")
+
+            finally:
+                target.close()
+                source.close()
+
+            return True, "Database copied"
+
+        except (sqlite3.Error, OSError) as error:
+            self.remove_partial_backup(backup_path)
+            return False, f"Backup failed: {str(error)}"
+
+    def finish_backup(self, backup_path):
+        """Method to verify the integrity of a copied backup, compress it and rotate old backups. Returns the final path of the backup"""
+        try:
+            target = sqlite3.connect(backup_path)
+            try:
+                integrity = target.execute("PRAGMA integrity_check").fetchone()[0]
+
+            finally:
+                target.close()
+
+            if integrity != "ok":
+                os.remove(backup_path)
+                return False, f"Backup failed integrity check: {integrity}", None
+
+            if self.compress:
+                with open(backup_path, "rb") as source_file, gzip.open(f"{backup_path}.gz", "wb") as target_file:
+                    shutil.copyfileobj(source_file, target_file)
+                os.remove(backup_path)
+                backup_path = f"{backup_path}.gz"
+
+            removed_count = self.rotate_backups()
+            message = f"Backup written to {backup_path}. Integrity check passed. Removed {removed_count} old backup(s)"
+
+            return True, message, backup_path
+
+        except (sqlite3.Error, OSError) as error:
+            self.remove_partial_backup(backup_path)
+            self.remove_partial_backup(f"{backup_path}.gz")
+            return False, f"Backup failed: {str(error)}", None
+
+    def remove_partial_backup(self, backup_path):
+        """Method to delete a backup file left behind by a failed backup"""
+        if os.path.exists(backup_path):
+            os.remove(backup_path)
+
+    def record_backup(self, success, message, backup_path, started_at):
+        """Method to keep the outcome of the latest backup for status reporting"""
+        self.last_backup = {"success": success,
+                            "message": message,
+                            "backup_time": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                            "path": backup_path,
+                            "size_bytes": os.path.getsize(backup_path) if backup_path else None,
+                            "duration_seconds": round(time.perf_counter() - started_at, 2)}
+
+        if success:
+            logging.info(message)
+        else:
+            logging.error(message)
+
+        return success, message
+
+    def list_backups(self):
+        """Method to list backup files, newest first"""
+        if not os.path.isdir(self.backup_dir):
+            return []
+
+        backups = [os.path.join(self.backup_dir, file_name) for file_name in os.listdir(self.backup_dir)
+                   if file_name.startswith(self.file_prefix) and file_name.endswith((".sqlite", ".sqlite.gz"))]
+
+        return sorted(backups, reverse=True)
+
+    def rotate_backups(self):
+        """Method to delete backups beyond the configured retention"""
+        expired_backups = self.list_backups()[self.retention:]
+        for backup_path in expired_backups:
+            os.remove(backup_path)
+            logging.debug(f"Removed expired backup {backup_path}")
+
+        return len(expired_backups)
+
+    def get_status(self):
+        """Method to report the latest backup. Falls back to the newest file on disk if no backup has run since startup"""
+        backups = self.list_backups()
+        status = {"backup_dir": self.backup_dir,
+                  "retention": self.retention,
+                  "compress": self.compress,
+                  "backup_count": len(backups),
+                  "running": self.lock.locked(),
+                  "last_backup": self.last_backup}
+
+        if status["last_backup"] is None and backups:
+            status["last_backup"] = {"success": True,
+                                     "message": "Found on disk",
+                                     "backup_time": datetime.fromtimestamp(os.path.getmtime(backups[0])).strftime("%Y-%m-%d %H:%M"),
+                                     "path": backups[0],
+                                     "size_bytes": os.path.getsize(backups[0]),
+                                     "duration_seconds": None}
+
+        return status
+
+
+# Initialize database backup
+database_backup = DatabaseBackup(CONFIG['db_path'],
+                                 CONFIG.get('backup_dir', os.path.join(os.path.dirname(CONFIG['db_path']), "backups")),
+                                 CONFIG.get('backup_retention', 7),
+                                 CONFIG.get('backup_compress', True))
@@ -4,6 +4,9 @@
 import logging
 from datetime import datetime
 import json
+import bisect
+import threading
+from contextlib import contextmanager
 from utils import (read_config,
                    calculate_percentage_reached,
                    generate_unique_id,
@@ -12,7 +15,10 @@ from utils import (read_config,
                    get_formatted_datetime_now,
                    validate_date_format,
                    calculate_elapsed_days,
+                   get_sync_cursor,
+                   clip_installation_intervals,
                    get_formatted_bikes_list,
+                   freeze,
                    get_workplan_names_dict,
                    get_incident_data_tuple,
                    get_workplan_data_tuple,
@@ -20,65 +26,100 @@ from utils import (read_config,
                    generate_incident_title,
                    generate_workplan_title,
                    parse_checkbox_progress,
-                   strip_markdown_syntax)
+                   strip_markdown_syntax,
+                   encode_page_cursor,
+                   decode_page_cursor)
 from strava import Strava
-from database_manager import DatabaseManager
+from database_manager import (DatabaseManager,
+                              COMPONENT_PAGE_SORT_FIELDS,
+                              RIDE_PAGE_SORT_FIELDS,
+                              HISTORY_PAGE_SORT_FIELDS)
+from worker_pool import worker_pool
+from job_queue import job_queue
 
 # Load configuration
 CONFIG = read_config()
 
 # Create database manager object
-database_manager = DatabaseManager()
+database_manager = DatabaseManager(CONFIG.get('ride_insert_batch_size', 500))
 
 # Initialize Strava API
-strava = Strava(CONFIG['strava_tokens'])
+strava = Strava(CONFIG['strava_tokens'], CONFIG.get('strava_max_concurrency', 4))
 
 class BusinessLogic():
     """Class that contains business logic""" 
     def __init__(self, app_state):
         self.app_state = app_state
+        self.navigation_context = {}
+        self.navigation_context_key = None
+        self.navigation_lock = threading.Lock()
+        self.navigation_builders = {"bikes_data": lambda: get_formatted_bikes_list(database_manager.read_bikes()),
+                                    "component_types_data": database_manager.read_all_component_types,
+                                    "all_components_data": database_manager.read_all_components,
+                                    "workplan_names": lambda: get_workplan_names_dict(database_manager),
+                                    "workplans_data": lambda: [get_workplan_data_tuple(workplan, database_manager)
+                                                               for workplan in database_manager.read_all_workplans()],
+                                    "open_incidents": lambda: self.process_incidents(database_manager.read_open_incidents()),
+                                    "planned_workplans": lambda: self.process_workplans(database_manager.read_planned_workplans()),
+                                    "all_collections": self.get_all_collections,
+                                    "component_collection_mapping": self.get_component_collection_mapping}
+
+    def get_navigation_context(self, item):
+        """Method to get a list shared by menus and modals across pages, rebuilt only after database writes or when the minute changes.
+        The same value is handed to every request, so it is frozen: lists become tuples and dictionaries raise on change"""
+        context_key = (database_manager.write_generation, get_formatted_datetime_now())
+
+        with self.navigation_lock:
+            if self.navigation_context_key != context_key:
+                self.navigation_context = {}
+                self.navigation_context_key = context_key
+
+            if item in self.navigation_context:
+                return self.navigation_context[item]
+
+        value = freeze(self.navigation_builders[item]())
+
+        with self.navigation_lock:
+            if self.navigation_context_key == context_key:
+                self.navigation_context[item] = value
+
+        return value
+
+    @contextmanager
+    def unit_of_work(self):
+        """Context manager to run an orchestrated operation as one transaction. Bike status is recomputed once per affected bike just before commit"""
+        outermost = database_manager.read_active_unit_of_work() is None
+
+        with database_manager.unit_of_work() as unit_of_work:
+            yield unit_of_work
+
+            if outermost and not unit_of_work.rolled_back:
+                unit_of_work.deferring = False
+                for bike_id in unit_of_work.deferred_bike_ids:
+                    self.update_bike_status(bike_id)
 
     def get_bike_overview(self):
         """Method to produce payload for page bike overview"""
-        bikes = database_manager.read_bikes()
+        bikes = list(database_manager.read_bikes())
+        bike_summaries = self.get_bike_summaries([bike.bike_id for bike in bikes])
         bikes_data = []
 
         for bike in bikes:
-            bike_name = bike.bike_name
-            bike_id = bike.bike_id
-            bike_retired = bike.bike_retired
-            service_status = bike.service_status
-            total_distance = round(bike.total_distance)
-
-            components = database_manager.read_subset_components(bike_id)
-            count_installed = sum(1 for component in components
-                                  if component.installation_status == "Installed")
-
-            exceeded_max_count = sum(1 for component in components
-                                     if component.installation_status == "Installed" and
-                                     (component.lifetime_status == "Lifetime exceeded" or
-                                      component.service_status == "Service interval exceeded"))
-
-            due_past_threshold_count = sum(1 for component in components
-                                           if component.installation_status == "Installed" and
-                                           (component.lifetime_status == "Due for replacement" or
-                                            component.service_status == "Due for service"))
-
-            compliance_report = self.process_bike_compliance_report(bike_id)
-
-            bikes_data.append((bike_name,
-                               bike_id,
-                               bike_retired,
-                               service_status,
-                               total_distance,
+            count_installed, exceeded_max_count, due_past_threshold_count, compliance_report = bike_summaries[bike.bike_id]
+
+            bikes_data.append((bike.bike_name,
+                               bike.bike_id,
+                               bike.bike_retired,
+                               bike.service_status,
+                               round(bike.total_distance),
                                count_installed,
                                exceeded_max_count,
                                due_past_threshold_count,
                                compliance_report))
 
-        open_incidents = self.process_incidents(database_manager.read_open_incidents())
+        open_incidents = self.get_navigation_context("open_incidents")
 
-        planned_workplans = self.process_workplans(database_manager.read_planned_workplans())
+        planned_workplans = self.get_navigation_context("planned_workplans")
 
         assigned_collections = [collection.bike_id for collection in database_manager.read_all_collections() if collection.bike_id]
 
@@ -89,10 +130,42 @@ class BusinessLogic():
 
         return payload
 
+    def get_bike_summaries(self, bike_ids):
+        """Method to get installed, exceeded and due counts and compliance report per bike, recomputing only bikes changed since last read"""
+        bike_summaries, stale_bike_ids, version = database_manager.bike_summary.get_summaries(bike_ids)
+
+        if stale_bike_ids:
+            component_types_raw = database_manager.read_all_component_types()
+            installed_components = {bike_id: [] for bike_id in stale_bike_ids}
+            for component in database_manager.read_installed_component_status_records_for_bikes(stale_bike_ids):
+                installed_components[component.bike_id].append(component)
+
+            recomputed_summaries = {}
+            for bike_id, components in installed_components.items():
+                exceeded_max_count = sum(1 for component in components
+                                         if component.lifetime_status == "Lifetime exceeded" or
+                                         component.service_status == "Service interval exceeded")
+
+                due_past_threshold_count = sum(1 for component in components
+                                               if component.lifetime_status == "Due for replacement" or
+                                               component.service_status == "Due for service")
+
+                compliance_report = self.process_bike_compliance_report(bike_id, component_types_raw, components)
+
+                recomputed_summaries[bike_id] = (len(components),
+                                                 exceeded_max_count,
+                                                 due_past_threshold_count,
+                                                 compliance_report)
+
+            database_manager.bike_summary.store_summaries(recomputed_summaries, version)
+            bike_summaries.update(recomputed_summaries)
+            logging.debug(f"Recomputed bike summaries for {len(stale_bike_ids)} of {len(bike_ids)} bikes")
+
+        return bike_summaries
+
     def get_bike_details(self, bike_id):
         """Method to produce payload for page bike details"""
-        bikes = database_manager.read_bikes()
-        bikes_data = get_formatted_bikes_list(bikes)
+        bikes_data = self.get_navigation_context("bikes_data")
 
         bike = database_manager.read_single_bike(bike_id)
         bike_data = {"bike_name": bike.bike_name,
@@ -103,10 +176,10 @@ class BusinessLogic():
                     "bike_notes": bike.notes,
                     "oldest_ride": database_manager.read_date_oldest_ride(bike_id)}
 
-        component_types_data = database_manager.read_all_component_types()
+        component_types_data = self.get_navigation_context("component_types_data")
 
-        all_components_data = database_manager.read_all_components()
-        all_collections = self.get_all_collections()
+        all_components_data = self.get_navigation_context("all_components_data")
+        all_collections = self.get_navigation_context("all_collections")
 
         bike_components = database_manager.read_subset_components(bike_id)
         bike_component_data = []
@@ -151,19 +224,18 @@ class BusinessLogic():
 
         compliance_report = self.process_bike_compliance_report(bike_id)
 
-        open_incidents = self.process_incidents(database_manager.read_open_incidents())
+        open_incidents = self.get_navigation_context("open_incidents")
 
-        workplan_names = get_workplan_names_dict(database_manager)
+        workplan_names = self.get_navigation_context("workplan_names")
 
         incident_reports_data = [get_incident_data_tuple(incident, database_manager, workplan_names)
                                  for incident in database_manager.read_open_incidents()]
 
-        planned_workplans = self.process_workplans(database_manager.read_planned_workplans())
+        planned_workplans = self.get_navigation_context("planned_workplans")
 
-        workplans_data = [get_workplan_data_tuple(workplan, database_manager)
-                          for workplan in database_manager.read_all_workplans()]
+        workplans_data = self.get_navigation_context("workplans_data")
 
-        component_collection_names, component_collection_data = self.get_component_collection_mapping()
+        component_collection_names, component_collection_data = self.get_navigation_context("component_collection_mapping")
 
         payload = {"recent_rides": recent_rides_data,
                    "bikes_data": bikes_data,
@@ -185,50 +257,212 @@ class BusinessLogic():
 
         return payload
 
-    def get_component_overview(self):
-        """Method to produce payload for page component overview"""
-        all_components_data = database_manager.read_all_components()
+    def parse_page_request(self, sort_by, order, cursor, limit, sort_fields):
+        """Method to validate sorting, cursor and page size of a list request. Returns success, message and the parsed values"""
+        if sort_by not in sort_fields:
+            return False, f"Invalid sort field '{sort_by}'. Valid fields: {', '.join(sort_fields)}", None
 
-        all_components = database_manager.read_all_components_objects()
-        all_components_display_data = []
-        for component in all_components:
+        if order not in ("asc", "desc"):
+            return False, f"Invalid sort order '{order}'. Valid orders: asc, desc", None
+
+        try:
+            decoded_cursor = decode_page_cursor(cursor)
+        except ValueError as error:
+            return False, str(error), None
+
+        page_size = max(1, min(limit, CONFIG.get('max_page_size', 200)))
+
+        return True, "Page request is valid", (order == "desc", decoded_cursor, page_size)
+
+    def get_components_page(self, status=None, component_type=None, bike_id=None, search=None, sort_by="name", order="asc", cursor=None, limit=50):
+        """Method to produce one page of components for the component list API. Status takes a comma separated list of installation statuses"""
+        success, message, page_request = self.parse_page_request(sort_by, order, cursor, limit, COMPONENT_PAGE_SORT_FIELDS)
+        if not success:
+            return False, message
+
+        descending, decoded_cursor, page_size = page_request
+        installation_statuses = [value.strip() for value in status.split(",")] if status else None
+        components, next_cursor = database_manager.read_components_page(installation_statuses, component_type, bike_id, search,
+                                                                        sort_by, descending, decoded_cursor, page_size)
+        bike_names = database_manager.read_bike_names()
+        component_collection_names, component_collection_data = self.get_navigation_context("component_collection_mapping")
+        component_workplans = self.get_navigation_context("planned_workplans")["component_workplans"]
+        component_incidents = self.get_navigation_context("open_incidents")["component_incidents"]
+
+        items = []
+        for component in components:
             triggers = self.calculate_component_triggers(component)
+            collection_data = component_collection_data.get(component.component_id)
+
+            items.append({"component_id": component.component_id,
+                          "component_name": component.component_name,
+                          "component_type": component.component_type,
+                          "bike_id": component.bike_id,
+                          "bike_name": bike_names.get(component.bike_id, "Not assigned"),
+                          "component_distance": round(component.component_distance) if component.component_distance is not None else None,
+                          "installation_status": component.installation_status,
+                          "lifetime_status": format_component_status(component.lifetime_status),
+                          "service_status": format_component_status(component.service_status),
+                          "lifetime_trigger": triggers["lifetime_trigger"],
+                          "service_trigger": triggers["service_trigger"],
+                          "collection_id": collection_data[0] if collection_data else None,
+                          "collection_name": component_collection_names.get(component.component_id),
+                          "planned_workplan": component.component_id in component_workplans,
+                          "open_incident": component.component_id in component_incidents,
+                          "updated_date": component.updated_date})
+
+        return True, {"items": items,
+                      "next_cursor": encode_page_cursor(next_cursor)}
+
+    def get_rides_page(self, bike_id=None, commute=None, start_date=None, stop_date=None, sort_by="record_time", order="desc", cursor=None, limit=50):
+        """Method to produce one page of rides for the ride list API"""
+        success, message, page_request = self.parse_page_request(sort_by, order, cursor, limit, RIDE_PAGE_SORT_FIELDS)
+        if not success:
+            return False, message
 
-            all_components_display_data.append((component.component_id,
-                                                component.component_type,
-                                                component.component_name,
-                                                round(component.component_distance),
-                                                component.installation_status,
-                                                format_component_status(component.lifetime_status),
-                                                format_component_status(component.service_status),
-                                                database_manager.read_bike_name(component.bike_id),
-                                                format_cost(component.cost),
-                                                triggers["lifetime_trigger"],
-                                                triggers["service_trigger"],
-                                                component.bike_id,
-                                                component.updated_date))
+        descending, decoded_cursor, page_size = page_request
+        rides, next_cursor = database_manager.read_rides_page(bike_id, commute, start_date, stop_date,
+                                                              sort_by, descending, decoded_cursor, page_size)
+
+        items = [{"ride_id": ride.ride_id,
+                  "bike_id": ride.bike_id,
+                  "record_time": ride.record_time,
+                  "ride_name": ride.ride_name,
+                  "ride_distance": ride.ride_distance,
+                  "moving_time": ride.moving_time,
+                  "commute": ride.commute == "True"}
+                 for ride in rides]
+
+        return True, {"items": items,
+                      "next_cursor": encode_page_cursor(next_cursor)}
+
+    def get_history_page(self, component_id=None, bike_id=None, update_reason=None, sort_by="updated_date", order="desc", cursor=None, limit=50):
+        """Method to produce one page of installation log records for the history list API"""
+        success, message, page_request = self.parse_page_request(sort_by, order, cursor, limit, HISTORY_PAGE_SORT_FIELDS)
+        if not success:
+            return False, message
+
+        descending, decoded_cursor, page_size = page_request
+        history_records, next_cursor = database_manager.read_history_page(component_id, bike_id, update_reason,
+                                                                          sort_by, descending, decoded_cursor, page_size)
+
+        items = [{"history_id": record.history_id,
+                  "component_id": record.component_id,
+                  "component_name": record.component_name,
+                  "bike_id": record.bike_id,
+                  "updated_date": record.updated_date,
+                  "update_reason": record.update_reason,
+                  "distance_marker": record.distance_marker}
+                 for record in history_records]
 
-        count_installed = sum(1 for component in all_components_display_data if component[4] == "Installed")
-        count_not_installed = sum(1 for component in all_components_display_data if component[4] == "Not installed")
-        count_retired = sum(1 for component in all_components_display_data if component[4] == "Retired")
+        return True, {"items": items,
+                      "next_cursor": encode_page_cursor(next_cursor)}
 
-        bikes = database_manager.read_bikes()
-        bikes_data = get_formatted_bikes_list(bikes)
+    def get_bike_statistics(self, bike_id):
+        """Method to produce payload for bike usage statistics page"""
+        bikes_data = self.get_navigation_context("bikes_data")
 
-        component_types_data = database_manager.read_all_component_types()
+        usage_statistics = self.get_bike_usage_statistics(bike_id)
+        if usage_statistics is None:
+            return None
 
-        open_incidents = self.process_incidents(database_manager.read_open_incidents())
+        payload = {"bikes_data": bikes_data,
+                   "usage_statistics": usage_statistics}
 
-        planned_workplans = self.process_workplans(database_manager.read_planned_workplans())
+        return payload
 
-        workplans_data = [get_workplan_data_tuple(workplan, database_manager)
-                          for workplan in database_manager.read_all_workplans()]
+    def get_bike_usage_statistics(self, bike_id, recent_weeks=12, recent_months=12):
+        """Method to aggregate daily ride totals of a bike to totals per year, recent months and recent weeks"""
+        bike = database_manager.read_single_bike(bike_id)
+        if not bike:
+            logging.warning(f"Bike not found: {bike_id}")
+            return None
+
+        daily_totals = database_manager.read_ride_daily_totals(bike_id)
+
+        period_keys = {"yearly": lambda ride_date: ride_date[:4],
+                       "monthly": lambda ride_date: ride_date[:7],
+                       "weekly": lambda ride_date: datetime.strptime(ride_date, "%Y-%m-%d").strftime("%G-W%V")}
+
+        periods = {period: {} for period in period_keys}
+        overall = self.create_ride_totals("All time")
+
+        for ride_date, distance, moving_time_seconds, ride_count, commute_distance, commute_count in daily_totals:
+            day_totals = (distance, moving_time_seconds, ride_count, commute_distance, commute_count)
+            self.add_ride_totals(overall, day_totals)
+
+            for period, period_key in period_keys.items():
+                key = period_key(ride_date)
+                if key not in periods[period]:
+                    periods[period][key] = self.create_ride_totals(key)
+                self.add_ride_totals(periods[period][key], day_totals)
+
+        usage_statistics = {"bike_id": bike.bike_id,
+                            "bike_name": bike.bike_name,
+                            "first_ride_date": daily_totals[0][0] if daily_totals else None,
+                            "latest_ride_date": daily_totals[-1][0] if daily_totals else None,
+                            "overall": self.format_ride_totals(overall),
+                            "yearly": [self.format_ride_totals(totals) for totals in reversed(periods["yearly"].values())],
+                            "monthly": [self.format_ride_totals(totals) for totals in reversed(periods["monthly"].values())][:recent_months],
+                            "weekly": [self.format_ride_totals(totals) for totals in reversed(periods["weekly"].values())][:recent_weeks]}
+
+        return usage_statistics
+
+    def create_ride_totals(self, period):
+        """Method to create empty ride totals for a period"""
+        return {"period": period,
+                "distance": 0,
+                "moving_time_seconds": 0,
+                "ride_count": 0,
+                "commute_distance": 0,
+                "commute_count": 0,
+                "active_days": 0}
+
+    def add_ride_totals(self, totals, day_totals):
+        """Method to add the totals of one day with rides to the totals of a period"""
+        distance, moving_time_seconds, ride_count, commute_distance, commute_count = day_totals
+        totals["distance"] += distance
+        totals["moving_time_seconds"] += moving_time_seconds
+        totals["ride_count"] += ride_count
+        totals["commute_distance"] += commute_distance
+        totals["commute_count"] += commute_count
+        totals["active_days"] += 1
+
+    def format_ride_totals(self, totals):
+        """Method to round ride totals of a period for display"""
+        return {"period": totals["period"],
+                "distance": round(totals["distance"]),
+                "moving_hours": round(totals["moving_time_seconds"] / 3600, 1),
+                "ride_count": totals["ride_count"],
+                "average_distance": round(totals["distance"] / totals["ride_count"], 1) if totals["ride_count"] else 0,
+                "commute_distance": round(totals["commute_distance"]),
+                "commute_count": totals["commute_count"],
+                "commute_share": round(totals["commute_distance"] / totals["distance"] * 100) if totals["distance"] else 0,
+                "active_days": totals["active_days"]}
+
+    def get_component_overview(self):
+        """Method to produce payload for page component overview. Component rows are fetched page by page from the component list API"""
+        all_components_data = self.get_navigation_context("all_components_data")
 
-        all_collections = self.get_all_collections()
-        component_collection_names, component_collection_data = self.get_component_collection_mapping()
+        status_counts = database_manager.read_component_status_counts()
+        count_installed = status_counts.get("Installed", 0)
+        count_not_installed = status_counts.get("Not installed", 0)
+        count_retired = status_counts.get("Retired", 0)
+
+        bikes_data = self.get_navigation_context("bikes_data")
+
+        component_types_data = self.get_navigation_context("component_types_data")
+
+        open_incidents = self.get_navigation_context("open_incidents")
+
+        planned_workplans = self.get_navigation_context("planned_workplans")
+
+        workplans_data = self.get_navigation_context("workplans_data")
+
+        all_collections = self.get_navigation_context("all_collections")
+        component_collection_names, component_collection_data = self.get_navigation_context("component_collection_mapping")
 
         payload = {"all_components_data": all_components_data,
-                   "all_components_display_data": all_components_display_data,
                    "bikes_data": bikes_data,
                    "component_types_data": component_types_data,
                    "count_installed": count_installed,
@@ -243,14 +477,36 @@ class BusinessLogic():
 
         return payload
 
+    def get_component_display_data(self, components):
+        """Method to format component list records as rows for component tables"""
+        bike_names = database_manager.read_bike_names()
+        component_display_data = []
+        for component in components:
+            triggers = self.calculate_component_triggers(component)
+
+            component_display_data.append((component.component_id,
+                                           component.component_type,
+                                           component.component_name,
+                                           round(component.component_distance),
+                                           component.installation_status,
+                                           format_component_status(component.lifetime_status),
+                                           format_component_status(component.service_status),
+                                           bike_names.get(component.bike_id, "Not assigned"),
+                                           format_cost(component.cost),
+                                           triggers["lifetime_trigger"],
+                                           triggers["service_trigger"],
+                                           component.bike_id,
+                                           component.updated_date))
+
+        return component_display_data
+
     def get_component_details(self, component_id):
         """Method to produce payload for page component details"""
-        bikes = database_manager.read_bikes()
-        bikes_data = get_formatted_bikes_list(bikes)
+        bikes_data = self.get_navigation_context("bikes_data")
 
-        component_types_data = database_manager.read_all_component_types()
+        component_types_data = self.get_navigation_context("component_types_data")
 
-        all_components_data = database_manager.read_all_components()
+        all_components_data = self.get_navigation_context("all_components_data")
 
         bike_component = database_manager.read_component(component_id)
 
@@ -383,19 +639,18 @@ class BusinessLogic():
         else:
             days_since_service = "Component has never been serviced"
 
-        open_incidents = self.process_incidents(database_manager.read_open_incidents())
+        open_incidents = self.get_navigation_context("open_incidents")
 
-        workplan_names = get_workplan_names_dict(database_manager)
+        workplan_names = self.get_navigation_context("workplan_names")
 
         incident_reports_data = [get_incident_data_tuple(incident, database_manager, workplan_names)
                                  for incident in database_manager.read_open_incidents()]
 
-        planned_workplans = self.process_workplans(database_manager.read_planned_workplans())
+        planned_workplans = self.get_navigation_context("planned_workplans")
 
-        workplans_data = [get_workplan_data_tuple(workplan, database_manager)
-                          for workplan in database_manager.read_all_workplans()]
+        workplans_data = self.get_navigation_context("workplans_data")
         
-        component_collection_names, component_collection_data = self.get_component_collection_mapping()
+        component_collection_names, component_collection_data = self.get_navigation_context("component_collection_mapping")
 
         payload = {"bikes_data": bikes_data,
                    "component_types_data": component_types_data,
@@ -421,11 +676,7 @@ class BusinessLogic():
         not_installed_count = 0
         bike_ids_of_installed = set()
 
-        for component_id in component_ids:
-            component = database_manager.read_component(component_id)
-            if not component:
-                continue
-
+        for component in database_manager.read_component_state_records(component_ids):
             if component.installation_status == "Retired":
                 retired_count += 1
             elif component.installation_status == "Installed":
@@ -496,23 +747,10 @@ class BusinessLogic():
                 'status': status_string}
 
     def get_component_collection_mapping(self):
-        """Method to create component-to-collection mapping dictionaries"""
-        component_collection_names = {}
-        component_collection_data = {}
-        collections = database_manager.read_all_collections()
+        """Method to get component-to-collection mapping dictionaries from the collection index"""
+        collection_index = database_manager.read_component_collection_index()
 
-        for collection in collections:
-            component_ids = json.loads(collection.components) if collection.components else []
-            for component_id in component_ids:
-                component_collection_names[component_id] = collection.collection_name
-                component_collection_data[component_id] = (collection.collection_id,
-                                                           collection.collection_name,
-                                                           collection.components,
-                                                           collection.bike_id,
-                                                           collection.comment,
-                                                           collection.updated_date)
-
-        return component_collection_names, component_collection_data
+        return collection_index["collection_names"], collection_index["collection_data"]
 
     def get_all_collections(self):
         """Method to produce payload for displaying table of all collections"""
@@ -562,8 +800,7 @@ class BusinessLogic():
 
         overview_payload = self.get_component_overview()
 
-        filtered_components = [component for component in overview_payload['all_components_display_data']
-                              if component[0] in component_ids]
+        filtered_components = self.get_component_display_data(database_manager.read_component_list_records(component_ids))
 
         bike_name = database_manager.read_bike_name(collection.bike_id) if collection.bike_id else None
 
@@ -586,17 +823,15 @@ class BusinessLogic():
 
     def get_incident_reports(self):
         """Method to produce payload for page incident reports"""
-        bikes = database_manager.read_bikes()
-        bikes_data = get_formatted_bikes_list(bikes)
-        all_components_data = database_manager.read_all_components()
+        bikes_data = self.get_navigation_context("bikes_data")
+        all_components_data = self.get_navigation_context("all_components_data")
 
-        workplan_names = get_workplan_names_dict(database_manager)
+        workplan_names = self.get_navigation_context("workplan_names")
 
         incident_reports_data = [get_incident_data_tuple(incident, database_manager, workplan_names)
                                  for incident in database_manager.read_all_incidents()]
 
-        workplans_data = [get_workplan_data_tuple(workplan, database_manager)
-                          for workplan in database_manager.read_all_workplans()]
+        workplans_data = self.get_navigation_context("workplans_data")
 
         payload = {"all_components_data": all_components_data,
                    "bikes_data": bikes_data,
@@ -610,6 +845,9 @@ class BusinessLogic():
         bike_incidents = {}
         component_incidents = {}
 
+        incidents = list(incidents) if incidents else []
+        component_ids_by_incident = database_manager.read_incident_component_ids([incident.incident_id for incident in incidents])
+
         if incidents:
             for incident in incidents:
                 incident_id = incident.incident_id
@@ -627,10 +865,8 @@ class BusinessLogic():
                         bike_incidents[bike_id]["incident_count"] += 1
                         bike_incidents[bike_id]["incident_ids"].append(incident_id)
 
-                if incident.incident_affected_component_ids:
-                    component_ids = json.loads(incident.incident_affected_component_ids)
-
-                    for component_id in component_ids:
+                if incident_id in component_ids_by_incident:
+                    for component_id in component_ids_by_incident[incident_id]:
                         if component_id not in component_incidents:
                             component_incidents[component_id] = {"incident_count": 0}
 
@@ -653,12 +889,10 @@ class BusinessLogic():
 
     def get_workplans(self):
         """Method to produce payload for page of all workplans"""
-        bikes = database_manager.read_bikes()
-        bikes_data = get_formatted_bikes_list(bikes)
-        all_components_data = database_manager.read_all_components()
+        bikes_data = self.get_navigation_context("bikes_data")
+        all_components_data = self.get_navigation_context("all_components_data")
 
-        workplans_data = [get_workplan_data_tuple(workplan, database_manager)
-                          for workplan in database_manager.read_all_workplans()]
+        workplans_data = self.get_navigation_context("workplans_data")
 
         payload = {"all_components_data": all_components_data,
                    "bikes_data": bikes_data,
@@ -672,6 +906,9 @@ class BusinessLogic():
         bike_workplans = {}
         component_workplans = {}
 
+        workplans = list(workplans) if workplans else []
+        component_ids_by_workplan = database_manager.read_workplan_component_ids([workplan.workplan_id for workplan in workplans])
+
         if workplans:
             for workplan in workplans:
                 workplan_id = workplan.workplan_id
@@ -687,10 +924,8 @@ class BusinessLogic():
                         bike_workplans[bike_id]["workplan_count"] += 1
                         bike_workplans[bike_id]["workplan_ids"].append(workplan_id)
 
-                if workplan.workplan_affected_component_ids:
-                    component_ids = json.loads(workplan.workplan_affected_component_ids)
-
-                    for component_id in component_ids:
+                if workplan_id in component_ids_by_workplan:
+                    for component_id in component_ids_by_workplan[workplan_id]:
                         if component_id not in component_workplans:
                             component_workplans[component_id] = {"workplan_count": 0}
 
@@ -713,9 +948,8 @@ class BusinessLogic():
 
     def get_workplan_details(self, workplan_id):
         """Method to produce payload for workplan details page"""
-        bikes = database_manager.read_bikes()
-        bikes_data = get_formatted_bikes_list(bikes)
-        all_components_data = database_manager.read_all_components()
+        bikes_data = self.get_navigation_context("bikes_data")
+        all_components_data = self.get_navigation_context("all_components_data")
 
         workplan = database_manager.read_single_workplan(workplan_id)
 
@@ -744,7 +978,7 @@ class BusinessLogic():
         all_components_serviced = self.workplan_check_component_services(workplan_id,
                                                                          affected_component_ids)
 
-        workplan_names = get_workplan_names_dict(database_manager)
+        workplan_names = self.get_navigation_context("workplan_names")
 
         incidents = database_manager.read_incidents_by_workplan(workplan_id)
         incidents_data = [get_incident_data_tuple(incident, database_manager, workplan_names)
@@ -773,8 +1007,7 @@ class BusinessLogic():
                                                                        workplan.workplan_affected_bike_id,
                                                                        affected_component_ids)
 
-        workplans_data = [get_workplan_data_tuple(workplan, database_manager)
-                          for workplan in database_manager.read_all_workplans()]
+        workplans_data = self.get_navigation_context("workplans_data")
 
         payload = {"workplan_data": workplan_data,
                    "all_components_serviced": all_components_serviced,
@@ -809,30 +1042,9 @@ class BusinessLogic():
 
     def workplan_get_linkable_incidents(self, workplan_id, affected_bike_id, affected_component_ids):
         """Method to get incidents that can be linked to a workplan"""
-        all_incidents = database_manager.read_all_incidents()
-
         linkable_incidents = []
 
-        for incident in all_incidents:
-            if incident.incident_status != "Open":
-                continue
-
-            if incident.workplan_id:
-                continue
-
-            incident_component_ids = parse_json_string(incident.incident_affected_component_ids)
-
-            affects_bike = incident.incident_affected_bike_id == affected_bike_id if affected_bike_id else False
-
-            affects_components = False
-            if incident_component_ids and affected_component_ids:
-                incident_components_set = set(incident_component_ids)
-                workplan_components_set = set(affected_component_ids)
-                affects_components = bool(incident_components_set.intersection(workplan_components_set))
-
-            if not (affects_bike or affects_components):
-                continue
-
+        for incident in database_manager.read_linkable_incidents(affected_bike_id, affected_component_ids):
             incident_date = incident.incident_date.split(' ')[0] if incident.incident_date else "-"
             severity = incident.incident_severity
 
@@ -855,49 +1067,128 @@ class BusinessLogic():
 
         return payload
 
-    async def update_rides_bulk(self, mode):
-        """Method to create or update ride data in bulk to database"""
+    def submit_strava_sync(self, mode):
+        """Method to queue a Strava sync as a background job. A request joins a queued or running sync that covers it,
+        any sync covering incremental and recent requests and only a full sync covering a full one"""
+        return job_queue.submit("strava_sync",
+                                {"mode": mode},
+                                lambda job: self.update_rides_bulk(mode, job),
+                                covered_by=lambda job: job.job_type == "strava_sync" and (mode != "all" or job.params["mode"] == "all"))
+
+    def submit_refresh_all_bikes(self):
+        """Method to queue a refresh of all bikes from Strava as a background job, joining one already queued or running"""
+        return job_queue.submit("refresh_all_bikes",
+                                {},
+                                self.refresh_all_bikes,
+                                covered_by=lambda job: job.job_type == "refresh_all_bikes")
+
+    async def update_rides_bulk(self, mode, progress=None):
+        """Method to create or update ride data in bulk to database. Progress, if given, receives the stage and counts of pages, rides and components"""
         logging.info(f"Retrieving rides from Strava. Mode set to: {mode}.")
-        await strava.get_rides(mode)
-        logging.debug(f'There are {len(strava.payload_rides)} rides in the list.')
+        if progress:
+            progress.update_progress(stage="Fetching and writing rides", pages_fetched=0, rides_fetched=0, rides_written=0, rides_changed=0)
 
-        success, message = database_manager.write_update_rides_bulk(strava.payload_rides)
+        if mode == "incremental":
+            latest_ride = database_manager.read_latest_ride_record()
+
+            if latest_ride:
+                overlap_hours = CONFIG.get('strava_sync_overlap_hours', 24)
+                logging.info(f"Latest stored ride was recorded {latest_ride.record_time}. Retrieving rides from {overlap_hours} hours before that.")
+                after_timestamp = get_sync_cursor(latest_ride.record_time, overlap_hours)
+
+            else:
+                logging.info("No rides stored yet. Retrieving recent rides instead.")
+                mode = "recent"
+                after_timestamp = None
+
+        else:
+            after_timestamp = None
+
+        write_counters_before = database_manager.read_write_counters()
+        rides_written = 0
+        changed_ride_ids = set()
+        changed_bike_ids = set()
+        success, message = True, "No rides to update."
+
+        rides = strava.iter_rides(mode, after_timestamp, progress)
+        try:
+            async for page_rides in rides:
+                if not page_rides:
+                    continue
+
+                success, message, page_changed_ride_ids, page_changed_bike_ids = await worker_pool.run_write(database_manager.write_update_rides_bulk, page_rides)
+
+                if not success:
+                    break
+
+                rides_written += len(page_rides)
+                changed_ride_ids.update(page_changed_ride_ids)
+                changed_bike_ids.update(page_changed_bike_ids)
+                if progress:
+                    progress.update_progress(rides_written=rides_written, rides_changed=len(changed_ride_ids))
+
+        except Exception as error:
+            success, message = False, f"Retrieving rides from Strava failed after {rides_written} rides were written, rides are incomplete: {str(error)}"
+
+        finally:
+            await rides.aclose()
 
         if success:
+            message = f"Rides table updated successfully. Processed {rides_written} rides, {len(changed_ride_ids)} new or changed on {len(changed_bike_ids)} bikes."
             logging.info(f"Bulk update of database OK: {message}")
         else:
             logging.error(f"Bulk update of database failed: {message}")
 
+        rides_success, rides_message = success, message
+
         if mode == "all":
             logging.info("Refreshing all bikes from Strava")
+            if progress:
+                progress.update_progress(stage="Refreshing bikes")
             await strava.get_bikes(database_manager.read_unique_bikes())
-            success, message = database_manager.write_update_bikes(strava.payload_bikes)
+            success, message = await worker_pool.run_write(database_manager.write_update_bikes, strava.payload_bikes)
 
             if success:
                 logging.info(f"Bike update OK: {message}")
             else:
                 logging.error(f"Bike update failed failed: {message}")
 
-            success, message = self.update_components_distance_iterator(database_manager.read_unique_bikes())
+            if progress:
+                progress.update_progress(stage="Recomputing components", bikes_refreshed=len(strava.payload_bikes))
+            success, message = await worker_pool.run_write(self.update_components_distance_iterator, changed_bike_ids, progress)
 
-        if mode == "recent":
+        if mode in ("recent", "incremental"):
             if len(strava.bike_ids_recent_rides) > 0:
                 logging.info("Refreshing bikes used in recent rides from Strava")
+                if progress:
+                    progress.update_progress(stage="Refreshing bikes")
                 await strava.get_bikes(strava.bike_ids_recent_rides)
-                success, message = database_manager.write_update_bikes(strava.payload_bikes)
+                success, message = await worker_pool.run_write(database_manager.write_update_bikes, strava.payload_bikes)
 
                 if success:
                     logging.info(f"Bike update OK: {message}")
                 else:
                     logging.error(f"Bike update failed failed: {message}")
 
-                success, message = self.update_components_distance_iterator(strava.bike_ids_recent_rides)
+                if progress:
+                    progress.update_progress(stage="Recomputing components", bikes_refreshed=len(strava.payload_bikes))
+                success, message = await worker_pool.run_write(self.update_components_distance_iterator, changed_bike_ids, progress)
 
             else:
                 logging.warning("No bikes found in recent activities.")
 
-        self.app_state.strava_last_pull = datetime.now()
-        self.set_time_strava_last_pull()
+        await worker_pool.run_write(self.checkpoint_database)
+
+        write_counters_after = database_manager.read_write_counters()
+        logging.info(f"Status writes during sync: {write_counters_after['applied'] - write_counters_before['applied']} applied, "
+                     f"{write_counters_after['skipped'] - write_counters_before['skipped']} skipped as unchanged.")
+
+        if not rides_success:
+            success, message = False, rides_message
+
+        else:
+            self.app_state.strava_last_pull = datetime.now()
+            self.set_time_strava_last_pull()
 
         if success:
             message = f"Update of rides, bikes and components successful: {message}"
@@ -908,23 +1199,109 @@ class BusinessLogic():
 
         return success, message
 
-    def update_components_distance_iterator(self, bike_ids):
-        """Method to determine which selection of components to update"""
+    def update_components_distance_iterator(self, bike_ids, progress=None):
+        """Method to recompute distance and status for installed components on given bikes using set-based queries"""
         try:
+            bike_ids = list(bike_ids)
             logging.info(f'Iterating over bikes to find components to update. Received {len(bike_ids)} bikes.')
-            for bike_id in bike_ids:
-                for component in database_manager.read_subset_installed_components(bike_id):
-                    latest_history_record = database_manager.read_latest_history_record(component.component_id)
-                    current_component_distance = latest_history_record.distance_marker
-                    matching_rides = database_manager.read_matching_rides(component.bike_id, latest_history_record.updated_date)
-                    current_component_distance += sum(ride.ride_distance for ride in matching_rides)
-                    self.update_component_distance(component.component_id, current_component_distance)
 
-            return True, f"Processed components for {len(bike_ids)} bikes."
+            components = list(database_manager.read_installed_components_for_bikes(bike_ids))
+            component_ids = [component.component_id for component in components]
+
+            history_by_component = {}
+            for record in database_manager.read_history_for_components(component_ids):
+                history_by_component.setdefault(record.component_id, []).append(record)
+            for records in history_by_component.values():
+                records.sort(key=lambda x: x.updated_date)
+
+            latest_service_by_component = {}
+            for record in database_manager.read_services_for_components(component_ids):
+                latest_service_by_component.setdefault(record.component_id, record)
+
+            intervals_by_component = database_manager.read_installation_intervals_for_components(component_ids)
+
+            updated_components = {}
+            changed_components = []
+            for component in components:
+                sorted_history = history_by_component.get(component.component_id)
+                if not sorted_history:
+                    logging.warning(f"Component {component.component_name} is installed but has no installation records. Skipping distance update")
+                    continue
+
+                previous_status = self.get_component_status_fields(component)
+
+                latest_history_record = sorted_history[-1]
+                current_component_distance = latest_history_record.distance_marker
+                current_component_distance += database_manager.read_sum_distance_subset_rides(component.bike_id, latest_history_record.updated_date, None)
+                component.component_distance = current_component_distance + component.component_distance_offset
+
+                (component.lifetime_remaining,
+                 component.lifetime_status,
+                 component.lifetime_remaining_days) = self.compute_component_lifetime_status(component, sorted_history[0])
+
+                (component.service_next,
+                 component.service_status,
+                 component.service_next_days) = self.compute_component_service_status(component,
+                                                                                     latest_service_by_component.get(component.component_id),
+                                                                                     sorted_history,
+                                                                                     intervals_by_component.get(component.component_id, []))
+
+                updated_components[component.component_id] = component
+                if self.get_component_status_fields(component) != previous_status:
+                    changed_components.append(component)
+
+            database_manager.count_writes(applied=len(changed_components),
+                                          skipped=len(updated_components) - len(changed_components))
+
+            if progress:
+                progress.update_progress(components_recomputed=len(updated_components))
+
+            if changed_components:
+                success, message = database_manager.write_component_status_bulk(changed_components)
+                if not success:
+                    logging.error(message)
+                    return False, message
+                logging.debug(message)
+
+            updated_bike_ids = list({component.bike_id for component in updated_components.values()})
+            components_by_bike = {bike_id: [] for bike_id in updated_bike_ids}
+            for component in database_manager.read_components_for_bikes(updated_bike_ids):
+                components_by_bike[component.bike_id].append(updated_components.get(component.component_id, component))
+
+            bikes = list(database_manager.read_bikes_for_ids(updated_bike_ids))
+            changed_bikes = []
+            for bike in bikes:
+                service_status = self.compute_bike_status(components_by_bike[bike.bike_id])
+                logging.debug(f"New status for bike {bike.bike_name}: {service_status}")
+                if service_status != bike.service_status:
+                    bike.service_status = service_status
+                    changed_bikes.append(bike)
+
+            database_manager.count_writes(applied=len(changed_bikes),
+                                          skipped=len(bikes) - len(changed_bikes))
+
+            if changed_bikes:
+                success, message = database_manager.write_bike_service_status_bulk(changed_bikes)
+                if not success:
+                    logging.error(message)
+                    return False, message
+                logging.info(f"Bike update successful: {message}")
+
+            return True, f"Processed {len(updated_components)} components for {len(bike_ids)} bikes."
 
         except Exception as error:
             return False, {str(error)}
 
+    def get_component_status_fields(self, component):
+        """Method to get the distance and status fields of a component, used to detect if a recompute changed anything"""
+        return (component.component_distance,
+                component.lifetime_remaining,
+                component.lifetime_status,
+                component.lifetime_remaining_days,
+                component.service_next,
+                component.service_status,
+                component.service_next_days)
+
     def update_component_distance(self, component_id, current_distance):
         """Method to update component table with distance from ride table"""        
         component = database_manager.read_component(component_id)
@@ -972,6 +1349,26 @@ class BusinessLogic():
         """Method to update component table with lifetime status"""
         logging.debug(f"Updating lifetime status for component {component.component_name}.")
 
+        oldest_record = None
+        if component.lifetime_expected_days:
+            oldest_record = database_manager.read_oldest_history_record(component.component_id)
+
+        lifetime_remaining, final_status, lifetime_remaining_days = self.compute_component_lifetime_status(component, oldest_record)
+
+        success, message = database_manager.write_component_lifetime_status(component,
+                                                                            lifetime_remaining,
+                                                                            final_status,
+                                                                            lifetime_remaining_days)
+
+        if success:
+            logging.debug(f"Component lifetime status update successful: {message}")
+        else:
+            logging.error(f"Component lifetime status update failed: {message}")
+
+        return success, message
+
+    def compute_component_lifetime_status(self, component, oldest_record):
+        """Method to compute remaining lifetime and lifetime status for a component without touching the database"""
         distance_status = "Not defined"
         days_status = "Not defined"
         lifetime_remaining = None
@@ -984,7 +1381,6 @@ class BusinessLogic():
                                                             component.threshold_km)
 
         if component.lifetime_expected_days:
-            oldest_record = database_manager.read_oldest_history_record(component.component_id)
             if oldest_record:
                 first_install_date = oldest_record.updated_date
 
@@ -1002,45 +1398,48 @@ class BusinessLogic():
 
         final_status = self.determine_worst_status(distance_status, days_status)
 
-        success, message = database_manager.write_component_lifetime_status(component,
-                                                                            lifetime_remaining,
-                                                                            final_status,
-                                                                            lifetime_remaining_days)
+        return lifetime_remaining, final_status, lifetime_remaining_days
+
+    def update_component_service_status(self, component):
+        """Method to update component table with service status"""
+        logging.debug(f"Updating service status for component {component.component_name}.")
+
+        latest_service_record = None
+        sorted_history = []
+        installation_intervals = []
+        if component.service_interval or component.service_interval_days:
+            latest_service_record = database_manager.read_latest_service_record(component.component_id)
+            history_records = database_manager.read_subset_component_history(component.component_id)
+            sorted_history = sorted(history_records, key=lambda x: x.updated_date)
+            installation_intervals = database_manager.read_installation_intervals(component.component_id)
+
+        service_next, final_status, service_next_days = self.compute_component_service_status(component,
+                                                                                              latest_service_record,
+                                                                                              sorted_history,
+                                                                                              installation_intervals)
+
+        success, message = database_manager.write_component_service_status(component, service_next, final_status, service_next_days)
 
         if success:
-            logging.debug(f"Component lifetime status update successful: {message}")
+            logging.debug(f"Component service status update successful: {message}")
         else:
-            logging.error(f"Component lifetime status update failed: {message}")
+            logging.error(f"Component service status update failed: {message}")
 
         return success, message
 
-    def update_component_service_status(self, component):
-        """Method to update component table with service status"""
-        logging.debug(f"Updating service status for component {component.component_name}.")
-        
+    def compute_component_service_status(self, component, latest_service_record, sorted_history, installation_intervals):
+        """Method to compute distance and days to next service and service status for a component from its latest service and sorted installation log"""
         if component.service_interval:
-            latest_service_record = database_manager.read_latest_service_record(component.component_id)
-            latest_history_record = database_manager.read_latest_history_record(component.component_id)
+            latest_history_record = sorted_history[-1] if sorted_history else None
 
             if component.installation_status == "Installed":
                 if latest_service_record is None:
                     logging.debug(f'No service record found for component {component.component_name}. Using distance from installation log and querying distance from installation date to today.')
                     distance_since_service = latest_history_record.distance_marker
-                    matching_rides = database_manager.read_matching_rides(component.bike_id, latest_history_record.updated_date)
-                    distance_since_service += sum(ride.ride_distance for ride in matching_rides)
+                    distance_since_service += database_manager.read_sum_distance_subset_rides(component.bike_id, latest_history_record.updated_date, None)
 
                 elif latest_service_record:
                     logging.debug(f'Service record found for component {component.component_name}. Processing installation periods since service.')
-                    
-                    history_records = database_manager.read_subset_component_history(component.component_id)
-                    sorted_history = sorted(history_records, key=lambda x: x.updated_date)
-                    
-                    distance_since_service = 0
-                    
-                    logging.debug(f"Finding installation status at time of service for component {component.component_name}.")
-                    service_time_status = next((record for record in reversed(sorted_history) 
-                                                if record.updated_date <= latest_service_record.service_date),
-                                                None)
 
                     logging.debug(f"Finding relevant bikes since service date for component {component.component_name}.")
                     relevant_bikes = {record.bike_id for record in sorted_history 
@@ -1054,28 +1453,12 @@ class BusinessLogic():
                         relevant_bikes.add(component.bike_id)
                     
                     logging.debug(f"Found {len(relevant_bikes)} bikes to check for rides to calculate distance to next service")
-                    
-                    logging.debug(f"Querying rides for all relevant bikes to calculate distance to next service")
-                    all_rides = []
-                    for bike_id in relevant_bikes:
-                        matching_rides = database_manager.read_matching_rides(bike_id, latest_service_record.service_date)
-                        all_rides.extend(matching_rides)
-
-                    all_rides.sort(key=lambda x: x.record_time)
-
-                    logging.debug(f"Filtering rides and installation status to only count rides when component was installed")
-                    for ride in all_rides:
-                        current_status = next(
-                            (record for record in reversed(sorted_history)
-                            if record.updated_date <= ride.record_time),
-                            service_time_status)
-
-                        if (current_status and 
-                            current_status.update_reason == "Installed" and
-                            current_status.bike_id == ride.bike_id):
-                            distance_since_service += ride.ride_distance
-                            logging.debug(f"Ride on {ride.record_time} of {ride.ride_distance} km from bike {ride.bike_id} is relevant for calculating distance to next service")    
-                
+
+                    distance_since_service = self.sum_installation_intervals_distance(installation_intervals,
+                                                                                      relevant_bikes,
+                                                                                      latest_service_record.service_date,
+                                                                                      None)
+
             elif component.installation_status != "Installed":
                 if latest_service_record is None:
                     logging.debug(f'Component {component.component_name} has been uninstalled and there are no previous services. Setting distance since service to distance at the time of uninstallation.')
@@ -1088,16 +1471,6 @@ class BusinessLogic():
 
                     else:
                         logging.debug(f'Component {component.component_name} was serviced before uninstall. Processing installation periods from service to uninstall.')
-                        
-                        history_records = database_manager.read_subset_component_history(component.component_id)
-                        sorted_history = sorted(history_records, key=lambda x: x.updated_date)
-                        
-                        distance_since_service = 0
-
-                        logging.debug(f"Finding installation status at time of service for component {component.component_name}.")
-                        service_time_status = next((record for record in reversed(sorted_history) 
-                                                if record.updated_date <= latest_service_record.service_date),
-                                                None)
 
                         logging.debug(f"Finding relevant bikes between service date and uninstall date for component {component.component_name}.")
                         relevant_bikes = {record.bike_id for record in sorted_history 
@@ -1106,30 +1479,11 @@ class BusinessLogic():
                                             record.bike_id is not None)}
                         
                         logging.debug(f"Found {len(relevant_bikes)} bikes to check for rides to calculate distance to next service")
-                        
-                        logging.debug(f"Querying rides for all relevant bikes to calculate distance to next service")
-                        all_rides = []
-                        for bike_id in relevant_bikes:
-                            matching_rides = database_manager.read_matching_rides(bike_id, latest_service_record.service_date)
-                            all_rides.extend(matching_rides)
-                        
-                        all_rides.sort(key=lambda x: x.record_time)
 
-                        logging.debug(f"Filtering rides and installation status to only count rides when component was installed and before uninstall date")
-                        for ride in all_rides:
-                            if ride.record_time > component.updated_date:
-                                break
-
-                            current_status = next(
-                                (record for record in reversed(sorted_history)
-                                if record.updated_date <= ride.record_time),
-                                service_time_status)
-
-                            if (current_status and 
-                                current_status.update_reason == "Installed" and
-                                current_status.bike_id == ride.bike_id):
-                                distance_since_service += ride.ride_distance
-                                logging.debug(f"Ride on {ride.record_time} of {ride.ride_distance} km from bike {ride.bike_id} is relevant for calculating distance to next service")
+                        distance_since_service = self.sum_installation_intervals_distance(installation_intervals,
+                                                                                          relevant_bikes,
+                                                                                          latest_service_record.service_date,
+                                                                                          component.updated_date)
 
             service_next = component.service_interval - distance_since_service
             distance_status = self.compute_component_status("service", service_next, component.threshold_km)
@@ -1141,12 +1495,10 @@ class BusinessLogic():
         service_next_days = None
 
         if component.service_interval_days:
-            latest_service_record = database_manager.read_latest_service_record(component.component_id)
-
             if latest_service_record:
                 last_service_date = latest_service_record.service_date
             else:
-                oldest_record = database_manager.read_oldest_history_record(component.component_id)
+                oldest_record = sorted_history[0] if sorted_history else None
                 if oldest_record:
                     last_service_date = oldest_record.updated_date
                 else:
@@ -1165,14 +1517,20 @@ class BusinessLogic():
 
         final_status = self.determine_worst_status(distance_status, days_status)
 
-        success, message = database_manager.write_component_service_status(component, service_next, final_status, service_next_days)
+        return service_next, final_status, service_next_days
 
-        if success:
-            logging.debug(f"Component service status update successful: {message}")
-        else:
-            logging.error(f"Component service status update failed: {message}")
+    def sum_installation_intervals_distance(self, installation_intervals, relevant_bikes, start_date, stop_date):
+        """Method to sum distance ridden on relevant bikes while the component was installed, from start date up to but not including stop date"""
+        distance = 0
+        for bike_id, interval_start, interval_stop in clip_installation_intervals(installation_intervals, start_date, stop_date):
+            if bike_id not in relevant_bikes:
+                continue
 
-        return success, message
+            period_distance = database_manager.read_sum_distance_subset_rides(bike_id, interval_start, interval_stop, include_stop=False)
+            distance += period_distance
+            logging.debug(f"Added {period_distance} km from bike {bike_id} ({interval_start} to {interval_stop}) for calculating distance to next service")
+
+        return distance
 
     def update_component_lifetime_service_alternate(self, mode, component_id, lifetime_expected, service_interval, distance_offset):
         """Method to update component lifetime and service status when no installation records exist"""
@@ -1266,11 +1624,32 @@ class BusinessLogic():
             logging.warning(f"Component is not assigned to any bike. Skipping update of bike status")
             return False, "Component is not assigned to any bike. Skipping update of bike status"
 
+        unit_of_work = database_manager.read_active_unit_of_work()
+        if unit_of_work is not None and unit_of_work.deferring:
+            unit_of_work.defer_bike_status(bike_id)
+            logging.debug(f"Status update for bike {bike_id} deferred until the running operation completes")
+            return True, f"Status update for bike {bike_id} deferred"
+
         bike = database_manager.read_single_bike(bike_id)
-        components = database_manager.read_subset_components(bike_id)            
-        
+        components = database_manager.read_component_status_records(bike_id)
+
         logging.debug(f"Updating bike status for bike {bike.bike_name} with id {bike.bike_id}.")
-        
+
+        service_status = self.compute_bike_status(components)
+
+        logging.debug(f"New status for bike {bike.bike_name}: {service_status}")
+
+        success, message = database_manager.write_bike_service_status(bike, service_status)
+
+        if success:
+            logging.info(f"Bike update successful: {message}")
+        else:
+            logging.error(f"Bike update failed: {message}")
+
+        return success, message
+
+    def compute_bike_status(self, components):
+        """Method to compute bike status from the service and lifetime status of its components"""
         component_status = {"exceeded_max": 0,
                             "due_past_threshold": 0,
                             "ok": 0}
@@ -1278,7 +1657,7 @@ class BusinessLogic():
         count_installed = 0
         count_retired = 0
 
-        if components.exists():
+        if components:
             for component in components:
                 if component.installation_status == "Installed":
                     count_installed += 1
@@ -1300,20 +1679,11 @@ class BusinessLogic():
                 service_status = "Maintenance not defined"
             elif count_installed == 0 and count_retired > 0:
                 service_status = "No active components"
-        
-        else:
-            service_status = "No components registered"
-    
-        logging.debug(f"New status for bike {bike.bike_name}: {service_status}")
 
-        success, message = database_manager.write_bike_service_status(bike, service_status)
-
-        if success:
-            logging.info(f"Bike update successful: {message}")
         else:
-            logging.error(f"Bike update failed: {message}")
+            service_status = "No components registered"
 
-        return success, message
+        return service_status
 
     def create_component(self,
                          component_id,
@@ -1696,20 +2066,19 @@ class BusinessLogic():
                 logging.warning(f"No history records found for component: {component.component_name}")
                 return False, f"No history records found for component: {component.component_name}"
 
-            sorted_records = sorted(history_records, key=lambda x: x.updated_date)
-            previous_record = None
+            sorted_records = sorted(history_records, key=lambda x: (x.updated_date, x.update_reason == "Installed"))
+            installation_intervals = database_manager.read_installation_intervals(component_id)
 
-            for record in sorted_records:
-                if previous_record is None:
-                    distance_marker = 0
-                else:
-                    if previous_record.update_reason == "Installed":
-                        logging.debug(f'Timespan for historic distance query: start date {previous_record.updated_date} stop date {record.updated_date}.')
-                        historic_distance = database_manager.read_sum_distance_subset_rides(previous_record.bike_id, previous_record.updated_date, record.updated_date)
-                        distance_marker = previous_record.distance_marker + historic_distance
+            interval_distances = {}
+            for bike_id, start_date, stop_date in installation_intervals:
+                if stop_date is not None:
+                    logging.debug(f'Timespan for historic distance query: start date {start_date} stop date {stop_date}.')
+                    interval_distances[(start_date, stop_date)] = database_manager.read_sum_distance_subset_rides(bike_id, start_date, stop_date)
 
-                    else:
-                        distance_marker = previous_record.distance_marker
+            distance_marker = 0
+            for index, record in enumerate(sorted_records):
+                if index > 0 and sorted_records[index - 1].update_reason == "Installed":
+                    distance_marker += interval_distances.get((sorted_records[index - 1].updated_date, record.updated_date), 0)
 
                 history_data = {"history_id": record.history_id,
                                 "component_id": record.component_id,
@@ -1719,15 +2088,18 @@ class BusinessLogic():
                                 "update_reason": record.update_reason,
                                 'distance_marker': distance_marker}
                 
-                success, message = database_manager.write_history_record(history_data)
+                success, message = database_manager.write_history_record(history_data, refresh_intervals=False)
                 if not success:
                     logging.error(f"Failed to update distance for component {component.component_name} and history record {record.history_id}: {message}")
                     return False, f"Failed to update distance for component {component.component_name} and history record {record.history_id}: {message}"
 
-                previous_record = database_manager.read_single_history_record(record.history_id)
+            success, message = database_manager.write_installation_intervals([component_id])
+            if not success:
+                logging.error(f"Failed to refresh installation intervals for component {component.component_name}: {message}")
+                return False, f"Failed to refresh installation intervals for component {component.component_name}: {message}"
             
-            latest_history_record = database_manager.read_latest_history_record(component_id)
-            current_distance = latest_history_record.distance_marker
+            latest_history_record = sorted_records[-1]
+            current_distance = distance_marker
 
             if latest_history_record.update_reason == "Installed":
                 logging.debug(f'Calculating additional distance since last history record: start date {latest_history_record.updated_date} stop date {datetime.now().strftime("%Y-%m-%d %H:%M")}')
@@ -1735,7 +2107,7 @@ class BusinessLogic():
                                                                                       latest_history_record.updated_date,
                                                                                       datetime.now().strftime("%Y-%m-%d %H:%M"))
                 current_distance += additional_distance
-                logging.debug(f'Total distance: {current_distance} (History: {latest_history_record.distance_marker}, Additional: {additional_distance})')
+                logging.debug(f'Total distance: {current_distance} (History: {distance_marker}, Additional: {additional_distance})')
                 
             self.update_component_distance(component_id, current_distance)
 
@@ -1795,100 +2167,99 @@ class BusinessLogic():
                                 new_component_data):
         """Method to orchestrate swap of one component with another"""
         try:
-            logging.info(f"Quick swap: Starting swap operation for component {old_component_id}")
+            with self.unit_of_work() as unit_of_work:
+                logging.info(f"Quick swap: Starting swap operation for component {old_component_id}")
 
-            old_component = database_manager.read_component(old_component_id)
-            if not old_component:
-                logging.error(f"Quick swap failed: Old component not found: {old_component_id}")
-                return False, f"Quick swap failed: The component to be swapped (ID: {old_component_id}) was not found."
+                old_component = database_manager.read_component(old_component_id)
+                if not old_component:
+                    logging.error(f"Quick swap failed: Old component not found: {old_component_id}")
+                    return False, f"Quick swap failed: The component to be swapped (ID: {old_component_id}) was not found."
 
-            logging.debug(f"Quick swap: Old component validated: {old_component.component_name}")
+                logging.debug(f"Quick swap: Old component validated: {old_component.component_name}")
 
-            is_valid, validation_message = self.validate_quick_swap(old_component,
-                                                                    fate,
-                                                                    new_component_id,
-                                                                    new_component_data)
+                is_valid, validation_message = self.validate_quick_swap(old_component,
+                                                                        fate,
+                                                                        new_component_id,
+                                                                        new_component_data)
 
-            if not is_valid:
-                logging.error(f"Quick swap validation failed for {old_component.component_name}: {validation_message}")
-                return False, validation_message
+                if not is_valid:
+                    logging.error(f"Quick swap validation failed for {old_component.component_name}: {validation_message}")
+                    return False, validation_message
 
-            bike_id = old_component.bike_id
-            bike = database_manager.read_single_bike(bike_id)
-            logging.debug(f"Quick swap: Validation passed. Bike: {bike.bike_name}, Fate: {fate}")
-
-            if new_component_data:
-                logging.debug(f"Quick swap: Creating new component '{new_component_data['component_name']}' of type {new_component_data['component_type']}")
-
-                success, message, new_component_id = self.create_component(component_id=None,
-                                                                           component_installation_status="Not installed",
-                                                                           component_updated_date=swap_date,
-                                                                           component_name=new_component_data["component_name"],
-                                                                           component_type=new_component_data["component_type"],
-                                                                           component_bike_id=None,
-                                                                           expected_lifetime=new_component_data["lifetime_expected"],
-                                                                           service_interval=new_component_data["service_interval"],
-                                                                           threshold_km=new_component_data.get("threshold_km"),
-                                                                           lifetime_expected_days=new_component_data.get("lifetime_expected_days"),
-                                                                           service_interval_days=new_component_data.get("service_interval_days"),
-                                                                           threshold_days=new_component_data.get("threshold_days"),
-                                                                           cost=new_component_data["cost"],
-                                                                           offset=new_component_data["offset"],
-                                                                           component_notes=new_component_data["notes"])
-
-                if success == False:
-                    logging.error(f"Quick swap failed: Failed to create new component '{new_component_data['component_name']}': {message}")
-                    return False, f"Quick swap failed: Could not create new component. {message}"
-
-                elif success == "warning":
-                    logging.warning(f"Quick swap: New component created with warning: {message}")
-
-                logging.debug(f"Quick swap: New component created successfully with ID {new_component_id}")
-                new_component = database_manager.read_component(new_component_id)
+                bike_id = old_component.bike_id
+                bike = database_manager.read_single_bike(bike_id)
+                logging.debug(f"Quick swap: Validation passed. Bike: {bike.bike_name}, Fate: {fate}")
+
+                if new_component_data:
+                    logging.debug(f"Quick swap: Creating new component '{new_component_data['component_name']}' of type {new_component_data['component_type']}")
+
+                    success, message, new_component_id = self.create_component(component_id=None,
+                                                                               component_installation_status="Not installed",
+                                                                               component_updated_date=swap_date,
+                                                                               component_name=new_component_data["component_name"],
+                                                                               component_type=new_component_data["component_type"],
+                                                                               component_bike_id=None,
+                                                                               expected_lifetime=new_component_data["lifetime_expected"],
+                                                                               service_interval=new_component_data["service_interval"],
+                                                                               threshold_km=new_component_data.get("threshold_km"),
+                                                                               lifetime_expected_days=new_component_data.get("lifetime_expected_days"),
+                                                                               service_interval_days=new_component_data.get("service_interval_days"),
+                                                                               threshold_days=new_component_data.get("threshold_days"),
+                                                                               cost=new_component_data["cost"],
+                                                                               offset=new_component_data["offset"],
+                                                                               component_notes=new_component_data["notes"])
+
+                    if success == False:
+                        unit_of_work.rollback()
+                        logging.error(f"Quick swap failed: Failed to create new component '{new_component_data['component_name']}': {message}")
+                        return False, f"Quick swap failed: Could not create new component. No changes have been made. {message}"
+
+                    elif success == "warning":
+                        logging.warning(f"Quick swap: New component created with warning: {message}")
+
+                    logging.debug(f"Quick swap: New component created successfully with ID {new_component_id}")
+                    new_component = database_manager.read_component(new_component_id)
             
-            else:
-                new_component = database_manager.read_component(new_component_id)
-                logging.debug(f"Quick swap: Using existing component: {new_component.component_name}")
+                else:
+                    new_component = database_manager.read_component(new_component_id)
+                    logging.debug(f"Quick swap: Using existing component: {new_component.component_name}")
 
-            logging.debug(f"Quick swap: Setting {old_component.component_name} to '{fate}'")
+                logging.debug(f"Quick swap: Setting {old_component.component_name} to '{fate}'")
 
-            success, message = self.create_history_record(component_id=old_component_id,
-                                                          installation_status=fate,
-                                                          component_bike_id=bike_id,
-                                                          component_updated_date=swap_date)
+                success, message = self.create_history_record(component_id=old_component_id,
+                                                              installation_status=fate,
+                                                              component_bike_id=bike_id,
+                                                              component_updated_date=swap_date)
 
-            if not success:
-                logging.error(f"Quick swap failed: Could not update old component status: {message}")
-                if new_component_data:
-                    logging.warning(f"Quick swap partial failure: New component '{new_component.component_name}' (ID: {new_component_id}) was created with status 'Not installed'. Old component '{old_component.component_name}' (ID: {old_component_id}) could not be updated to '{fate}'. Manual fix required: {message}")
-                    return False, f"Quick swap partially failed: New component '{new_component.component_name}' was created but remains 'Not installed'. Old component '{old_component.component_name}' remains 'Installed' on {bike.bike_name}. Manual fix required: {message}"
-                else:
-                    return False, f"Quick swap failed: Could not update '{old_component.component_name}' to '{fate}'. Existing component '{new_component.component_name}' was not touched. {message}"
+                if not success:
+                    unit_of_work.rollback()
+                    logging.error(f"Quick swap failed: Could not update old component status: {message}")
+                    return False, f"Quick swap failed: Could not update '{old_component.component_name}' to '{fate}'. No changes have been made. {message}"
 
-            logging.debug(f"Quick swap: Old component status updated successfully")
-            logging.debug(f"Quick swap: Installing {new_component.component_name} on {bike.bike_name}")
+                logging.debug(f"Quick swap: Old component status updated successfully")
+                logging.debug(f"Quick swap: Installing {new_component.component_name} on {bike.bike_name}")
 
-            success, message = self.create_history_record(component_id=new_component_id,
-                                                          installation_status="Installed",
-                                                          component_bike_id=bike_id,
-                                                          component_updated_date=swap_date)
+                success, message = self.create_history_record(component_id=new_component_id,
+                                                              installation_status="Installed",
+                                                              component_bike_id=bike_id,
+                                                              component_updated_date=swap_date)
 
-            if not success:
-                logging.error(f"Quick swap failed: Could not install new component: {message}")
-                logging.warning(f"Quick swap partial failure: {old_component.component_name} is now '{fate}' but {new_component.component_name} could not be installed")
-                return False, f"Quick swap partially failed: '{old_component.component_name}' is now '{fate}', but '{new_component.component_name}' could not be installed on {bike.bike_name}. Manual fix required: {message}"
+                if not success:
+                    unit_of_work.rollback()
+                    logging.error(f"Quick swap failed: Could not install new component: {message}")
+                    return False, f"Quick swap failed: '{new_component.component_name}' could not be installed on {bike.bike_name}. No changes have been made. {message}"
 
-            old_component_refreshed = database_manager.read_component(old_component_id)
-            new_component_refreshed = database_manager.read_component(new_component_id)
+                old_component_refreshed = database_manager.read_component(old_component_id)
+                new_component_refreshed = database_manager.read_component(new_component_id)
 
-            success_message = f"Component swapped successfully: {old_component_refreshed.component_name} set to {fate}. {new_component_refreshed.component_name} installed on {bike.bike_name}"
-            logging.info(f"Quick swap completed successfully: {success_message}")
+                success_message = f"Component swapped successfully: {old_component_refreshed.component_name} set to {fate}. {new_component_refreshed.component_name} installed on {bike.bike_name}"
+                logging.info(f"Quick swap completed successfully: {success_message}")
 
-            return True, success_message
+                return True, success_message
 
         except Exception as error:
             logging.error(f"Quick swap operation failed with unexpected error: {str(error)}")
-            return False, f"Quick swap failed due to an unexpected error: {str(error)}. Components may be in an inconsistent state. Please check component statuses manually and review the application log for details."
+            return False, f"Quick swap failed due to an unexpected error: {str(error)}. No changes have been made. Please review the application log for details."
 
     def validate_quick_swap(self, old_component, fate, new_component_id, new_component_data):
         """Method to validate quick swap operation"""
@@ -2048,43 +2419,57 @@ class BusinessLogic():
     def change_collection_status(self, collection_id, new_status, updated_date, bike_id):
         """Method to change status of all components in a collection"""
         try:
-            logging.info(f"Starting collection status change for collection {collection_id} to '{new_status}'")
+            with self.unit_of_work() as unit_of_work:
+                logging.info(f"Starting collection status change for collection {collection_id} to '{new_status}'")
 
-            collection = database_manager.read_single_collection(collection_id)
-            if not collection:
-                return False, f"Collection {collection_id} not found"
+                collection = database_manager.read_single_collection(collection_id)
+                if not collection:
+                    return False, f"Collection {collection_id} not found"
 
-            component_ids = json.loads(collection.components) if collection.components else []
+                component_ids = json.loads(collection.components) if collection.components else []
 
-            if not component_ids:
-                return False, "No components found in collection"
+                if not component_ids:
+                    return False, "No components found in collection"
 
-            is_valid, validation_message = self.validate_collection(collection_id, component_ids, bike_id, new_status)
-            if not is_valid:
-                logging.warning(f"Collection validation failed: {validation_message}")
-                return False, validation_message
+                is_valid, validation_message = self.validate_collection(collection_id, component_ids, bike_id, new_status)
+                if not is_valid:
+                    logging.warning(f"Collection validation failed: {validation_message}")
+                    return False, validation_message
 
-            success_count = 0
-            successful_components = []
-            failed_components = []
+                success_count = 0
+                successful_components = []
+                failed_components = []
             
-            for component_id in component_ids:
-                component = database_manager.read_component(component_id)
-                component_name = component.component_name if component else f"Component {component_id}"
+                for component_id in component_ids:
+                    component = database_manager.read_component(component_id)
+                    component_name = component.component_name if component else f"Component {component_id}"
 
-                success, message = self.create_history_record(component_id=component_id,
-                                                              installation_status=new_status,
-                                                              component_bike_id=bike_id,
-                                                              component_updated_date=updated_date)
+                    success, message = self.create_history_record(component_id=component_id,
+                                                                  installation_status=new_status,
+                                                                  component_bike_id=bike_id,
+                                                                  component_updated_date=updated_date)
 
-                if success:
-                    success_count += 1
-                    successful_components.append(component_name)
-                else:
-                    failed_components.append({"name": component_name, "error": message})
-                    logging.error(f"Failed to update component {component_id}: {message}")
+                    if success:
+                        success_count += 1
+                        successful_components.append(component_name)
+                    else:
+                        failed_components.append({"name": component_name, "error": message})
+                        logging.error(f"Failed to update component {component_id}: {message}")
+
+                total_count = len(component_ids)
+
+                if failed_components:
+                    unit_of_work.rollback()
+                    message = {"type": "complete_failure",
+                               "summary": f"Status update failed for {len(failed_components)} of {total_count} components. No changes have been made",
+                               "total_count": total_count,
+                               "success_count": 0,
+                               "successful_components": [],
+                               "failed_components": failed_components}
+
+                    logging.error(f"Collection status change failed: {len(failed_components)} / {total_count} components failed. All changes rolled back")
+                    return False, message
 
-            if success_count > 0:
                 try:
                     collection_status = self.calculate_collection_status(component_ids)
                     calculated_bike_id = collection_status.get('actual_component_bike_id')
@@ -2104,41 +2489,16 @@ class BusinessLogic():
                 except Exception as error:
                     logging.error(f"Collection update failed entirely. Last updated date not chaged. Error: {str(error)}")
 
-            total_count = len(component_ids)
-
-            if success_count == total_count:
                 message = {"type": "success",
                            "summary": f"Successfully updated status for all {success_count} components",
                            "total_count": total_count,
                            "success_count": success_count,
                            "successful_components": successful_components,
                            "failed_components": []}
-                
+
                 logging.info(f"Collection status change: all {success_count} components succeeded")
                 return True, message
 
-            elif success_count > 0:
-                message = {"type": "partial_failure",
-                           "summary": f"Status update failed - only {success_count} of {total_count} components were updated",
-                           "total_count": total_count,
-                           "success_count": success_count,
-                           "successful_components": successful_components,
-                           "failed_components": failed_components}
-                
-                logging.warning(f"Collection status change failed: {success_count} / {total_count} components succeeded")
-                return False, message
-
-            else:
-                message = {"type": "complete_failure",
-                           "summary": "Failed to update any components in collection",
-                           "total_count": total_count,
-                           "success_count": 0,
-                           "successful_components": [],
-                           "failed_components": failed_components}
-                
-                logging.error("Collection status change: all components failed")
-                return False, message
-
         except Exception as error:
             logging.error(f"Error changing collection status for {collection_id}: {str(error)}")
             return False, f"Error changing collection status for {collection_id}: {str(error)}"
@@ -2193,66 +2553,70 @@ class BusinessLogic():
     def bulk_create_service_records(self, workplan_id, component_ids, service_date, service_description):
         """Method to bulk create service records for multiple components linked to a workplan"""
         try:
-            logging.info(f"Starting bulk service creation for workplan {workplan_id}, {len(component_ids)} components")
+            with self.unit_of_work():
+                logging.info(f"Starting bulk service creation for workplan {workplan_id}, {len(component_ids)} components")
 
-            if not component_ids:
-                return False, "No components selected"
+                if not component_ids:
+                    return False, "No components selected"
 
-            success_count = 0
-            successful_components = []
-            failed_components = []
+                success_count = 0
+                successful_components = []
+                failed_components = []
 
-            for component_id in component_ids:
-                component = database_manager.read_component(component_id)
-                component_name = component.component_name if component else f"Component {component_id}"
+                for component_id in component_ids:
+                    component = database_manager.read_component(component_id)
+                    component_name = component.component_name if component else f"Component {component_id}"
 
-                success, message = self.create_service_record(component_id=component_id,
-                                                              service_date=service_date,
-                                                              service_description=service_description,
-                                                              workplan_id=workplan_id)
+                    with database_manager.savepoint() as savepoint:
+                        success, message = self.create_service_record(component_id=component_id,
+                                                                      service_date=service_date,
+                                                                      service_description=service_description,
+                                                                      workplan_id=workplan_id)
+                        if not success:
+                            savepoint.rollback()
 
-                if success:
-                    success_count += 1
-                    successful_components.append(component_name)
-                    logging.info(f"Created service record for {component_name}")
-                else:
-                    failed_components.append({"name": component_name, "error": message})
-                    logging.error(f"Failed to create service record for {component_id}: {message}")
+                    if success:
+                        success_count += 1
+                        successful_components.append(component_name)
+                        logging.info(f"Created service record for {component_name}")
+                    else:
+                        failed_components.append({"name": component_name, "error": message})
+                        logging.error(f"Failed to create service record for {component_id}: {message}")
 
-            total_count = len(component_ids)
+                total_count = len(component_ids)
 
-            if success_count == total_count:
-                message = {"type": "success",
-                           "summary": f"Successfully created service records for all {success_count} components",
-                           "total_count": total_count,
-                           "success_count": success_count,
-                           "successful_components": successful_components,
-                           "failed_components": []}
+                if success_count == total_count:
+                    message = {"type": "success",
+                               "summary": f"Successfully created service records for all {success_count} components",
+                               "total_count": total_count,
+                               "success_count": success_count,
+                               "successful_components": successful_components,
+                               "failed_components": []}
 
-                logging.info(f"Bulk service creation: all {success_count} services created successfully")
-                return True, message
+                    logging.info(f"Bulk service creation: all {success_count} services created successfully")
+                    return True, message
 
-            elif success_count > 0:
-                message = {"type": "partial_failure",
-                           "summary": f"Service creation partially failed - only {success_count} of {total_count} services were created",
-                           "total_count": total_count,
-                           "success_count": success_count,
-                           "successful_components": successful_components,
-                           "failed_components": failed_components}
+                elif success_count > 0:
+                    message = {"type": "partial_failure",
+                               "summary": f"Service creation partially failed - only {success_count} of {total_count} services were created",
+                               "total_count": total_count,
+                               "success_count": success_count,
+                               "successful_components": successful_components,
+                               "failed_components": failed_components}
 
-                logging.warning(f"Bulk service creation: {success_count} / {total_count} services created")
-                return False, message
+                    logging.warning(f"Bulk service creation: {success_count} / {total_count} services created")
+                    return False, message
 
-            else:
-                message = {"type": "complete_failure",
-                           "summary": "Failed to create any service records",
-                           "total_count": total_count,
-                           "success_count": 0,
-                           "successful_components": [],
-                           "failed_components": failed_components}
+                else:
+                    message = {"type": "complete_failure",
+                               "summary": "Failed to create any service records",
+                               "total_count": total_count,
+                               "success_count": 0,
+                               "successful_components": [],
+                               "failed_components": failed_components}
 
-                logging.error("Bulk service creation: all services failed")
-                return False, message
+                    logging.error("Bulk service creation: all services failed")
+                    return False, message
 
         except Exception as error:
             logging.error(f"Error in bulk service creation for workplan {workplan_id}: {str(error)}")
@@ -2338,8 +2702,7 @@ class BusinessLogic():
                                 'workplan_id': workplan_id}
             
         all_services = list(database_manager.read_subset_service_history(component.component_id))
-        history_records = database_manager.read_subset_component_history(component.component_id)
-        sorted_history = sorted(history_records, key=lambda x: x.updated_date)
+        installation_intervals = database_manager.read_installation_intervals(component.component_id)
 
         logging.debug(f"Consolidating and sorting all services for component {component.component_name}")
         all_services = [service for service in all_services if service.service_id != service_id]
@@ -2347,88 +2710,28 @@ class BusinessLogic():
         all_services.sort(key=lambda x: x.service_date)
 
         logging.debug(f"Iterating over all services for component {component.component_name} to update distance markers and bike ids")
+        interval_start_dates = [start_date for _, start_date, _ in installation_intervals]
+
         for index, service in enumerate(all_services):
-            if index == 0:
-                accumulated_distance = 0
-                current_installation = None
-                service_date = service.service_date
-                
-                for record in sorted_history:
-                    if record.updated_date > service_date:
-                        break
-                        
-                    if record.update_reason == "Installed":
-                        current_installation = record
-                    elif record.update_reason == "Not installed" and current_installation:
-                        logging.debug(f"Calculating distance for installation period for first service record: {current_installation.updated_date} to {record.updated_date}")
-                        period_distance = database_manager.read_sum_distance_subset_rides(current_installation.bike_id,
-                                                                                          current_installation.updated_date,
-                                                                                          record.updated_date)
-                        accumulated_distance += period_distance
-                        logging.debug(f"Added {period_distance} km from bike {current_installation.bike_id}")
-                        current_installation = None
-
-                logging.debug(f"Processing final installation period for first service record")
-                if current_installation:
-                    period_distance = database_manager.read_sum_distance_subset_rides(current_installation.bike_id,
-                                                                                      current_installation.updated_date,
-                                                                                      service_date)
-                    accumulated_distance += period_distance
-                    logging.debug(f"Added final period of {period_distance} km from bike {current_installation.bike_id} for first service record")
-
-                new_service_distance = accumulated_distance
+            previous_service_date = all_services[index-1].service_date if index > 0 else None
+            logging.debug(f"Processing installation periods within window {previous_service_date} to {service.service_date}")
 
-            else:
-                logging.debug(f"Processing subsequent service records, using service dates to calculate distance")
-                previous_service_date = all_services[index-1].service_date
-                current_service_date = service.service_date
-                
-                accumulated_distance = 0
-                current_installation = None
-                
-                initial_status = next(record for record in reversed(sorted_history)
-                                      if record.updated_date <= previous_service_date)
-                
-                if initial_status.update_reason == "Installed":
-                    current_installation = initial_status
-                
-                logging.debug(f"Processing installation changes within window {previous_service_date} to {current_service_date}")
-                for record in sorted_history:
-                    if record.updated_date <= previous_service_date:
-                        logging.debug(f"Record {record.history_id} dated {record.updated_date} outside window, skipping")
-                        continue
-                    if record.updated_date > current_service_date:
-                        logging.debug(f"Record {record.history_id} dated {record.updated_date} inside window, processing")
-                        break
-                    
-                    if record.update_reason == "Installed":
-                        current_installation = record
-                    elif record.update_reason == "Not installed" and current_installation:
-                        logging.debug(f"Calculating distance for the installation period: {current_installation.updated_date} to {record.updated_date}")
-                        period_distance = database_manager.read_sum_distance_subset_rides(
-                            current_installation.bike_id,
-                            max(current_installation.updated_date, previous_service_date),
-                            record.updated_date)
-                        accumulated_distance += period_distance
-                        logging.debug(f"Added {period_distance} km from bike {current_installation.bike_id} ({current_installation.updated_date} to {record.updated_date})")
-                        current_installation = None
-
-                logging.debug("Processing final installation period at the end of window")
-                if current_installation:
-                    period_distance = database_manager.read_sum_distance_subset_rides(current_installation.bike_id,
-                                                                                      max(current_installation.updated_date, previous_service_date),
-                                                                                      current_service_date)
-                    accumulated_distance += period_distance
-                    logging.debug(f"Added final period of {period_distance} km from bike {current_installation.bike_id} ({current_installation.updated_date} to {current_service_date})")
-
-                new_service_distance = accumulated_distance
-                logging.debug(f"Total accumulated distance: {accumulated_distance} km")
+            accumulated_distance = 0
+            for bike_id, start_date, stop_date in clip_installation_intervals(installation_intervals, previous_service_date, service.service_date):
+                period_distance = database_manager.read_sum_distance_subset_rides(bike_id, start_date, stop_date)
+                accumulated_distance += period_distance
+                logging.debug(f"Added {period_distance} km from bike {bike_id} ({start_date} to {stop_date})")
+
+            new_service_distance = accumulated_distance
+            logging.debug(f"Total accumulated distance: {accumulated_distance} km")
 
             logging.debug(f"Setting bike_id based on component status at service time")
-            relevant_history = next(record for record in reversed(sorted_history)
-                                    if record.updated_date <= service.service_date)
-                
-            new_bike_id = relevant_history.bike_id if relevant_history.update_reason == "Installed" else None
+            interval_position = bisect.bisect_right(interval_start_dates, service.service_date) - 1
+            new_bike_id = None
+            if interval_position >= 0:
+                bike_id, _, stop_date = installation_intervals[interval_position]
+                if stop_date is None or service.service_date < stop_date:
+                    new_bike_id = bike_id
 
             service_data = {'service_id': service.service_id,
                             'component_id': component.component_id,
@@ -2535,40 +2838,130 @@ class BusinessLogic():
             return distance_status
 
     def update_time_based_fields(self):
-        """Method to update time-based status fields for all non-retired components"""
+        """Method to update time-based status fields for all non-retired components in one batch, writing only changed rows and refreshing each affected bike once"""
         components = database_manager.read_all_components_objects()
         active_components = [component for component in components if component.installation_status != "Retired"]
+        day_components = [component for component in active_components
+                          if component.lifetime_expected_days or component.service_interval_days]
 
-        component_count = len(active_components)
-        updated_count = 0
-        error_count = 0
+        logging.info(f'Starting time-based fields update for {len(active_components)} components that are installed or not assigned.')
 
-        logging.info(f'Starting time-based fields update for {component_count} components that are installed or not assigned.')
-        for component in active_components:
-            try:
-                if component.lifetime_expected_days or component.service_interval_days:
-                    logging.debug(f'{component.component_name} tracks days for lifetime or service intervals. Updating time-based fields.')
-                    self.update_component_lifetime_status(component)
-                    self.update_component_service_status(component)
+        if not day_components:
+            logging.warning("No components have been configured to track days for lifetime or service intervals")
+            return True, "No components have been configured to track days for lifetime or service intervals"
 
-                    if component.installation_status == "Installed" and component.bike_id:
-                        self.update_bike_status(component.bike_id)
+        component_ids = [component.component_id for component in day_components]
+        first_installation_dates = database_manager.read_first_installation_dates(component_ids)
+        latest_service_dates = database_manager.read_latest_service_dates(component_ids)
+        now = get_formatted_datetime_now()
 
-                    updated_count += 1
+        changed_components = []
+        error_count = 0
+        for component in day_components:
+            try:
+                previous_status = (component.lifetime_remaining,
+                                   component.lifetime_status,
+                                   component.lifetime_remaining_days,
+                                   component.service_status,
+                                   component.service_next_days)
+
+                (component.lifetime_remaining,
+                 component.lifetime_status,
+                 component.lifetime_remaining_days,
+                 component.service_status,
+                 component.service_next_days) = self.compute_time_based_status(component,
+                                                                               first_installation_dates.get(component.component_id),
+                                                                               latest_service_dates.get(component.component_id),
+                                                                               now)
+
+                if (component.lifetime_remaining,
+                    component.lifetime_status,
+                    component.lifetime_remaining_days,
+                    component.service_status,
+                    component.service_next_days) != previous_status:
+                    changed_components.append(component)
 
             except Exception as exception:
                 error_count += 1
                 logging.error(f"Error updating time fields for component {component.component_id}: {exception}")
 
+        updated_count = len(day_components) - error_count
+        database_manager.count_writes(applied=len(changed_components),
+                                      skipped=updated_count - len(changed_components))
+        logging.debug(f"Time-based status changed for {len(changed_components)} of {updated_count} components")
+
+        if changed_components:
+            success, message = database_manager.write_component_time_status_bulk(changed_components)
+            if not success:
+                logging.error(message)
+                return False, message
+
+            bike_ids = list({component.bike_id for component in changed_components
+                             if component.installation_status == "Installed" and component.bike_id})
+            components_by_bike = {bike_id: [] for bike_id in bike_ids}
+            for component in database_manager.read_components_for_bikes(bike_ids):
+                components_by_bike[component.bike_id].append(component)
+
+            bikes = list(database_manager.read_bikes_for_ids(bike_ids))
+            changed_bikes = []
+            for bike in bikes:
+                service_status = self.compute_bike_status(components_by_bike[bike.bike_id])
+                if service_status != bike.service_status:
+                    bike.service_status = service_status
+                    changed_bikes.append(bike)
+
+            database_manager.count_writes(applied=len(changed_bikes),
+                                          skipped=len(bikes) - len(changed_bikes))
+
+            if changed_bikes:
+                success, message = database_manager.write_bike_service_status_bulk(changed_bikes)
+                if not success:
+                    logging.error(message)
+                    return False, message
+                logging.info(f"Bike update successful: {message}")
+
         if error_count > 0:
             logging.warning(f"{updated_count} components successfully updated. {error_count} components failed to update.")
             return False, f"{updated_count} components successfully updated. {error_count} components failed to update."
-        elif updated_count > 0:
+        else:
             logging.info(f"{updated_count} components successfully updated.")
             return True, f"{updated_count} components successfully updated"
-        else:
-            logging.warning("No components have been configured to track days for lifetime or service intervals")
-            return True, "No components have been configured to track days for lifetime or service intervals"
+
+    def compute_time_based_status(self, component, first_installation_date, latest_service_date, now):
+        """Method to compute lifetime and service status for a component from its first installation date and latest service date.
+        Distance to next service is taken as stored, since it only changes with rides, services and installations"""
+        lifetime_remaining = None
+        lifetime_distance_status = "Not defined"
+        if component.lifetime_expected:
+            lifetime_remaining = component.lifetime_expected - component.component_distance
+            lifetime_distance_status = self.compute_component_status("lifetime", lifetime_remaining, component.threshold_km)
+
+        lifetime_remaining_days = None
+        lifetime_days_status = "Not defined"
+        if component.lifetime_expected_days and first_installation_date:
+            success, age_days = calculate_elapsed_days(first_installation_date, now)
+            if success:
+                lifetime_remaining_days = component.lifetime_expected_days - age_days
+                lifetime_days_status = self.compute_component_status("lifetime", lifetime_remaining_days, component.threshold_days)
+
+        service_distance_status = "Not defined"
+        if component.service_interval:
+            service_distance_status = self.compute_component_status("service", component.service_next, component.threshold_km)
+
+        service_next_days = None
+        service_days_status = "Not defined"
+        last_service_date = latest_service_date or first_installation_date
+        if component.service_interval_days and last_service_date:
+            success, days_since_service = calculate_elapsed_days(last_service_date, now)
+            if success:
+                service_next_days = component.service_interval_days - days_since_service
+                service_days_status = self.compute_component_status("service", service_next_days, component.threshold_days)
+
+        return (lifetime_remaining,
+                self.determine_worst_status(lifetime_distance_status, lifetime_days_status),
+                lifetime_remaining_days,
+                self.determine_worst_status(service_distance_status, service_days_status),
+                service_next_days)
 
     def validate_threshold_configuration(self,
                                          expected_lifetime,
@@ -2614,14 +3007,15 @@ class BusinessLogic():
 
         return True, "Validation passed"
 
-    def process_bike_compliance_report(self, bike_id):
-        """Method to check if a bike has all mandatory components and respects max quantities"""
+    def process_bike_compliance_report(self, bike_id, component_types_raw=None, installed_components=None):
+        """Method to check if a bike has all mandatory components and respects max quantities. Component types and installed components can be passed in when already read"""
         compliance_report = {"all_mandatory_present": True,
                              "no_max_quantity_exceeded": True,
                              "missing_mandatory": [],
                              "exceeding_max_quantity": {}}
 
-        component_types_raw = database_manager.read_all_component_types()
+        if component_types_raw is None:
+            component_types_raw = database_manager.read_all_component_types()
 
         component_types = {component_type[0]:
                                 {'expected_lifetime': component_type[1],
@@ -2634,8 +3028,8 @@ class BusinessLogic():
                                  'mandatory': component_type[8],
                                  'max_quantity': component_type[9]} for component_type in component_types_raw}
 
-        installed_components_raw = database_manager.read_subset_installed_components(bike_id)
-        installed_components = list(installed_components_raw)
+        if installed_components is None:
+            installed_components = list(database_manager.read_subset_installed_components(bike_id))
 
         component_counts = {}
         for component in installed_components:
@@ -3107,19 +3501,25 @@ class BusinessLogic():
 
         return success, message, component_id, bike_id, collection_id
 
-    async def refresh_all_bikes(self):
+    async def refresh_all_bikes(self, progress=None):
         """Method to refresh all bikes from Strava"""
         unique_bike_ids = database_manager.read_unique_bikes()
         
+        if progress:
+            progress.update_progress(stage="Refreshing bikes")
         await strava.get_bikes(unique_bike_ids)
-        success_main, message_main = database_manager.write_update_bikes(strava.payload_bikes)
+        success_main, message_main = await worker_pool.run_write(database_manager.write_update_bikes, strava.payload_bikes)
 
         if success_main:
-            for bike_id in unique_bike_ids:
-                success_sub, message_sub = self.update_bike_status(bike_id)
+            if progress:
+                progress.update_progress(stage="Recomputing bike status", bikes_refreshed=len(strava.payload_bikes), bikes_recomputed=0)
+            for bike_number, bike_id in enumerate(unique_bike_ids, start=1):
+                success_sub, message_sub = await worker_pool.run_write(self.update_bike_status, bike_id)
                 if not success_sub:
                     logging.error(message_sub)
                     return success_sub, message_sub
+                if progress:
+                    progress.update_progress(bikes_recomputed=bike_number)
         
         logging.info(message_main)
         return success_main, message_main
@@ -3138,3 +3538,60 @@ class BusinessLogic():
         else:
             self.app_state.strava_last_pull = "never"
             self.app_state.strava_days_since_last_pull = None
+
+    def checkpoint_database(self):
+        """Method to fold the write-ahead log into the database file, so it does not grow between syncs"""
+        success, message = database_manager.write_wal_checkpoint()
+
+        if success:
+            logging.info(message)
+        else:
+            logging.error(message)
+
+        return success, message
+
+    def prepare_database_schema(self):
+        """Method to report SQLite pragmas in effect, rebuild derived tables, create missing indexes and report queries that still scan full tables"""
+        effective_pragmas, mismatches = database_manager.read_effective_pragmas()
+        logging.info(f"SQLite pragmas in effect: {', '.join(f'{pragma}={value}' for pragma, value in effective_pragmas.items())}")
+        for mismatch in mismatches:
+            logging.warning(f"SQLite pragma not applied as configured: {mismatch}")
+
+        success, message = database_manager.write_rebuild_installation_intervals()
+
+        if success:
+            logging.info(message)
+        else:
+            logging.error(message)
+
+        success, message = database_manager.write_rebuild_ride_daily_totals()
+
+        if success:
+            logging.info(message)
+        else:
+            logging.error(message)
+
+        success, message = database_manager.write_rebuild_component_links()
+
+        if success:
+            logging.info(message)
+        else:
+            logging.error(message)
+
+        success, message = database_manager.write_create_indexes()
+
+        if success:
+            logging.info(message)
+        else:
+            logging.error(message)
+
+        query_plans, full_scans = database_manager.read_query_plans()
+        for query_name, plan_details in query_plans.items():
+            logging.debug(f"Query plan for {query_name}: {'; '.join(plan_details)}")
+
+        if full_scans:
+            logging.info(f"{len(full_scans)} of {len(query_plans)} checked queries scan full tables: {', '.join(full_scans)}")
+        else:
+            logging.info(f"None of the {len(query_plans)} checked queries scan full tables")
+
+        return success, message
@@ -3,7 +3,16 @@
 
 import peewee
 import json
+import sqlite3
+import bisect
+import contextvars
+import threading
+import functools
+import operator
+from contextlib import contextmanager
 from database_model import (database,
+                            PRAGMAS,
+                            create_indexes,
                             Bikes,
                             Rides,
                             ComponentTypes,
@@ -12,14 +21,377 @@ from database_model import (database,
                             Services,
                             Incidents,
                             Workplans,
-                            Collections)
+                            Collections,
+                            InstallationIntervals,
+                            RideDailyTotals,
+                            CollectionComponents,
+                            IncidentComponents,
+                            WorkplanComponents,
+                            create_derived_tables)
 from utils import (format_component_status,
-                   format_cost)
+                   format_cost,
+                   parse_moving_time)
+
+COMPONENT_PAGE_SORT_FIELDS = {"name": peewee.fn.LOWER(Components.component_name),
+                              "collection": peewee.fn.COALESCE(CollectionComponents
+                                                               .select(peewee.fn.LOWER(Collections.collection_name))
+                                                               .join(Collections, on=(Collections.collection_id == CollectionComponents.collection_id))
+                                                               .where(CollectionComponents.component_id == Components.component_id)
+                                                               .limit(1), ""),
+                              "type": peewee.fn.LOWER(Components.component_type),
+                              "distance": Components.component_distance,
+                              "status": Components.installation_status,
+                              "lifetime": peewee.Case(peewee.fn.COALESCE(Components.lifetime_status, "Not defined"),
+                                                      (("Lifetime exceeded", 1),
+                                                       ("Due for replacement", 2),
+                                                       ("OK", 3),
+                                                       ("Not defined", 4)), 5),
+                              "service": peewee.Case(peewee.fn.COALESCE(Components.service_status, "Not defined"),
+                                                     (("Service interval exceeded", 1),
+                                                      ("Due for service", 2),
+                                                      ("OK", 3),
+                                                      ("Not defined", 4)), 5),
+                              "bike": peewee.fn.COALESCE(Bikes
+                                                         .select(peewee.fn.LOWER(Bikes.bike_name))
+                                                         .where(Bikes.bike_id == Components.bike_id), "not assigned"),
+                              "updated_date": Components.updated_date}
+
+RIDE_PAGE_SORT_FIELDS = {"record_time": Rides.record_time,
+                         "distance": Rides.ride_distance}
+
+HISTORY_PAGE_SORT_FIELDS = {"updated_date": ComponentHistory.updated_date}
+
+# Highest number of bound variables in one statement, which caps rows per multi-row insert
+SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+# Ride columns in upsert order, ride id first
+RIDE_UPSERT_FIELDS = [Rides.ride_id,
+                      Rides.bike_id,
+                      Rides.record_time,
+                      Rides.ride_name,
+                      Rides.ride_distance,
+                      Rides.moving_time,
+                      Rides.commute]
+
+def bumps_write_generation(write_method):
+    """Decorator to advance the write generation after a write method has run, so caches built from older data are rebuilt.
+    A write method that changed nothing can call skip_write_generation to keep the caches"""
+    @functools.wraps(write_method)
+    def wrapper(self, *args, **kwargs):
+        token = write_unchanged.set(False)
+        try:
+            return write_method(self, *args, **kwargs)
+        finally:
+            unchanged = write_unchanged.get()
+            write_unchanged.reset(token)
+            if not unchanged:
+                with self.write_generation_lock:
+                    self.write_generation += 1
+
+    return wrapper
+
+
+class RideDistanceIndex:
+    """Class to hold cumulative ride distance per bike, so distance between two dates can be found by bisecting"""
+    def __init__(self):
+        self.bike_indexes = {}
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def get_bike_index(self, bike_id):
+        """Method to get sorted record times and cumulative distances for a bike, building the index if missing"""
+        with self.lock:
+            bike_index = self.bike_indexes.get(bike_id)
+            generation = self.generation
+
+        if bike_index is None:
+            rides = (Rides
+                     .select(Rides.record_time, Rides.ride_distance)
+                     .where(Rides.bike_id == bike_id)
+                     .order_by(Rides.record_time.asc())
+                     .tuples())
+
+            record_times = []
+            cumulative_distances = [0]
+            for record_time, ride_distance in rides:
+                record_times.append(record_time)
+                cumulative_distances.append(cumulative_distances[-1] + ride_distance)
+
+            bike_index = (record_times, cumulative_distances)
+
+            with self.lock:
+                if self.generation == generation:
+                    self.bike_indexes[bike_id] = bike_index
+
+        return bike_index
+
+    def sum_distance(self, bike_id, start_date, stop_date, include_stop=True):
+        """Method to sum distance for rides with record time from start date to stop date. Stop date None means no upper bound"""
+        record_times, cumulative_distances = self.get_bike_index(bike_id)
+        start_position = bisect.bisect_left(record_times, start_date)
+
+        if stop_date is None:
+            stop_position = len(record_times)
+        elif include_stop:
+            stop_position = bisect.bisect_right(record_times, stop_date)
+        else:
+            stop_position = bisect.bisect_left(record_times, stop_date)
+
+        if stop_position <= start_position:
+            return 0
+
+        return cumulative_distances[stop_position] - cumulative_distances[start_position]
+
+    def invalidate(self, bike_ids):
+        """Method to drop the index for given bikes, so it is rebuilt on next query"""
+        with self.lock:
+            self.generation += 1
+            for bike_id in bike_ids:
+                self.bike_indexes.pop(bike_id, None)
+
+
+class IdentityMap:
+    """Class to hold bikes and components loaded once per request, so repeated lookups are served from memory"""
+    def __init__(self):
+        self.bikes = {}
+        self.components = {}
+        self.bikes_loaded = False
+        self.components_loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def get_record(self, model, records, record_id, loaded):
+        """Method to look up a record, loading the whole table on first use and querying single records invalidated since.
+        An id missing from the freshly loaded table is stored as None, so it is not queried again"""
+        if record_id in records:
+            self.hits += 1
+            return records[record_id], loaded
+
+        self.misses += 1
+        if not loaded:
+            records.update({record.get_id(): record for record in model.select()})
+            records.setdefault(record_id, None)
+            return records[record_id], True
+
+        records[record_id] = model.get_or_none(model._meta.primary_key == record_id)
+        return records[record_id], loaded
+
+    def get_bike(self, bike_id):
+        """Method to look up a bike"""
+        bike, self.bikes_loaded = self.get_record(Bikes, self.bikes, bike_id, self.bikes_loaded)
+        return bike
+
+    def get_component(self, component_id):
+        """Method to look up a component"""
+        component, self.components_loaded = self.get_record(Components, self.components, component_id, self.components_loaded)
+        return component
+
+    def invalidate(self, bike_ids=(), component_ids=()):
+        """Method to drop given bikes and components, so they are queried again on next lookup"""
+        for bike_id in bike_ids:
+            self.bikes.pop(bike_id, None)
+        for component_id in component_ids:
+            self.components.pop(component_id, None)
+
+    def clear(self):
+        """Method to drop all loaded records, e.g. after a rollback"""
+        self.bikes.clear()
+        self.components.clear()
+        self.bikes_loaded = False
+        self.components_loaded = False
+
+
+class BikeSummaryProjection:
+    """Class to hold component counts and compliance per bike for the bike overview. Component writes mark bikes stale,
+    and only stale bikes are recomputed on next read"""
+    def __init__(self):
+        self.summaries = {}
+        self.version = 0
+        self.stale_versions = {}
+        self.all_stale_version = 0
+        self.lock = threading.Lock()
+
+    def mark_stale(self, bike_ids):
+        """Method to mark summaries for given bikes as stale. Call after the write is committed"""
+        with self.lock:
+            self.version += 1
+            for bike_id in bike_ids:
+                if bike_id:
+                    self.stale_versions[bike_id] = self.version
+
+    def mark_all_stale(self):
+        """Method to mark summaries for all bikes as stale, e.g. when component types change"""
+        with self.lock:
+            self.version += 1
+            self.all_stale_version = self.version
+
+    def get_summaries(self, bike_ids):
+        """Method to get current summaries for given bikes, the bikes needing recompute and the version to store them with"""
+        summaries = {}
+        stale_bike_ids = []
+
+        with self.lock:
+            for bike_id in bike_ids:
+                stored = self.summaries.get(bike_id)
+                if stored and stored[0] >= max(self.stale_versions.get(bike_id, 0), self.all_stale_version):
+                    summaries[bike_id] = stored[1]
+                else:
+                    stale_bike_ids.append(bike_id)
+
+            return summaries, stale_bike_ids, self.version
+
+    def store_summaries(self, summaries, version):
+        """Method to store recomputed summaries. Summaries for bikes marked stale after version are kept out by the version check on read"""
+        with self.lock:
+            for bike_id, summary in summaries.items():
+                self.summaries[bike_id] = (version, summary)
+
+
+class ComponentCollectionIndex:
+    """Class to hold a reverse index from component id to the collection containing it. Collection writes invalidate the index,
+    and it is rebuilt on next read"""
+    def __init__(self):
+        self.entries = None
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def invalidate(self):
+        """Method to drop the index. Call after the write is committed"""
+        with self.lock:
+            self.version += 1
+            self.entries = None
+
+    def get_entries(self):
+        """Method to get the current index, None if it must be rebuilt, and the version to store a rebuilt index with"""
+        with self.lock:
+            return self.entries, self.version
+
+    def store_entries(self, entries, version):
+        """Method to store a rebuilt index, unless it was invalidated while rebuilding"""
+        with self.lock:
+            if version == self.version:
+                self.entries = entries
+
+
+class UnitOfWork:
+    """Class to hold state for a multi-step operation running in one transaction"""
+    def __init__(self):
+        self.transaction = None
+        self.deferred_bike_ids = set()
+        self.deferring = True
+        self.rolled_back = False
+
+    def defer_bike_status(self, bike_id):
+        """Method to register a bike for status recompute when the operation completes"""
+        self.deferred_bike_ids.add(bike_id)
+
+    def rollback(self):
+        """Method to undo all writes made in the operation so far"""
+        self.transaction.rollback()
+        self.deferred_bike_ids.clear()
+        self.rolled_back = True
+
+
+request_identity_map = contextvars.ContextVar("request_identity_map", default=None)
+active_unit_of_work = contextvars.ContextVar("active_unit_of_work", default=None)
+write_unchanged = contextvars.ContextVar("write_unchanged", default=False)
+
 
 class DatabaseManager:
     """Class to interact with a SQLite database through Peewee"""
-    def __init__(self):
+    def __init__(self, ride_insert_batch_size=500):
         self.database = database
+        self.ride_insert_batch_size = max(1, min(ride_insert_batch_size, SQLITE_MAX_VARIABLES // len(RIDE_UPSERT_FIELDS)))
+        self.ride_distance_index = RideDistanceIndex()
+        self.bike_summary = BikeSummaryProjection()
+        self.collection_index = ComponentCollectionIndex()
+        self.write_generation = 0
+        self.write_generation_lock = threading.Lock()
+        self.write_counters = {"applied": 0, "skipped": 0}
+        self.write_counters_lock = threading.Lock()
+
+    @contextmanager
+    def request_scope(self):
+        """Context manager to serve bike and component lookups from an identity map for the duration of a request"""
+        identity_map = IdentityMap()
+        token = request_identity_map.set(identity_map)
+        try:
+            yield identity_map
+        finally:
+            request_identity_map.reset(token)
+
+    @contextmanager
+    def unit_of_work(self):
+        """Context manager to run a multi-step operation in one transaction. Atomic blocks in write methods become savepoints,
+        so the operation commits once, and an exception or rollback undoes all of it. A unit of work opened inside another joins it"""
+        unit_of_work = active_unit_of_work.get()
+        if unit_of_work is not None:
+            yield unit_of_work
+            return
+
+        unit_of_work = UnitOfWork()
+        token = active_unit_of_work.set(unit_of_work)
+        try:
+            with database.atomic() as transaction:
+                unit_of_work.transaction = transaction
+                yield unit_of_work
+
+        finally:
+            active_unit_of_work.reset(token)
+
+            identity_map = request_identity_map.get()
+            if identity_map is not None:
+                identity_map.clear()
+
+            self.bike_summary.mark_all_stale()
+            self.collection_index.invalidate()
+            with self.write_generation_lock:
+                self.write_generation += 1
+
+    def read_active_unit_of_work(self):
+        """Method to get the unit of work of the running operation, if any"""
+        return active_unit_of_work.get()
+
+    @contextmanager
+    def savepoint(self):
+        """Context manager to run part of a unit of work so it can be rolled back on its own"""
+        with database.atomic() as savepoint:
+            yield savepoint
+
+    def invalidate_identity_map(self, bike_ids=(), component_ids=()):
+        """Method to drop written bikes and components from the identity map of the current request, if any"""
+        identity_map = request_identity_map.get()
+        if identity_map is not None:
+            identity_map.invalidate(bike_ids, component_ids)
+
+    def count_writes(self, applied=0, skipped=0):
+        """Method to count status writes that were applied and writes skipped because nothing changed"""
+        with self.write_counters_lock:
+            self.write_counters["applied"] += applied
+            self.write_counters["skipped"] += skipped
+
+    def read_write_counters(self):
+        """Method to get a snapshot of applied and skipped status writes"""
+        with self.write_counters_lock:
+            return dict(self.write_counters)
+
+    def skip_write_generation(self):
+        """Method to let the running write method finish without advancing the write generation, because it changed nothing"""
+        write_unchanged.set(True)
+
+    def save_changed_fields(self, record, new_values):
+        """Method to update only the columns whose new value differs from the stored one. Returns True if a write was issued"""
+        changed_fields = [field for field, value in new_values.items() if getattr(record, field) != value]
+
+        if not changed_fields:
+            self.count_writes(skipped=1)
+            return False
+
+        for field in changed_fields:
+            setattr(record, field, new_values[field])
+        record.save(only=[getattr(type(record), field) for field in changed_fields])
+        self.count_writes(applied=1)
+        return True
 
     def read_bikes(self):
         """Method to read content of bikes table"""
@@ -27,6 +399,10 @@ class DatabaseManager:
 
     def read_single_bike(self, bike_id):
         """Method to retrieve record for a specific bike"""
+        identity_map = request_identity_map.get()
+        if identity_map is not None:
+            return identity_map.get_bike(bike_id)
+
         return (Bikes
                 .get_or_none(Bikes.bike_id == bike_id))
 
@@ -40,6 +416,11 @@ class DatabaseManager:
 
         return "Not assigned"
 
+    def read_bike_names(self):
+        """Method to map bike ids to bike names with a single query, for views that name the bike of many components"""
+        return {bike_id: bike_name if bike_name is not None else "Not assigned"
+                for bike_id, bike_name in Bikes.select(Bikes.bike_id, Bikes.bike_name).tuples()}
+
     def read_bike_id_recent_component_history(self, component_id):
         """Method to get bike id from most recent component history"""
         return (ComponentHistory
@@ -95,16 +476,147 @@ class DatabaseManager:
 
         return None
 
-    def read_sum_distance_subset_rides(self, bike_id, start_date, stop_date):
+    def read_sum_distance_subset_rides(self, bike_id, start_date, stop_date, include_stop=True):
         """Method to sum distance for a given set of rides"""
-        matching_rides = (Rides.select()
-                          .where((Rides.bike_id == bike_id) &
-                                 (Rides.record_time >= start_date) &
-                                 (Rides.record_time <= stop_date)))
-        if matching_rides:
-            return sum(ride.ride_distance for ride in matching_rides)
-
-        return 0
+        return self.ride_distance_index.sum_distance(bike_id, start_date, stop_date, include_stop)
+
+    def read_keyset_page(self, query, sort_field, key_field, descending, cursor, limit):
+        """Method to read one page of a query ordered by a sort column or expression and a unique key, continuing after a (sort value, key) cursor.
+        Returns the rows and the cursor for the next page, None on the last page"""
+        if cursor is not None:
+            sort_value, key_value = cursor
+            # SQLite sorts NULL first ascending and last descending, so NULL sort values need their own branches
+            if descending:
+                if sort_value is None:
+                    query = query.where(sort_field.is_null() & (key_field < key_value))
+                else:
+                    query = query.where((sort_field < sort_value) |
+                                        sort_field.is_null() |
+                                        ((sort_field == sort_value) & (key_field < key_value)))
+            else:
+                if sort_value is None:
+                    query = query.where(sort_field.is_null(False) | (sort_field.is_null() & (key_field > key_value)))
+                else:
+                    query = query.where((sort_field > sort_value) | ((sort_field == sort_value) & (key_field > key_value)))
+
+        ordering = (sort_field.desc(), key_field.desc()) if descending else (sort_field.asc(), key_field.asc())
+        rows = list(query.select_extend(sort_field.alias("sort_value")).order_by(*ordering).limit(limit + 1))
+
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, (rows[-1].sort_value, getattr(rows[-1], key_field.name))
+
+    def read_components_page(self, installation_statuses=None, component_type=None, bike_id=None, search=None,
+                             sort_by="name", descending=False, cursor=None, limit=50):
+        """Method to read one page of components as named tuples, filtered by installation status, type, bike
+        and a search term matched against component name, type, bike name and collection name"""
+        query = Components.select(Components.component_id,
+                                  Components.component_name,
+                                  Components.component_type,
+                                  Components.bike_id,
+                                  Components.component_distance,
+                                  Components.installation_status,
+                                  Components.lifetime_status,
+                                  Components.service_status,
+                                  Components.lifetime_remaining,
+                                  Components.lifetime_remaining_days,
+                                  Components.service_next,
+                                  Components.service_next_days,
+                                  Components.threshold_km,
+                                  Components.threshold_days,
+                                  Components.updated_date)
+
+        if installation_statuses:
+            query = query.where(Components.installation_status.in_(installation_statuses))
+        if component_type:
+            query = query.where(Components.component_type == component_type)
+        if bike_id:
+            query = query.where(Components.bike_id == bike_id)
+        if search:
+            query = query.where(Components.component_name.contains(search) |
+                                Components.component_type.contains(search) |
+                                Components.bike_id.in_(Bikes
+                                                       .select(Bikes.bike_id)
+                                                       .where(Bikes.bike_name.contains(search))) |
+                                Components.component_id.in_(CollectionComponents
+                                                            .select(CollectionComponents.component_id)
+                                                            .join(Collections, on=(Collections.collection_id == CollectionComponents.collection_id))
+                                                            .where(Collections.collection_name.contains(search))))
+
+        return self.read_keyset_page(query.namedtuples(), COMPONENT_PAGE_SORT_FIELDS[sort_by], Components.component_id,
+                                     descending, cursor, limit)
+
+    def read_component_status_counts(self):
+        """Method to count components per installation status"""
+        return dict(Components
+                    .select(Components.installation_status, peewee.fn.COUNT(Components.component_id))
+                    .group_by(Components.installation_status)
+                    .tuples())
+
+    def read_rides_page(self, bike_id=None, commute=None, start_date=None, stop_date=None,
+                        sort_by="record_time", descending=True, cursor=None, limit=50):
+        """Method to read one page of rides as named tuples, filtered by bike, commute and a record time range"""
+        query = Rides.select(Rides.ride_id,
+                             Rides.bike_id,
+                             Rides.record_time,
+                             Rides.ride_name,
+                             Rides.ride_distance,
+                             Rides.moving_time,
+                             Rides.commute)
+
+        if bike_id:
+            query = query.where(Rides.bike_id == bike_id)
+        if commute is not None:
+            query = query.where(Rides.commute == str(commute))
+        if start_date:
+            query = query.where(Rides.record_time >= start_date)
+        if stop_date:
+            query = query.where(Rides.record_time <= stop_date)
+
+        return self.read_keyset_page(query.namedtuples(), RIDE_PAGE_SORT_FIELDS[sort_by], Rides.ride_id,
+                                     descending, cursor, limit)
+
+    def read_history_page(self, component_id=None, bike_id=None, update_reason=None,
+                          sort_by="updated_date", descending=True, cursor=None, limit=50):
+        """Method to read one page of installation log records as named tuples, filtered by component, bike and reason"""
+        query = ComponentHistory.select(ComponentHistory.history_id,
+                                        ComponentHistory.component_id,
+                                        ComponentHistory.component_name,
+                                        ComponentHistory.bike_id,
+                                        ComponentHistory.updated_date,
+                                        ComponentHistory.update_reason,
+                                        ComponentHistory.distance_marker)
+
+        if component_id:
+            query = query.where(ComponentHistory.component_id == component_id)
+        if bike_id:
+            query = query.where(ComponentHistory.bike_id == bike_id)
+        if update_reason:
+            query = query.where(ComponentHistory.update_reason == update_reason)
+
+        return self.read_keyset_page(query.namedtuples(), HISTORY_PAGE_SORT_FIELDS[sort_by], ComponentHistory.history_id,
+                                     descending, cursor, limit)
+
+    def read_ride_daily_totals(self, bike_id, start_date=None, stop_date=None):
+        """Method to read daily ride totals for a bike as (date, distance, moving time in seconds, ride count, commute distance, commute count),
+        oldest first. Dates are given as YYYY-MM-DD and None leaves that end open"""
+        query = (RideDailyTotals
+                 .select(RideDailyTotals.ride_date,
+                         RideDailyTotals.distance,
+                         RideDailyTotals.moving_time_seconds,
+                         RideDailyTotals.ride_count,
+                         RideDailyTotals.commute_distance,
+                         RideDailyTotals.commute_count)
+                 .where(RideDailyTotals.bike_id == bike_id))
+
+        if start_date is not None:
+            query = query.where(RideDailyTotals.ride_date >= start_date)
+        if stop_date is not None:
+            query = query.where(RideDailyTotals.ride_date <= stop_date)
+
+        return list(query.order_by(RideDailyTotals.ride_date.asc()).tuples())
 
     def read_all_component_types(self):
         """Method to read and sort content of component_types table"""
@@ -157,7 +669,8 @@ class DatabaseManager:
 
     def read_all_components(self):
         """Method to read content of components table as formatted tuples"""
-        all_components = Components.select()
+        all_components = self.read_component_list_records()
+        bike_names = self.read_bike_names()
 
         all_components_data = [(component.component_id,
                                 component.component_type,
@@ -166,7 +679,7 @@ class DatabaseManager:
                                 component.installation_status,
                                 format_component_status(component.lifetime_status),
                                 format_component_status(component.service_status),
-                                self.read_bike_name(component.bike_id),
+                                bike_names.get(component.bike_id, "Not assigned"),
                                 format_cost(component.cost),
                                 component.lifetime_remaining,
                                 component.lifetime_remaining_days,
@@ -179,6 +692,62 @@ class DatabaseManager:
 
         return all_components_data
 
+    def read_component_list_records(self, component_ids=None):
+        """Method to read the columns shown in component lists as lightweight named tuples instead of full model instances,
+        for given components or all components if None"""
+        query = (Components
+                 .select(Components.component_id,
+                         Components.component_type,
+                         Components.component_name,
+                         Components.component_distance,
+                         Components.installation_status,
+                         Components.lifetime_status,
+                         Components.service_status,
+                         Components.bike_id,
+                         Components.cost,
+                         Components.lifetime_remaining,
+                         Components.lifetime_remaining_days,
+                         Components.service_next,
+                         Components.service_next_days,
+                         Components.threshold_km,
+                         Components.threshold_days,
+                         Components.updated_date)
+                 .namedtuples())
+
+        if component_ids is not None:
+            query = query.where(Components.component_id.in_(component_ids))
+
+        return query
+
+    def read_component_status_records(self, bike_id):
+        """Method to read installation, lifetime and service status of components on a bike as named tuples"""
+        return list(Components
+                    .select(Components.installation_status,
+                            Components.lifetime_status,
+                            Components.service_status)
+                    .where(Components.bike_id == bike_id)
+                    .namedtuples())
+
+    def read_installed_component_status_records_for_bikes(self, bike_ids):
+        """Method to read type, bike and status of installed components on a list of bikes as named tuples"""
+        return (Components
+                .select(Components.bike_id,
+                        Components.component_type,
+                        Components.lifetime_status,
+                        Components.service_status)
+                .where((Components.installation_status == 'Installed') &
+                       (Components.bike_id.in_(bike_ids)))
+                .namedtuples())
+
+    def read_component_state_records(self, component_ids):
+        """Method to read installation status and bike of a list of components as named tuples"""
+        return (Components
+                .select(Components.component_id,
+                        Components.installation_status,
+                        Components.bike_id)
+                .where(Components.component_id.in_(component_ids))
+                .namedtuples())
+
     def read_all_components_objects(self):
         """Method to read all component objects (not tuples)"""
         return Components.select()
@@ -196,8 +765,86 @@ class DatabaseManager:
                 .where((Components.installation_status == 'Installed') &
                 (Components.bike_id == bike_id)))
 
+    def read_installed_components_for_bikes(self, bike_ids):
+        """Method to read installed components for a list of bikes in one query"""
+        return (Components
+                .select()
+                .where((Components.installation_status == 'Installed') &
+                (Components.bike_id.in_(bike_ids))))
+
+    def read_components_for_bikes(self, bike_ids):
+        """Method to read all components for a list of bikes in one query"""
+        return (Components
+                .select()
+                .where(Components.bike_id.in_(bike_ids)))
+
+    def read_bikes_for_ids(self, bike_ids):
+        """Method to read records for a list of bikes in one query"""
+        return (Bikes
+                .select()
+                .where(Bikes.bike_id.in_(bike_ids)))
+
+    def read_history_for_components(self, component_ids):
+        """Method to read installation log records for a list of components in one query"""
+        return (ComponentHistory
+                .select()
+                .where(ComponentHistory.component_id.in_(component_ids))
+                .order_by(ComponentHistory.updated_date.desc()))
+
+    def read_installation_intervals(self, component_id):
+        """Method to read periods where a component was installed as (bike id, start date, stop date), oldest first. Stop date is None while still installed"""
+        return list(InstallationIntervals
+                    .select(InstallationIntervals.bike_id,
+                            InstallationIntervals.start_date,
+                            InstallationIntervals.stop_date)
+                    .where(InstallationIntervals.component_id == component_id)
+                    .order_by(InstallationIntervals.start_date.asc())
+                    .tuples())
+
+    def read_installation_intervals_for_components(self, component_ids):
+        """Method to read installation periods for a list of components in one query, grouped by component"""
+        intervals_by_component = {}
+        for component_id, bike_id, start_date, stop_date in (InstallationIntervals
+                                                             .select(InstallationIntervals.component_id,
+                                                                     InstallationIntervals.bike_id,
+                                                                     InstallationIntervals.start_date,
+                                                                     InstallationIntervals.stop_date)
+                                                             .where(InstallationIntervals.component_id.in_(component_ids))
+                                                             .order_by(InstallationIntervals.start_date.asc())
+                                                             .tuples()):
+            intervals_by_component.setdefault(component_id, []).append((bike_id, start_date, stop_date))
+
+        return intervals_by_component
+
+    def read_services_for_components(self, component_ids):
+        """Method to read service records for a list of components in one query"""
+        return (Services
+                .select()
+                .where(Services.component_id.in_(component_ids))
+                .order_by(Services.service_date.desc()))
+
+    def read_first_installation_dates(self, component_ids):
+        """Method to read the date of the oldest installation log record per component in one grouped query"""
+        return dict(ComponentHistory
+                    .select(ComponentHistory.component_id, peewee.fn.MIN(ComponentHistory.updated_date))
+                    .where(ComponentHistory.component_id.in_(component_ids))
+                    .group_by(ComponentHistory.component_id)
+                    .tuples())
+
+    def read_latest_service_dates(self, component_ids):
+        """Method to read the date of the most recent service record per component in one grouped query"""
+        return dict(Services
+                    .select(Services.component_id, peewee.fn.MAX(Services.service_date))
+                    .where(Services.component_id.in_(component_ids))
+                    .group_by(Services.component_id)
+                    .tuples())
+
     def read_component(self, component_id):
         """Method to retrieve record for a specific component"""
+        identity_map = request_identity_map.get()
+        if identity_map is not None:
+            return identity_map.get_component(component_id)
+
         return (Components
                 .get_or_none(Components.component_id == component_id))
 
@@ -271,15 +918,82 @@ class DatabaseManager:
 
     def read_collection_by_component(self, component_id):
         """Method to find collection containing a specific component"""
-        all_collections = Collections.select()
-
-        for collection in all_collections:
-            if collection.components:
-                component_ids = json.loads(collection.components)
-                if component_id in component_ids:
-                    return collection
+        if active_unit_of_work.get() is not None:
+            return (Collections
+                    .select()
+                    .join(CollectionComponents, on=(CollectionComponents.collection_id == Collections.collection_id))
+                    .where(CollectionComponents.component_id == component_id)
+                    .first())
+
+        return self.read_component_collection_index()["collections"].get(component_id)
+
+    def read_component_collection_index(self):
+        """Method to get the reverse index from component id to collection record, collection name and collection data tuple.
+        The index is rebuilt from the collection links if a collection write has invalidated it"""
+        entries, version = self.collection_index.get_entries()
+        if entries is not None:
+            return entries
+
+        collections = {collection.collection_id: collection for collection in Collections.select()}
+        entries = {"collections": {}, "collection_names": {}, "collection_data": {}}
+        for collection_id, component_id in (CollectionComponents
+                                            .select(CollectionComponents.collection_id, CollectionComponents.component_id)
+                                            .tuples()):
+            collection = collections.get(collection_id)
+            if collection:
+                entries["collections"][component_id] = collection
+                entries["collection_names"][component_id] = collection.collection_name
+                entries["collection_data"][component_id] = (collection.collection_id,
+                                                            collection.collection_name,
+                                                            collection.components,
+                                                            collection.bike_id,
+                                                            collection.comment,
+                                                            collection.updated_date)
+
+        if active_unit_of_work.get() is None:
+            self.collection_index.store_entries(entries, version)
+
+        return entries
+
+    def read_linkable_incidents(self, bike_id, component_ids):
+        """Method to read open incident reports not linked to a workplan that affect a bike or list any of the given components as affected"""
+        conditions = []
+        if bike_id:
+            conditions.append(Incidents.incident_affected_bike_id == bike_id)
+        if component_ids:
+            conditions.append(Incidents.incident_id.in_(IncidentComponents
+                                                        .select(IncidentComponents.incident_id)
+                                                        .where(IncidentComponents.component_id.in_(component_ids))))
+
+        if not conditions:
+            return []
 
-        return None
+        return (Incidents
+                .select()
+                .where((Incidents.incident_status == "Open") &
+                       (Incidents.workplan_id.is_null() | (Incidents.workplan_id == "")) &
+                       functools.reduce(operator.or_, conditions)))
+
+    def read_linked_component_ids(self, link_model, owner_ids):
+        """Method to read component ids linked to a list of collections, incidents or workplans in one query, grouped by owner in stored order"""
+        owner_field = getattr(link_model, link_model._meta.primary_key.field_names[0])
+        component_ids_by_owner = {}
+        for owner_id, component_id in (link_model
+                                       .select(owner_field, link_model.component_id)
+                                       .where(owner_field.in_(owner_ids))
+                                       .order_by(owner_field, link_model.position)
+                                       .tuples()):
+            component_ids_by_owner.setdefault(owner_id, []).append(component_id)
+
+        return component_ids_by_owner
+
+    def read_incident_component_ids(self, incident_ids):
+        """Method to read affected component ids for a list of incident reports, grouped by incident"""
+        return self.read_linked_component_ids(IncidentComponents, incident_ids)
+
+    def read_workplan_component_ids(self, workplan_ids):
+        """Method to read affected component ids for a list of workplans, grouped by workplan"""
+        return self.read_linked_component_ids(WorkplanComponents, workplan_ids)
 
     def read_single_incident_report(self, incident_id):
         """Method to retrieve record for a specific incident report"""
@@ -327,44 +1041,319 @@ class DatabaseManager:
                 .where(Services.workplan_id == workplan_id)
                 .order_by(Services.service_date.desc()))
 
+    def read_query_plans(self):
+        """Method to run EXPLAIN QUERY PLAN for the main read queries and collect those that scan full tables"""
+        sample_id = "query-plan-check"
+        sample_date = "2000-01-01 00:00"
+
+        queries = {"read_bikes": self.read_bikes(),
+                   "read_single_bike": Bikes.select().where(Bikes.bike_id == sample_id),
+                   "read_unique_bikes": Rides.select(Rides.bike_id).distinct(),
+                   "read_recent_rides": self.read_recent_rides(sample_id),
+                   "read_matching_rides": self.read_matching_rides(sample_id, sample_date),
+                   "read_latest_ride_record": Rides.select().order_by(Rides.record_time.desc()).limit(1),
+                   "read_sum_distance_subset_rides": (Rides
+                                                      .select(Rides.record_time, Rides.ride_distance)
+                                                      .where(Rides.bike_id == sample_id)
+                                                      .order_by(Rides.record_time.asc())),
+                   "read_all_components": Components.select(),
+                   "read_subset_components": self.read_subset_components(sample_id),
+                   "read_subset_installed_components": self.read_subset_installed_components(sample_id),
+                   "read_component": Components.select().where(Components.component_id == sample_id),
+                   "count_component_types_in_use": Components.select().where(Components.component_type == sample_id),
+                   "read_subset_component_history": self.read_subset_component_history(sample_id),
+                   "read_latest_history_record": self.read_subset_component_history(sample_id).limit(1),
+                   "read_subset_service_history": self.read_subset_service_history(sample_id),
+                   "read_latest_service_record": self.read_subset_service_history(sample_id).limit(1),
+                   "read_all_collections": self.read_all_collections(),
+                   "read_collection_by_component": (Collections
+                                                    .select()
+                                                    .join(CollectionComponents, on=(CollectionComponents.collection_id == Collections.collection_id))
+                                                    .where(CollectionComponents.component_id == sample_id)),
+                   "read_linkable_incidents": self.read_linkable_incidents(sample_id, [sample_id]),
+                   "read_open_incidents": self.read_open_incidents(),
+                   "read_planned_workplans": self.read_planned_workplans(),
+                   "read_rides_page": (Rides
+                                       .select()
+                                       .where(Rides.bike_id == sample_id)
+                                       .order_by(Rides.record_time.desc(), Rides.ride_id.desc())),
+                   "read_history_page": (ComponentHistory
+                                         .select()
+                                         .where(ComponentHistory.component_id == sample_id)
+                                         .order_by(ComponentHistory.updated_date.desc(), ComponentHistory.history_id.desc())),
+                   "read_incidents_by_workplan": self.read_incidents_by_workplan(sample_id),
+                   "read_services_by_workplan": self.read_services_by_workplan(sample_id)}
+
+        query_plans = {}
+        full_scans = []
+        for query_name, query in queries.items():
+            sql, params = query.sql()
+            plan_details = [row[3] for row in self.database.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params)]
+            query_plans[query_name] = plan_details
+
+            if any(detail.startswith("SCAN") and "INDEX" not in detail for detail in plan_details):
+                full_scans.append(query_name)
+
+        return query_plans, full_scans
+
+    def read_effective_pragmas(self):
+        """Method to compare configured SQLite pragmas with the values in effect on the current connection"""
+        named_values = {"synchronous": {0: "off", 1: "normal", 2: "full", 3: "extra"},
+                        "temp_store": {0: "default", 1: "file", 2: "memory"}}
+
+        effective_pragmas = {}
+        mismatches = []
+        for pragma, configured in PRAGMAS.items():
+            effective = self.database.pragma(pragma)
+            effective = named_values.get(pragma, {}).get(effective, effective)
+            effective_pragmas[pragma] = effective
+
+            if str(effective).lower() != str(configured).lower():
+                mismatches.append(f"{pragma} is {effective}, configured {configured}")
+
+        return effective_pragmas, mismatches
+
+    def write_wal_checkpoint(self):
+        """Method to copy the write-ahead log into the database file and truncate the log"""
+        try:
+            busy, log_frames, checkpointed_frames = self.database.execute_sql("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+
+            if log_frames < 0:
+                return True, "Database is not in WAL mode. No checkpoint needed."
+
+            if busy:
+                return True, f"Checkpoint ran while readers were active. Copied {checkpointed_frames} of {log_frames} frames from the write-ahead log."
+
+            return True, f"Checkpoint copied {checkpointed_frames} frames from the write-ahead log and truncated it."
+
+        except peewee.OperationalError as error:
+            return False, f"Checkpoint of write-ahead log failed: {str(error)}."
+
+    def refresh_installation_intervals(self, component_ids=None):
+        """Method to rebuild derived installation periods from the installation log, for given components or all components if None.
+        Records sharing a timestamp are ordered with installations last, so a swap within the same minute ends one period before the next starts.
+        Call inside the transaction that changed the log"""
+        installs_last = peewee.Case(None, [(ComponentHistory.update_reason == "Installed", 1)], 0)
+        history_query = ComponentHistory.select().order_by(ComponentHistory.component_id, ComponentHistory.updated_date.asc(), installs_last)
+        delete_query = InstallationIntervals.delete()
+        if component_ids is not None:
+            history_query = history_query.where(ComponentHistory.component_id.in_(component_ids))
+            delete_query = delete_query.where(InstallationIntervals.component_id.in_(component_ids))
+
+        history_records = list(history_query)
+        intervals = []
+        for index, record in enumerate(history_records):
+            if record.update_reason == "Installed":
+                next_record = history_records[index + 1] if index + 1 < len(history_records) else None
+                stop_date = next_record.updated_date if next_record and next_record.component_id == record.component_id else None
+                intervals.append({"interval_id": record.history_id,
+                                  "component_id": record.component_id,
+                                  "bike_id": record.bike_id,
+                                  "start_date": record.updated_date,
+                                  "stop_date": stop_date})
+
+        delete_query.execute()
+        for batch in peewee.chunked(intervals, 100):
+            InstallationIntervals.insert_many(batch).execute()
+
+        return len(intervals)
+
+    def refresh_component_links(self, link_model, owner_id, component_ids_raw):
+        """Method to replace the link rows of a collection, incident or workplan from its JSON list of component ids.
+        Call inside the transaction that wrote the record"""
+        owner_field_name = link_model._meta.primary_key.field_names[0]
+        link_model.delete().where(getattr(link_model, owner_field_name) == owner_id).execute()
+
+        try:
+            component_ids = json.loads(component_ids_raw) if component_ids_raw else []
+        except (TypeError, ValueError):
+            component_ids = []
+
+        if not isinstance(component_ids, list):
+            component_ids = []
+
+        links = [{owner_field_name: owner_id, "component_id": component_id, "position": position}
+                 for position, component_id in enumerate(dict.fromkeys(component_ids))]
+        for batch in peewee.chunked(links, 100):
+            link_model.insert_many(batch).execute()
+
+        return len(links)
+
+    def write_rebuild_component_links(self):
+        """Method to create the component link tables if missing and rebuild them from the JSON lists of component ids"""
+        link_sources = ((CollectionComponents, Collections.select(Collections.collection_id, Collections.components)),
+                        (IncidentComponents, Incidents.select(Incidents.incident_id, Incidents.incident_affected_component_ids)),
+                        (WorkplanComponents, Workplans.select(Workplans.workplan_id, Workplans.workplan_affected_component_ids)))
+        try:
+            with database.atomic():
+                create_derived_tables()
+                link_count = 0
+                for link_model, owner_query in link_sources:
+                    link_model.delete().execute()
+                    for owner_id, component_ids_raw in owner_query.tuples():
+                        link_count += self.refresh_component_links(link_model, owner_id, component_ids_raw)
+
+            return True, f"Component links rebuilt: {link_count} links."
+
+        except peewee.OperationalError as error:
+            return False, f"Rebuild of component links failed: {str(error)}."
+
+        finally:
+            self.collection_index.invalidate()
+
+    def refresh_ride_daily_totals(self, bike_dates=None):
+        """Method to rebuild daily ride totals for given (bike id, YYYY-MM-DD) pairs, or for all rides if None.
+        Call inside the transaction that changed the rides"""
+        rides_query = Rides.select(Rides.bike_id, Rides.record_time, Rides.ride_distance, Rides.moving_time, Rides.commute)
+        delete_query = RideDailyTotals.delete()
+        ride_dates = None
+
+        if bike_dates is not None:
+            if not bike_dates:
+                return 0
+
+            bike_ids = {bike_id for bike_id, _ in bike_dates}
+            ride_dates = {ride_date for _, ride_date in bike_dates}
+            rides_query = rides_query.where(Rides.bike_id.in_(bike_ids) &
+                                            (Rides.record_time >= min(ride_dates)) &
+                                            (Rides.record_time <= f"{max(ride_dates)} 23:59"))
+            delete_query = delete_query.where(RideDailyTotals.bike_id.in_(bike_ids) &
+                                              RideDailyTotals.ride_date.in_(ride_dates))
+
+        daily_totals = {}
+        for bike_id, record_time, ride_distance, moving_time, commute in rides_query.tuples():
+            ride_date = record_time[:10]
+            if ride_dates is not None and ride_date not in ride_dates:
+                continue
+
+            totals = daily_totals.setdefault((bike_id, ride_date), {"bike_id": bike_id,
+                                                                    "ride_date": ride_date,
+                                                                    "distance": 0,
+                                                                    "moving_time_seconds": 0,
+                                                                    "ride_count": 0,
+                                                                    "commute_distance": 0,
+                                                                    "commute_count": 0})
+            totals["distance"] += ride_distance
+            totals["moving_time_seconds"] += parse_moving_time(moving_time)
+            totals["ride_count"] += 1
+            if str(commute) in ("True", "1"):
+                totals["commute_distance"] += ride_distance
+                totals["commute_count"] += 1
+
+        delete_query.execute()
+        for batch in peewee.chunked(list(daily_totals.values()), 100):
+            RideDailyTotals.insert_many(batch).execute()
+
+        return len(daily_totals)
+
+    def write_rebuild_ride_daily_totals(self):
+        """Method to create the daily ride totals table if missing and rebuild it from the rides table"""
+        try:
+            with database.atomic():
+                create_derived_tables()
+                day_count = self.refresh_ride_daily_totals()
+
+            return True, f"Daily ride totals rebuilt: {day_count} bike days."
+
+        except peewee.OperationalError as error:
+            return False, f"Rebuild of daily ride totals failed: {str(error)}."
+
+    def write_rebuild_installation_intervals(self):
+        """Method to create the installation intervals table if missing and rebuild it from the installation log"""
+        try:
+            with database.atomic():
+                create_derived_tables()
+                interval_count = self.refresh_installation_intervals()
+
+            return True, f"Installation intervals rebuilt: {interval_count} intervals."
+
+        except peewee.OperationalError as error:
+            return False, f"Rebuild of installation intervals failed: {str(error)}."
+
+    def write_create_indexes(self):
+        """Method to create missing indexes in database"""
+        try:
+            create_indexes()
+
+            return True, "Indexes verified."
+
+        except peewee.OperationalError as error:
+            return False, f"Creation of indexes failed: {str(error)}."
+
+    @bumps_write_generation
     def write_update_rides_bulk(self, ride_list):
-        """Method to create or update ride data in bulk in database"""
+        """Method to create or update ride data in bulk in database. Rides identical to the stored row are left untouched.
+        Returns the ids of rides inserted or changed and the bikes those rides belong or belonged to"""
+        changed_ride_ids = set()
+        affected_bike_ids = set()
+
         try:
             with database.atomic():
-                batch_size = 50
+                batch_size = self.ride_insert_batch_size
                 total_processed = 0
+                affected_bike_dates = set()
 
                 for i in range(0, len(ride_list), batch_size):
                     batch = ride_list[i:i + batch_size]
-                    rides_tuples_list = [(dictionary['ride_id'],
-                                          dictionary['bike_id'],
-                                          dictionary['record_time'],
-                                          dictionary['ride_name'],
-                                          dictionary['ride_distance'],
-                                          dictionary['moving_time'],
-                                          dictionary['commute'])
-                                         for dictionary in batch]
-
-                    Rides.insert_many(rides_tuples_list).on_conflict(
-                        conflict_target=[Rides.ride_id],
-                        action='REPLACE').execute()
+                    previous_rides = {ride[0]: ride[1:] for ride in (Rides
+                                                                     .select(*RIDE_UPSERT_FIELDS)
+                                                                     .where(Rides.ride_id.in_([dictionary['ride_id'] for dictionary in batch]))
+                                                                     .tuples())}
+
+                    rides_tuples_list = []
+                    for dictionary in batch:
+                        ride_tuple = tuple(field.db_value(dictionary[field.name]) for field in RIDE_UPSERT_FIELDS)
+                        previous_ride = previous_rides.get(ride_tuple[0])
+
+                        if previous_ride == ride_tuple[1:]:
+                            continue
+
+                        if previous_ride is not None:
+                            affected_bike_ids.add(previous_ride[0])
+                            affected_bike_dates.add((previous_ride[0], previous_ride[1][:10]))
+
+                        affected_bike_ids.add(dictionary['bike_id'])
+                        affected_bike_dates.add((dictionary['bike_id'], dictionary['record_time'][:10]))
+                        changed_ride_ids.add(ride_tuple[0])
+                        rides_tuples_list.append(ride_tuple)
+
+                    if rides_tuples_list:
+                        Rides.insert_many(rides_tuples_list, fields=RIDE_UPSERT_FIELDS).on_conflict(
+                            conflict_target=[Rides.ride_id],
+                            update={field: getattr(peewee.EXCLUDED, field.name) for field in RIDE_UPSERT_FIELDS[1:]},
+                            where=functools.reduce(operator.or_, [field != getattr(peewee.EXCLUDED, field.name) for field in RIDE_UPSERT_FIELDS[1:]])).execute()
 
                     total_processed += len(batch)
 
-                return True, f"Rides table updated successfully. Processed {total_processed} rides."
+                self.refresh_ride_daily_totals(affected_bike_dates)
+
+            if not changed_ride_ids:
+                self.skip_write_generation()
+
+            self.ride_distance_index.invalidate(affected_bike_ids)
+
+            return True, f"Rides table updated successfully. Processed {total_processed} rides, {len(changed_ride_ids)} new or changed.", changed_ride_ids, affected_bike_ids
 
         except peewee.OperationalError as error:
-            return False, f"An error occurred during bulk update of rides table: {str(error)}."
+            self.ride_distance_index.invalidate({dictionary['bike_id'] for dictionary in ride_list} | affected_bike_ids)
+            return False, f"An error occurred during bulk update of rides table: {str(error)}.", set(), set()
 
+    @bumps_write_generation
     def write_update_bikes(self, bike_list):
-        """Method to create or update bike data to the database"""
+        """Method to create or update bike data to the database. Bikes identical to the stored record are left untouched"""
+        changed_bike_ids = [bike_data["bike_id"] for bike_data in bike_list]
         try:
             with database.atomic():
+                changed_bike_ids = []
                 for bike_data in bike_list:
                     existing_bike = self.read_single_bike(bike_data["bike_id"])
 
                     if existing_bike:
                         filtered_bike_data = {key: value for key, value in bike_data.items() if key != 'bike_id'}
+                        if all(Bikes._meta.fields[key].db_value(value) == Bikes._meta.fields[key].db_value(getattr(existing_bike, key))
+                               for key, value in filtered_bike_data.items()):
+                            continue
+
                         query = Bikes.update(**filtered_bike_data).where(Bikes.bike_id == bike_data["bike_id"])
                         query.execute()
 
@@ -372,30 +1361,51 @@ class DatabaseManager:
                         query = Bikes.insert(**bike_data)
                         query.execute()
 
-            return True, f'Records for {len(bike_list)} bikes updated.'
+                    changed_bike_ids.append(bike_data["bike_id"])
+
+            if not changed_bike_ids:
+                self.skip_write_generation()
+
+            return True, f'Records for {len(bike_list)} bikes checked, {len(changed_bike_ids)} updated.'
 
         except peewee.OperationalError as error:
             return False, f"Update of bike records failed: {str(error)}."
 
+        finally:
+            self.invalidate_identity_map(bike_ids=changed_bike_ids)
+
+    @bumps_write_generation
     def write_component_distance(self, component, total_distance):
         """Method to update component distance in database"""
+        changed = True
+
         try:
             with database.atomic():
-                component.component_distance = total_distance
-                component.save()
+                changed = self.save_changed_fields(component, {"component_distance": total_distance})
+
+            if not changed:
+                self.skip_write_generation()
 
             return True, component.component_name
 
         except peewee.OperationalError as error:
             return False, f"{component.component_name}: {str(error)}"
 
+        finally:
+            if changed:
+                self.invalidate_identity_map(component_ids=[component.component_id])
+                self.bike_summary.mark_stale([component.bike_id])
+
+    @bumps_write_generation
     def write_component_details(self, component_id, new_component_data):
         """Method to create or update component data to the database"""
+        previous_bike_id = None
         try:
             with database.atomic():
                 component = self.read_component(component_id)
                 
                 if component:
+                    previous_bike_id = component.bike_id
                     Components.update(**new_component_data).where(Components.component_id == component_id).execute()
                     return True, f'Component {component.component_name} updated.'
 
@@ -408,47 +1418,145 @@ class DatabaseManager:
 
         except peewee.OperationalError as error:
             return False, f"Component modification failed: {str(error)}"
+
+        finally:
+            self.invalidate_identity_map(component_ids=[component_id])
+            self.bike_summary.mark_stale([previous_bike_id, new_component_data.get("bike_id")])
     
+    @bumps_write_generation
     def write_component_lifetime_status(self, component, lifetime_remaining, lifetime_status, lifetime_remaining_days):
         """Method to update component lifetime status in database"""
+        changed = True
+
         try:
             with database.atomic():
-                component.lifetime_remaining = lifetime_remaining
-                component.lifetime_status = lifetime_status
-                component.lifetime_remaining_days = lifetime_remaining_days
-                component.save()
+                changed = self.save_changed_fields(component, {"lifetime_remaining": lifetime_remaining,
+                                                               "lifetime_status": lifetime_status,
+                                                               "lifetime_remaining_days": lifetime_remaining_days})
+
+            if not changed:
+                self.skip_write_generation()
 
             return True, f"{component.component_name}."
 
         except peewee.OperationalError as error:
             return False, f"{component.component_name}: {str(error)}."
 
+        finally:
+            if changed:
+                self.invalidate_identity_map(component_ids=[component.component_id])
+                self.bike_summary.mark_stale([component.bike_id])
+
+    @bumps_write_generation
     def write_component_service_status(self, component, service_next, service_status, service_next_days):
         """Method to update component service status in database"""
+        changed = True
+
         try:
             with database.atomic():
-                component.service_next = service_next
-                component.service_status = service_status
-                component.service_next_days = service_next_days
-                component.save()
+                changed = self.save_changed_fields(component, {"service_next": service_next,
+                                                               "service_status": service_status,
+                                                               "service_next_days": service_next_days})
+
+            if not changed:
+                self.skip_write_generation()
 
             return True, f"{component.component_name}."
 
         except peewee.OperationalError as error:
             return False, f"{component.component_name}: {str(error)}."
 
+        finally:
+            if changed:
+                self.invalidate_identity_map(component_ids=[component.component_id])
+                self.bike_summary.mark_stale([component.bike_id])
+
+    @bumps_write_generation
     def write_bike_service_status(self, bike, service_status):
         """Method to update bike service status in database"""
+        changed = True
+
         try:
             with database.atomic():
-                bike.service_status = service_status
-                bike.save()
+                changed = self.save_changed_fields(bike, {"service_status": service_status})
+
+            if not changed:
+                self.skip_write_generation()
 
             return True, f"{bike.bike_name}."
 
         except peewee.OperationalError as error:
             return False, f"{bike.bike_name}: {str(error)}."
 
+        finally:
+            if changed:
+                self.invalidate_identity_map(bike_ids=[bike.bike_id])
+
+    @bumps_write_generation
+    def write_component_status_bulk(self, components):
+        """Method to update distance, lifetime status and service status for many components in bulk"""
+        self.invalidate_identity_map(component_ids=[component.component_id for component in components])
+
+        try:
+            with database.atomic():
+                Components.bulk_update(components,
+                                       fields=[Components.component_distance,
+                                               Components.lifetime_remaining,
+                                               Components.lifetime_status,
+                                               Components.lifetime_remaining_days,
+                                               Components.service_next,
+                                               Components.service_status,
+                                               Components.service_next_days],
+                                       batch_size=50)
+
+            return True, f"Updated distance and status for {len(components)} components."
+
+        except peewee.OperationalError as error:
+            return False, f"Bulk update of component status failed: {str(error)}."
+
+        finally:
+            self.bike_summary.mark_stale({component.bike_id for component in components})
+
+    @bumps_write_generation
+    def write_component_time_status_bulk(self, components):
+        """Method to update the fields derived from days for many components in bulk"""
+        self.invalidate_identity_map(component_ids=[component.component_id for component in components])
+
+        try:
+            with database.atomic():
+                Components.bulk_update(components,
+                                       fields=[Components.lifetime_remaining,
+                                               Components.lifetime_status,
+                                               Components.lifetime_remaining_days,
+                                               Components.service_status,
+                                               Components.service_next_days],
+                                       batch_size=50)
+
+            return True, f"Updated time-based status for {len(components)} components."
+
+        except peewee.OperationalError as error:
+            return False, f"Bulk update of time-based component status failed: {str(error)}."
+
+        finally:
+            self.bike_summary.mark_stale({component.bike_id for component in components})
+
+    @bumps_write_generation
+    def write_bike_service_status_bulk(self, bikes):
+        """Method to update service status for many bikes in bulk"""
+        self.invalidate_identity_map(bike_ids=[bike.bike_id for bike in bikes])
+
+        try:
+            with database.atomic():
+                Bikes.bulk_update(bikes,
+                                  fields=[Bikes.service_status],
+                                  batch_size=50)
+
+            return True, f"Updated service status for {len(bikes)} bikes."
+
+        except peewee.OperationalError as error:
+            return False, f"Bulk update of bike status failed: {str(error)}."
+
+    @bumps_write_generation
     def write_service_record(self, service_data):
         """Method to write or update service record in database"""
         try:
@@ -467,8 +1575,10 @@ class DatabaseManager:
         except peewee.OperationalError as error:
             return False, f"Service record database error for {service_data['component_name']}: {str(error)}"
     
-    def write_history_record(self, history_data):
-        "Method to write or update history record in database"
+    @bumps_write_generation
+    def write_history_record(self, history_data, refresh_intervals=True):
+        """Method to write or update history record in database. Callers writing several records of a component
+        can pass refresh_intervals=False and call write_installation_intervals once afterwards"""
         try:
             with self.database.atomic():
                 existing_history = ComponentHistory.get_or_none(ComponentHistory.history_id == history_data['history_id'])
@@ -477,14 +1587,30 @@ class DatabaseManager:
                     ComponentHistory.update(**history_data).where(
                         ComponentHistory.history_id == history_data['history_id']
                     ).execute()
+                    if refresh_intervals:
+                        self.refresh_installation_intervals([history_data['component_id']])
                     return True, f"Updated history record for component {history_data['component_name']}."
                 else:
                     ComponentHistory.create(**history_data)
+                    if refresh_intervals:
+                        self.refresh_installation_intervals([history_data['component_id']])
                     return True, f"Created history record for component {history_data['component_name']}."
 
         except peewee.OperationalError as error:
             return False, f"History record database error for {history_data['component_name']}: {str(error)}"
 
+    @bumps_write_generation
+    def write_installation_intervals(self, component_ids):
+        """Method to rebuild derived installation periods for given components"""
+        try:
+            with self.database.atomic():
+                interval_count = self.refresh_installation_intervals(component_ids)
+                return True, f"Rebuilt {interval_count} installation intervals."
+
+        except peewee.OperationalError as error:
+            return False, f"Installation interval database error: {str(error)}"
+
+    @bumps_write_generation
     def write_collection(self, collection_data):
         """Method to create or update collection record in database"""
         try:
@@ -495,14 +1621,24 @@ class DatabaseManager:
                     Collections.update(**collection_data).where(
                         Collections.collection_id == collection_data['collection_id']
                     ).execute()
-                    return True, f"Updated collection {collection_data['collection_name']}"
                 else:
                     Collections.create(**collection_data)
+
+                if 'components' in collection_data:
+                    self.refresh_component_links(CollectionComponents, collection_data['collection_id'], collection_data['components'])
+
+                if existing_collection:
+                    return True, f"Updated collection {collection_data['collection_name']}"
+                else:
                     return True, f"Created collection {collection_data['collection_name']}"
 
         except peewee.OperationalError as error:
             return False, f"Collection database error for {collection_data['collection_name']}: {str(error)}"
+
+        finally:
+            self.collection_index.invalidate()
     
+    @bumps_write_generation
     def write_incident_record(self, incident_data):
         """Method to create or update incident record in database"""
         try:
@@ -513,14 +1649,21 @@ class DatabaseManager:
                     Incidents.update(**incident_data).where(
                         Incidents.incident_id == incident_data['incident_id']
                     ).execute()
-                    return True, f"Updated incident report with id {incident_data['incident_id']}"
                 else:
                     Incidents.create(**incident_data)
+
+                if 'incident_affected_component_ids' in incident_data:
+                    self.refresh_component_links(IncidentComponents, incident_data['incident_id'], incident_data['incident_affected_component_ids'])
+
+                if existing_incident:
+                    return True, f"Updated incident report with id {incident_data['incident_id']}"
+                else:
                     return True, f"Created new incident report with id {incident_data['incident_id']}"
 
         except peewee.OperationalError as error:
             return False, f"Incident record database error for report with id {incident_data['incident_id']}: {str(error)}"
     
+    @bumps_write_generation
     def write_workplan(self, workplan_data):
         """Method to create or update workplan record in database"""
         try:
@@ -531,14 +1674,21 @@ class DatabaseManager:
                     Workplans.update(**workplan_data).where(
                         Workplans.workplan_id == workplan_data['workplan_id']
                     ).execute()
-                    return True, f"Updated workplan with id {workplan_data['workplan_id']}"
                 else:
                     Workplans.create(**workplan_data)
+
+                if 'workplan_affected_component_ids' in workplan_data:
+                    self.refresh_component_links(WorkplanComponents, workplan_data['workplan_id'], workplan_data['workplan_affected_component_ids'])
+
+                if existing_workplan:
+                    return True, f"Updated workplan with id {workplan_data['workplan_id']}"
+                else:
                     return True, f"Created new workplan with id {workplan_data['workplan_id']}"
 
         except peewee.OperationalError as error:
             return False, f"Workplan database error for report with id {workplan_data['workplan_id']}: {str(error)}"
     
+    @bumps_write_generation
     def write_component_type(self, component_type_data):
         """Method to write component type record in database"""
         try:
@@ -559,8 +1709,13 @@ class DatabaseManager:
         except peewee.OperationalError as error:
             return False, f"{component_type_data['component_type']}: {str(error)}."
 
+        finally:
+            self.bike_summary.mark_all_stale()
+
+    @bumps_write_generation
     def write_delete_record(self, table_selector, record_id):
         """Method to delete a given record and associated records"""
+        affected_bike_ids = []
         try:
             with self.database.atomic():
                 if table_selector == "ComponentTypes":
@@ -572,26 +1727,32 @@ class DatabaseManager:
                 elif table_selector == "Incidents":
                     record = self.read_single_incident_report(record_id)
                     if record:
+                        IncidentComponents.delete().where(IncidentComponents.incident_id == record_id).execute()
                         record.delete_instance()
                         return True, f"Deleted incident report with id {record_id}"
                 
                 elif table_selector == "Workplans":
                     record = self.read_single_workplan(record_id)
                     if record:
+                        WorkplanComponents.delete().where(WorkplanComponents.workplan_id == record_id).execute()
                         record.delete_instance()
                         return True, f"Deleted workplan with id {record_id}"
                 
                 elif table_selector == "Components":
                     record = self.read_component(record_id)
+                    self.invalidate_identity_map(component_ids=[record_id])
                     if record:
+                        affected_bike_ids = [record.bike_id]
                         services_deleted = Services.delete().where(Services.component_id == record_id).execute()
                         history_deleted = ComponentHistory.delete().where(ComponentHistory.component_id == record_id).execute()
+                        self.refresh_installation_intervals([record_id])
                         record.delete_instance()
                         return True, f"Deleted component: {record.component_name}, related records deleted: {services_deleted} service(s), {history_deleted} history record(s)"
                 
                 elif table_selector == "Collections":
                     record = self.read_single_collection(record_id)
                     if record:
+                        CollectionComponents.delete().where(CollectionComponents.collection_id == record_id).execute()
                         record.delete_instance()
                         return True, f"Deleted collection with id {record_id}"
 
@@ -605,6 +1766,7 @@ class DatabaseManager:
                     record = self.read_single_history_record(record_id)
                     if record:
                         record.delete_instance()
+                        self.refresh_installation_intervals([record.component_id])
                         return True, f"Deleted installation history record with id {record_id}"
 
                 else:
@@ -618,3 +1780,12 @@ class DatabaseManager:
 
         except Exception as error:
             return False, f"Unexpected error deleting record: {str(error)}"
+
+        finally:
+            if table_selector == "ComponentTypes":
+                self.bike_summary.mark_all_stale()
+            else:
+                self.bike_summary.mark_stale(affected_bike_ids)
+
+            if table_selector == "Collections":
+                self.collection_index.invalidate()
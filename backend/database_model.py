@@ -6,11 +6,22 @@ from peewee import (SqliteDatabase,
                     Model,
                     CharField,
                     FloatField,
-                    IntegerField)
+                    IntegerField,
+                    CompositeKey)
 
 CONFIG = read_config()
 
-database = SqliteDatabase(CONFIG['db_path'])
+DEFAULT_PRAGMAS = {"journal_mode": "wal",
+                   "synchronous": "normal",
+                   "mmap_size": 67108864,
+                   "cache_size": -16000,
+                   "temp_store": "memory",
+                   "wal_autocheckpoint": 1000,
+                   "journal_size_limit": 67108864}
+
+PRAGMAS = {**DEFAULT_PRAGMAS, **CONFIG.get('sqlite_pragmas', {})}
+
+database = SqliteDatabase(CONFIG['db_path'], pragmas=PRAGMAS)
 
 class BaseModel(Model):
     """Base model for inheritance"""
@@ -46,6 +57,8 @@ class Rides(BaseModel):
     class Meta:
         """Extends model with extra attributes"""
         table_name = "rides"
+        indexes = ((('bike_id', 'record_time', 'ride_distance'), False),
+                   (('record_time',), False))
 
 
 class ComponentTypes(BaseModel):
@@ -94,6 +107,7 @@ class Components(BaseModel):
     class Meta:
         """Extends model with extra attributes"""
         table_name = "components"
+        indexes = ((('bike_id', 'installation_status'), False),)
 
 
 class Collections(BaseModel):
@@ -124,6 +138,7 @@ class ComponentHistory(BaseModel):
     class Meta:
         """Extends model with extra attributes"""
         table_name = "component_history"
+        indexes = ((('component_id', 'updated_date'), False),)
 
 
 class Services(BaseModel):
@@ -140,6 +155,7 @@ class Services(BaseModel):
     class Meta:
         """Extends model with extra attributes"""
         table_name = "services"
+        indexes = ((('component_id', 'service_date'), False),)
 
 
 class Incidents(BaseModel):
@@ -174,4 +190,95 @@ class Workplans(BaseModel):
 
     class Meta:
         """Extends model with extra attributes"""
-        table_name = "workplans"
\ No newline at end of file
+        table_name = "workplans"
+
+
+class InstallationIntervals(BaseModel):
+    """Model for table: installation_intervals. Derived from component_history, one row per period a component was installed"""
+    interval_id = CharField(primary_key=True, unique=True)
+    component_id = CharField()
+    bike_id = CharField(null=True)
+    start_date = CharField()
+    stop_date = CharField(null=True)
+
+    class Meta:
+        """Extends model with extra attributes"""
+        table_name = "installation_intervals"
+        indexes = ((('component_id', 'start_date'), False),)
+
+
+class RideDailyTotals(BaseModel):
+    """Model for table: ride_daily_totals. Derived from rides, one row per bike and day with rides"""
+    bike_id = CharField()
+    ride_date = CharField()
+    distance = FloatField()
+    moving_time_seconds = IntegerField()
+    ride_count = IntegerField()
+    commute_distance = FloatField()
+    commute_count = IntegerField()
+
+    class Meta:
+        """Extends model with extra attributes"""
+        table_name = "ride_daily_totals"
+        primary_key = CompositeKey('bike_id', 'ride_date')
+
+
+class CollectionComponents(BaseModel):
+    """Model for table: collection_components. Links collections to the components listed in collections.components"""
+    collection_id = CharField()
+    component_id = CharField()
+    position = IntegerField()
+
+    class Meta:
+        """Extends model with extra attributes"""
+        table_name = "collection_components"
+        primary_key = CompositeKey('collection_id', 'component_id')
+        indexes = ((('component_id',), False),)
+
+
+class IncidentComponents(BaseModel):
+    """Model for table: incident_components. Links incidents to the components listed in incidents.incident_affected_component_ids"""
+    incident_id = CharField()
+    component_id = CharField()
+    position = IntegerField()
+
+    class Meta:
+        """Extends model with extra attributes"""
+        table_name = "incident_components"
+        primary_key = CompositeKey('incident_id', 'component_id')
+        indexes = ((('component_id',), False),)
+
+
+class WorkplanComponents(BaseModel):
+    """Model for table: workplan_components. Links workplans to the components listed in workplans.workplan_affected_component_ids"""
+    workplan_id = CharField()
+    component_id = CharField()
+    position = IntegerField()
+
+    class Meta:
+        """Extends model with extra attributes"""
+        table_name = "workplan_components"
+        primary_key = CompositeKey('workplan_id', 'component_id')
+        indexes = ((('component_id',), False),)
+
+
+INDEXED_MODELS = [Rides, Components, ComponentHistory, Services, InstallationIntervals,
+                  CollectionComponents, IncidentComponents, WorkplanComponents]
+
+DERIVED_MODELS = [InstallationIntervals, RideDailyTotals, CollectionComponents, IncidentComponents, WorkplanComponents]
+
+def create_derived_tables():
+    """Function to create tables holding data derived from other tables, skipping those that already exist.
+    A derived table whose columns no longer match its model is dropped and created again, to be refilled by its rebuild"""
+    for model in DERIVED_MODELS:
+        if model.table_exists():
+            stored_columns = {column.name for column in database.get_columns(model._meta.table_name)}
+            if stored_columns != set(model._meta.columns):
+                model.drop_table()
+
+    database.create_tables(DERIVED_MODELS, safe=True)
+
+def create_indexes():
+    """Function to create indexes declared on the models, skipping those that already exist"""
+    for model in INDEXED_MODELS:
+        model._schema.create_indexes(safe=True)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Script to migrate the database, including adding new tables and fields"""
 
+import json
 import sqlite3
 import sys
 import os
@@ -525,6 +526,85 @@ def migrate_incidents_workplan_link(cursor, conn):
     print("      → Added workplan_id column to incidents table")
     return True
 
+def create_indexes(cursor, conn):
+    """Create composite indexes for the most frequent queries if they don't exist"""
+    indexes = {"rides_bike_id_record_time_ride_distance": "CREATE INDEX rides_bike_id_record_time_ride_distance ON rides (bike_id, record_time, ride_distance)",
+               "rides_record_time": "CREATE INDEX rides_record_time ON rides (record_time)",
+               "components_bike_id_installation_status": "CREATE INDEX components_bike_id_installation_status ON components (bike_id, installation_status)",
+               "componenthistory_component_id_updated_date": "CREATE INDEX componenthistory_component_id_updated_date ON component_history (component_id, updated_date)",
+               "services_component_id_service_date": "CREATE INDEX services_component_id_service_date ON services (component_id, service_date)"}
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    existing_indexes = {row[0] for row in cursor.fetchall()}
+
+    indexes_created = 0
+    for index_name, create_sql in indexes.items():
+        if index_name not in existing_indexes:
+            cursor.execute(create_sql)
+            indexes_created += 1
+
+    conn.commit()
+
+    if indexes_created == 0:
+        print("      → All indexes already present, skipping")
+        return False
+
+    print(f"      → Created {indexes_created} index(es)")
+    return True
+
+def create_component_link_tables(cursor, conn):
+    """Create link tables between collections, incidents, workplans and components, and fill them from the JSON lists of component ids"""
+    link_tables = {"collection_components": ("collection_id", "collections", "components", "collectioncomponents_component_id"),
+                   "incident_components": ("incident_id", "incidents", "incident_affected_component_ids", "incidentcomponents_component_id"),
+                   "workplan_components": ("workplan_id", "workplans", "workplan_affected_component_ids", "workplancomponents_component_id")}
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    existing_tables = {row[0] for row in cursor.fetchall()}
+
+    tables_created = 0
+    for table_name, (owner_column, source_table, source_column, index_name) in link_tables.items():
+        if table_name in existing_tables:
+            continue
+
+        cursor.execute(f"""
+            CREATE TABLE {table_name} (
+                {owner_column} VARCHAR(255) NOT NULL,
+                component_id VARCHAR(255) NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY ({owner_column}, component_id)
+            )
+        """)
+        cursor.execute(f"CREATE INDEX {index_name} ON {table_name} (component_id)")
+
+        link_count = 0
+        if source_table in existing_tables:
+            cursor.execute(f"SELECT {owner_column}, {source_column} FROM {source_table}")
+            for owner_id, component_ids_raw in cursor.fetchall():
+                try:
+                    component_ids = json.loads(component_ids_raw) if component_ids_raw else []
+                except ValueError:
+                    print(f"      → Skipping {source_table} record {owner_id}: component list is not valid JSON")
+                    continue
+
+                if not isinstance(component_ids, list):
+                    continue
+
+                for position, component_id in enumerate(dict.fromkeys(component_ids)):
+                    cursor.execute(f"INSERT INTO {table_name} ({owner_column}, component_id, position) VALUES (?, ?, ?)",
+                                   (owner_id, component_id, position))
+                    link_count += 1
+
+        print(f"      → Created {table_name} table with {link_count} link(s)")
+        tables_created += 1
+
+    conn.commit()
+
+    if tables_created == 0:
+        print("      → Link tables already present, skipping")
+        return False
+
+    return True
+
 def migrate_database():
     """Main function to handle the database migration."""
     print("=== Velo Supervisor 2000 Database Migration Tool ===\n")
@@ -553,56 +633,56 @@ def migrate_database():
         print("="*70)
 
         # Create the 'incidents' table if it doesn't exist
-        print("\n[1/11] Checking incidents table...")
+        print("\n[1/13] Checking incidents table...")
         incidents_created = create_incidents_table(cursor)
         if incidents_created:
             migrations_performed.append("✓ Created incidents table")
 
         # Create the 'workplans' table if it doesn't exist
-        print("\n[2/11] Checking workplans table...")
+        print("\n[2/13] Checking workplans table...")
         workplans_created = create_workplans_table(cursor)
         if workplans_created:
             migrations_performed.append("✓ Created workplans table")
 
         # Create the 'collections' table if it doesn't exist
-        print("\n[3/11] Checking collections table...")
+        print("\n[3/13] Checking collections table...")
         collections_created = create_collections_table(cursor)
         if collections_created:
             migrations_performed.append("✓ Created collections table")
 
         # Migrate component_types table if needed
-        print("\n[4/11] Checking component_types table (mandatory/max_quantity fields)...")
+        print("\n[4/13] Checking component_types table (mandatory/max_quantity fields)...")
         component_types_updated = migrate_component_types(cursor, conn)
         if component_types_updated:
             migrations_performed.append("✓ Updated component_types table (mandatory/max_quantity)")
 
         # NEW: Migrate ComponentTypes with time-based fields
-        print("\n[5/11] Checking component_types table (time-based fields)...")
+        print("\n[5/13] Checking component_types table (time-based fields)...")
         component_types_time_updated = migrate_component_types_time_fields(cursor, conn)
         if component_types_time_updated:
             migrations_performed.append("✓ Added time-based fields to component_types")
 
         # NEW: Populate threshold_km for ComponentTypes
-        print("\n[6/11] Populating threshold_km for component types...")
+        print("\n[6/13] Populating threshold_km for component types...")
         component_types_thresholds_populated = populate_component_types_thresholds(cursor, conn)
         if component_types_thresholds_populated:
             migrations_performed.append("✓ Populated threshold_km for component_types")
 
         # NEW: Migrate Components with time-based fields
-        print("\n[7/11] Checking components table (time-based fields)...")
+        print("\n[7/13] Checking components table (time-based fields)...")
         components_time_updated = migrate_components_time_fields(cursor, conn)
         if components_time_updated:
             migrations_performed.append("✓ Added time-based fields to components")
 
         # NEW: Populate threshold_km for Components
-        print("\n[8/11] Populating threshold_km for components...")
+        print("\n[8/13] Populating threshold_km for components...")
         components_thresholds_populated = populate_components_thresholds(cursor, conn)
         if components_thresholds_populated:
             migrations_performed.append("✓ Populated threshold_km for components")
 
         # NEW: Recalculate component statuses with new threshold logic
         # Only needed if threshold and time-based fields were just added in steps 5 or 7
-        print("\n[9/11] Recalculating component statuses...")
+        print("\n[9/13] Recalculating component statuses...")
         if component_types_time_updated or components_time_updated:
             statuses_recalculated = recalculate_distance_based_statuses(cursor, conn)
             if statuses_recalculated:
@@ -613,17 +693,29 @@ def migrate_database():
             print("      → Skipping, time-based fields already present")
 
         # NEW: Add workplan_id to Services table
-        print("\n[10/11] Checking services table (workplan hub integration)...")
+        print("\n[10/13] Checking services table (workplan hub integration)...")
         services_workplan_link = migrate_services_workplan_link(cursor, conn)
         if services_workplan_link:
             migrations_performed.append("✓ Added workplan_id to services table")
 
         # NEW: Add workplan_id to Incidents table
-        print("\n[11/11] Checking incidents table (workplan hub integration)...")
+        print("\n[11/13] Checking incidents table (workplan hub integration)...")
         incidents_workplan_link = migrate_incidents_workplan_link(cursor, conn)
         if incidents_workplan_link:
             migrations_performed.append("✓ Added workplan_id to incidents table")
 
+        # NEW: Create indexes for frequent queries
+        print("\n[12/13] Checking indexes (rides, components, component_history, services)...")
+        indexes_created = create_indexes(cursor, conn)
+        if indexes_created:
+            migrations_performed.append("✓ Created indexes for frequent queries")
+
+        # NEW: Link tables replacing lookups in JSON lists of component ids
+        print("\n[13/13] Checking component link tables (collections, incidents, workplans)...")
+        link_tables_created = create_component_link_tables(cursor, conn)
+        if link_tables_created:
+            migrations_performed.append("✓ Created component link tables for collections, incidents and workplans")
+
         # Print summary
         print("\n" + "="*70)
         print("MIGRATION SUMMARY")
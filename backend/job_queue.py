@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Module to run long operations such as Strava syncs as background jobs, one at a time, with progress reporting"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from utils import generate_unique_id
+
+class Job:
+    """Class to hold state and progress of a queued operation. Progress may be updated from worker threads"""
+    def __init__(self, job_type, params, job_function):
+        self.job_id = generate_unique_id()
+        self.job_type = job_type
+        self.params = params
+        self.job_function = job_function
+        self.status = "queued"
+        self.stage = "Waiting for earlier jobs"
+        self.progress = {}
+        self.success = None
+        self.message = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.lock = threading.Lock()
+        self.done = asyncio.Event()
+
+    def update_progress(self, stage=None, **counters):
+        """Method to report the current stage and set progress counters"""
+        with self.lock:
+            if stage is not None:
+                self.stage = stage
+            self.progress.update(counters)
+
+    def is_active(self):
+        """Method to check whether the job is queued or running"""
+        return self.status in ("queued", "running")
+
+    async def wait(self):
+        """Method to wait for the job to finish and get its outcome"""
+        await self.done.wait()
+        return self.success, self.message
+
+    def to_dict(self):
+        """Method to describe the job for status endpoints"""
+        with self.lock:
+            return {"job_id": self.job_id,
+                    "job_type": self.job_type,
+                    "params": self.params,
+                    "status": self.status,
+                    "stage": self.stage,
+                    "progress": dict(self.progress),
+                    "success": self.success,
+                    "message": self.message,
+                    "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                    "started_at": self.started_at.strftime("%Y-%m-%d %H:%M:%S") if self.started_at else None,
+                    "finished_at": self.finished_at.strftime("%Y-%m-%d %H:%M:%S") if self.finished_at else None}
+
+
+class JobQueue:
+    """Class to queue jobs and run them one at a time on the event loop, so syncs never overlap on the shared Strava client"""
+    def __init__(self, retained_jobs=50):
+        self.retained_jobs = retained_jobs
+        self.jobs = OrderedDict()
+        self.queue = None
+        self.consumer = None
+
+    def submit(self, job_type, params, job_function, covered_by=None):
+        """Method to queue a job, unless an active job matching covered_by already does the work. Returns the job and whether it was created.
+        Call from the event loop"""
+        if covered_by is not None:
+            for job in self.jobs.values():
+                if job.is_active() and covered_by(job):
+                    logging.info(f"Request for {job_type} {params} joined active job {job.job_id} ({job.job_type} {job.params})")
+                    return job, False
+
+        if self.consumer is None or self.consumer.done():
+            self.queue = asyncio.Queue()
+            self.consumer = asyncio.create_task(self.consume())
+
+        job = Job(job_type, params, job_function)
+        self.jobs[job.job_id] = job
+        self.queue.put_nowait(job)
+        self.prune_jobs()
+        logging.info(f"Queued job {job.job_id}: {job_type} {params}")
+
+        return job, True
+
+    async def consume(self):
+        """Method to run queued jobs in order"""
+        while True:
+            job = await self.queue.get()
+            with job.lock:
+                job.status = "running"
+                job.started_at = datetime.now()
+            job.update_progress(stage="Started")
+
+            try:
+                job.success, job.message = await job.job_function(job)
+
+            except Exception as error:
+                logging.exception(f"Job {job.job_id} ({job.job_type}) failed")
+                job.success, job.message = False, f"Job failed with an unexpected error: {str(error)}"
+
+            with job.lock:
+                job.status = "succeeded" if job.success else "failed"
+                job.finished_at = datetime.now()
+            job.update_progress(stage="Done")
+            job.done.set()
+            self.queue.task_done()
+
+    def prune_jobs(self):
+        """Method to forget the oldest finished jobs beyond the retention limit"""
+        finished_job_ids = [job_id for job_id, job in self.jobs.items() if not job.is_active()]
+        for job_id in finished_job_ids[:max(0, len(self.jobs) - self.retained_jobs)]:
+            del self.jobs[job_id]
+
+    def get_job(self, job_id):
+        """Method to get a job by id, None if unknown or pruned"""
+        return self.jobs.get(job_id)
+
+    def get_jobs(self):
+        """Method to describe retained jobs, newest first"""
+        return [job.to_dict() for job in reversed(self.jobs.values())]
+
+    async def stop(self):
+        """Method to stop running jobs at shutdown"""
+        if self.consumer is not None and not self.consumer.done():
+            self.consumer.cancel()
+            try:
+                await self.consumer
+            except asyncio.CancelledError:
+                pass
+
+
+# Initialize job queue
+job_queue = JobQueue()
@@ -13,6 +13,10 @@ from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from business_logic import BusinessLogic
+from worker_pool import worker_pool
+from job_queue import job_queue
+from backup import database_backup
+from response_cache import response_cache
 from utils import (read_config,
                    get_current_version,
                    write_config,
@@ -35,11 +39,16 @@ async def lifespan(app: FastAPI):
     for handler in logging.getLogger().handlers:
         handler.setLevel(log_level)
 
+    business_logic.prepare_database_schema()
+
     start_scheduler(app.state)
 
     yield
 
     stop_scheduler()
+    await job_queue.stop()
+    worker_pool.shutdown()
+    business_logic.checkpoint_database()
 
 # Create application object
 app = FastAPI(lifespan=lifespan)
@@ -72,7 +81,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 async def root(request: Request):
     """Endpoint for landing page"""
 
-    payload = business_logic.get_bike_overview()
+    payload = await worker_pool.run(business_logic.get_bike_overview)
     template_path = "index.html"
 
     return templates.TemplateResponse(template_path,
@@ -84,7 +93,8 @@ async def bike_details(request: Request,
                        bike_id: str):
     """Endpoint for bike details page"""
 
-    payload = business_logic.get_bike_details(bike_id)
+    payload = await worker_pool.run(business_logic.get_bike_details,
+                                    bike_id)
     template_path = "bike_details.html"
 
     return templates.TemplateResponse(template_path,
@@ -92,11 +102,27 @@ async def bike_details(request: Request,
                                        "payload": payload,
                                        "button_order": get_button_order(CONFIG, 'bike_details')})
 
+@app.get("/bike_statistics/{bike_id}", response_class=HTMLResponse)
+async def bike_statistics(request: Request,
+                          bike_id: str):
+    """Endpoint for bike usage statistics page"""
+
+    payload = await worker_pool.run(business_logic.get_bike_statistics,
+                                    bike_id)
+    if payload is None:
+        raise StarletteHTTPException(status_code=404, detail=f"Bike not found: {bike_id}")
+
+    template_path = "bike_statistics.html"
+
+    return templates.TemplateResponse(template_path,
+                                      {"request": request,
+                                       "payload": payload})
+
 @app.get("/component_overview", response_class=HTMLResponse)
 async def component_overview(request: Request):
     """Endpoint for components overview page"""
 
-    payload = business_logic.get_component_overview()
+    payload = await worker_pool.run(business_logic.get_component_overview)
     template_path = "component_overview.html"
 
     return templates.TemplateResponse(template_path,
@@ -107,7 +133,7 @@ async def component_overview(request: Request):
 async def incident_reports(request: Request):
     """Endpoint for incident reports page"""
 
-    payload = business_logic.get_incident_reports()
+    payload = await worker_pool.run(business_logic.get_incident_reports)
     template_path = "incident_reports.html"
 
     return templates.TemplateResponse(template_path,
@@ -118,7 +144,7 @@ async def incident_reports(request: Request):
 async def workplans(request: Request):
     """Endpoint for workplans page"""
 
-    payload = business_logic.get_workplans()
+    payload = await worker_pool.run(business_logic.get_workplans)
     template_path = "workplans.html"
 
     return templates.TemplateResponse(template_path,
@@ -130,7 +156,8 @@ async def workplan_details(request: Request,
                            workplan_id: str):
     """Endpoint for workplan details page"""
 
-    payload = business_logic.get_workplan_details(workplan_id)
+    payload = await worker_pool.run(business_logic.get_workplan_details,
+                                    workplan_id)
     template_path = "workplan_details.html"
 
     return templates.TemplateResponse(template_path,
@@ -142,7 +169,8 @@ async def component_details(request: Request,
                             component_id: str):
     """Endpoint for component details page"""
 
-    payload = business_logic.get_component_details(component_id)
+    payload = await worker_pool.run(business_logic.get_component_details,
+                                    component_id)
     template_path = "component_details.html"
 
     return templates.TemplateResponse(template_path,
@@ -155,7 +183,8 @@ async def collection_details(request: Request,
                              collection_id: str):
     """Endpoint for collection details page"""
 
-    payload = business_logic.get_collection_details(collection_id)
+    payload = await worker_pool.run(business_logic.get_collection_details,
+                                    collection_id)
     template_path = "collection_details.html"
 
     return templates.TemplateResponse(template_path,
@@ -166,7 +195,7 @@ async def collection_details(request: Request,
 async def component_types_overview(request: Request):
     """Endpoint for component types page"""
 
-    payload = business_logic.get_component_types()
+    payload = await worker_pool.run(business_logic.get_component_types)
     template_path = "component_types.html"
 
     return templates.TemplateResponse(template_path,
@@ -214,22 +243,22 @@ async def create_component(component_id: Optional[str] = Form(None),
                            component_notes: Optional[str] = Form(None)):
     """Endpoint to modify component types"""
 
-    success, message, component_id = (business_logic.create_component
-                                      (component_id,
-                                       component_installation_status,
-                                       component_updated_date,
-                                       component_name,
-                                       component_type,
-                                       component_bike_id,
-                                       expected_lifetime,
-                                       service_interval,
-                                       threshold_km,
-                                       lifetime_expected_days,
-                                       service_interval_days,
-                                       threshold_days,
-                                       cost,
-                                       offset,
-                                       component_notes))
+    success, message, component_id = await worker_pool.run_write(business_logic.create_component,
+                                                                 component_id,
+                                                                 component_installation_status,
+                                                                 component_updated_date,
+                                                                 component_name,
+                                                                 component_type,
+                                                                 component_bike_id,
+                                                                 expected_lifetime,
+                                                                 service_interval,
+                                                                 threshold_km,
+                                                                 lifetime_expected_days,
+                                                                 service_interval_days,
+                                                                 threshold_days,
+                                                                 cost,
+                                                                 offset,
+                                                                 component_notes)
 
     response = RedirectResponse(
         url=f"/component_details/{component_id}?success={success}&message={message}",
@@ -255,22 +284,22 @@ async def component_modify(component_id: Optional[str] = Form(None),
                            component_notes: Optional[str] = Form(None)):
     """Endpoint to modify component types"""
 
-    success, message, component_id = (business_logic.modify_component_details
-                                      (component_id,
-                                       component_installation_status,
-                                       component_updated_date,
-                                       component_name,
-                                       component_type,
-                                       component_bike_id,
-                                       expected_lifetime,
-                                       service_interval,
-                                       threshold_km,
-                                       lifetime_expected_days,
-                                       service_interval_days,
-                                       threshold_days,
-                                       cost,
-                                       offset,
-                                       component_notes))
+    success, message, component_id = await worker_pool.run_write(business_logic.modify_component_details,
+                                                                 component_id,
+                                                                 component_installation_status,
+                                                                 component_updated_date,
+                                                                 component_name,
+                                                                 component_type,
+                                                                 component_bike_id,
+                                                                 expected_lifetime,
+                                                                 service_interval,
+                                                                 threshold_km,
+                                                                 lifetime_expected_days,
+                                                                 service_interval_days,
+                                                                 threshold_days,
+                                                                 cost,
+                                                                 offset,
+                                                                 component_notes)
 
     response = RedirectResponse(
         url=f"/component_details/{component_id}?success={success}&message={message}",
@@ -287,10 +316,11 @@ async def add_history_record(request: Request,
                              redirect_to: Optional[str] = Form(None)):
     """Endpoint with conditional routing for redirects and AJAX to add an existing component history record."""
 
-    success, message = business_logic.create_history_record(component_id,
-                                                            component_installation_status,
-                                                            component_bike_id,
-                                                            component_updated_date)
+    success, message = await worker_pool.run_write(business_logic.create_history_record,
+                                                   component_id,
+                                                   component_installation_status,
+                                                   component_bike_id,
+                                                   component_updated_date)
 
     accept_header = request.headers.get("accept", "")
     is_ajax = "application/json" in accept_header or request.headers.get("x-requested-with") == "XMLHttpRequest"
@@ -322,7 +352,8 @@ async def update_history_record(component_id: str = Form(...),
                                 updated_date: str = Form(...)):
     """Endpoint to update an existing component history record"""
 
-    success, message = business_logic.update_history_record(history_id, updated_date)
+    success, message = await worker_pool.run_write(business_logic.update_history_record,
+                                                   history_id, updated_date)
 
     response = RedirectResponse(
         url=f"/component_details/{component_id}?success={success}&message={message}",
@@ -362,18 +393,20 @@ async def quick_swap(old_component_id: str = Form(...),
                               "offset": new_offset,
                               "notes": new_notes}
 
-        success, message = business_logic.quick_swap_orchestrator(old_component_id,
-                                                                  fate,
-                                                                  swap_date,
-                                                                  None,
-                                                                  new_component_data)
+        success, message = await worker_pool.run_write(business_logic.quick_swap_orchestrator,
+                                                       old_component_id,
+                                                       fate,
+                                                       swap_date,
+                                                       None,
+                                                       new_component_data)
 
     else:
-        success, message = business_logic.quick_swap_orchestrator(old_component_id,
-                                                                  fate,
-                                                                  swap_date,
-                                                                  new_component_id,
-                                                                  None)
+        success, message = await worker_pool.run_write(business_logic.quick_swap_orchestrator,
+                                                       old_component_id,
+                                                       fate,
+                                                       swap_date,
+                                                       new_component_id,
+                                                       None)
 
     return JSONResponse({"success": success, "message": message})
 
@@ -383,9 +416,10 @@ async def add_collection(collection_name: str = Form(...),
                          comment: Optional[str] = Form(None)):
     """Endpoint to add new collection"""
 
-    success, message, collection_id = business_logic.create_collection(collection_name,
-                                                                        components,
-                                                                        comment)
+    success, message, collection_id = await worker_pool.run_write(business_logic.create_collection,
+                                                                  collection_name,
+                                                                  components,
+                                                                  comment)
 
     if success and collection_id:
         response = RedirectResponse(
@@ -407,10 +441,11 @@ async def update_collection(collection_id: str = Form(...),
                             redirect_to: Optional[str] = Form(None)):
     """Endpoint to update existing collection"""
 
-    success, message = business_logic.update_collection(collection_id,
-                                                        collection_name,
-                                                        components,
-                                                        comment)
+    success, message = await worker_pool.run_write(business_logic.update_collection,
+                                                   collection_id,
+                                                   collection_name,
+                                                   components,
+                                                   comment)
 
     if redirect_to == "collection_details":
         redirect_url = f"/collection_details/{collection_id}?success={success}&message={message}"
@@ -429,10 +464,11 @@ async def change_collection_status(collection_id: str = Form(...),
                                    bike_id: Optional[str] = Form(None)):
     """Endpoint to change the status of all components in a collection"""
 
-    success, message = business_logic.change_collection_status(collection_id,
-                                                               new_status,
-                                                               updated_date,
-                                                               bike_id)
+    success, message = await worker_pool.run_write(business_logic.change_collection_status,
+                                                   collection_id,
+                                                   new_status,
+                                                   updated_date,
+                                                   bike_id)
 
     return JSONResponse({"success": success, "message": message})
 
@@ -443,10 +479,11 @@ async def add_service(component_id: str = Form(...),
                       workplan_id: Optional[str] = Form(None)):
     """Endpoint to add service"""
 
-    success, message = business_logic.create_service_record(component_id,
-                                                            service_date,
-                                                            service_description,
-                                                            workplan_id)
+    success, message = await worker_pool.run_write(business_logic.create_service_record,
+                                                   component_id,
+                                                   service_date,
+                                                   service_description,
+                                                   workplan_id)
 
     redirect_url = f"/component_details/{component_id}"
 
@@ -463,10 +500,11 @@ async def bulk_add_service_records(workplan_id: str = Form(...),
                                    service_description: str = Form(...)):
     """Endpoint to bulk add service records for workplan components"""
 
-    success, message = business_logic.bulk_create_service_records(workplan_id=workplan_id,
-                                                                  component_ids=component_ids,
-                                                                  service_date=service_date,
-                                                                  service_description=service_description)
+    success, message = await worker_pool.run_write(business_logic.bulk_create_service_records,
+                                                   workplan_id=workplan_id,
+                                                   component_ids=component_ids,
+                                                   service_date=service_date,
+                                                   service_description=service_description)
 
     return JSONResponse({"success": success, "message": message})
 
@@ -479,11 +517,12 @@ async def update_service_record(component_id: str = Form(...),
                                 redirect_url: Optional[str] = Form(None)):
     """Endpoint to update an existing service record"""
 
-    success, message = business_logic.update_service_record(component_id,
-                                                            service_id,
-                                                            service_date,
-                                                            service_description,
-                                                            workplan_id)
+    success, message = await worker_pool.run_write(business_logic.update_service_record,
+                                                   component_id,
+                                                   service_id,
+                                                   service_date,
+                                                   service_description,
+                                                   workplan_id)
 
     if not redirect_url or not redirect_url.strip():
         redirect_url = f"/component_details/{component_id}"
@@ -506,15 +545,16 @@ async def add_incident_record(incident_date: str = Form(...),
                               workplan_id: Optional[str] = Form(None)):
     """Endpoint to create an incident record"""
 
-    success, message = business_logic.create_incident_record(incident_date,
-                                                             incident_status,
-                                                             incident_severity,
-                                                             incident_affected_component_ids,
-                                                             incident_affected_bike_id,
-                                                             incident_description,
-                                                             resolution_date,
-                                                             resolution_notes,
-                                                             workplan_id)
+    success, message = await worker_pool.run_write(business_logic.create_incident_record,
+                                                   incident_date,
+                                                   incident_status,
+                                                   incident_severity,
+                                                   incident_affected_component_ids,
+                                                   incident_affected_bike_id,
+                                                   incident_description,
+                                                   resolution_date,
+                                                   resolution_notes,
+                                                   workplan_id)
 
     if workplan_id and workplan_id.strip():
         redirect_url = f"/workplan_details/{workplan_id}"
@@ -542,17 +582,18 @@ async def update_incident_record(incident_id: str = Form(...),
                                  redirect_url: Optional[str] = Form(None)):
     """Endpoint to update an incident record (supports full or partial updates)"""
 
-    success, message = business_logic.update_incident_record(incident_id,
-                                                             incident_date,
-                                                             incident_status,
-                                                             incident_severity,
-                                                             incident_affected_component_ids,
-                                                             incident_affected_bike_id,
-                                                             incident_description,
-                                                             resolution_date,
-                                                             resolution_notes,
-                                                             workplan_id,
-                                                             update_mode)
+    success, message = await worker_pool.run_write(business_logic.update_incident_record,
+                                                   incident_id,
+                                                   incident_date,
+                                                   incident_status,
+                                                   incident_severity,
+                                                   incident_affected_component_ids,
+                                                   incident_affected_bike_id,
+                                                   incident_description,
+                                                   resolution_date,
+                                                   resolution_notes,
+                                                   workplan_id,
+                                                   update_mode)
 
     if not redirect_url or not redirect_url.strip():
         redirect_url = "/incident_reports"
@@ -575,15 +616,16 @@ async def add_workplan(due_date: str = Form(...),
                        source_incident_id: Optional[str] = Form(None)):
     """Endpoint to create a workplan (optionally linked to an incident)"""
 
-    success, message, workplan_id = business_logic.create_workplan(due_date,
-                                                                    workplan_status,
-                                                                    workplan_size,
-                                                                    workplan_affected_component_ids,
-                                                                    workplan_affected_bike_id,
-                                                                    workplan_description,
-                                                                    completion_date,
-                                                                    completion_notes,
-                                                                    source_incident_id)
+    success, message, workplan_id = await worker_pool.run_write(business_logic.create_workplan,
+                                                                due_date,
+                                                                workplan_status,
+                                                                workplan_size,
+                                                                workplan_affected_component_ids,
+                                                                workplan_affected_bike_id,
+                                                                workplan_description,
+                                                                completion_date,
+                                                                completion_notes,
+                                                                source_incident_id)
 
     response = RedirectResponse(
         url=f"/workplan_details/{workplan_id}?success={success}&message={message}",
@@ -605,17 +647,18 @@ async def update_workplan(workplan_id: str = Form(...),
                           update_mode: Optional[str] = Form(None)):
     """Endpoint to update a workplan (supports full or partial updates)"""
 
-    success, message = business_logic.update_workplan(workplan_id,
-                                                      due_date,
-                                                      workplan_status,
-                                                      workplan_size,
-                                                      workplan_affected_component_ids,
-                                                      workplan_affected_bike_id,
-                                                      workplan_description,
-                                                      completion_date,
-                                                      completion_notes,
-                                                      close_linked_incidents,
-                                                      update_mode)
+    success, message = await worker_pool.run_write(business_logic.update_workplan,
+                                                   workplan_id,
+                                                   due_date,
+                                                   workplan_status,
+                                                   workplan_size,
+                                                   workplan_affected_component_ids,
+                                                   workplan_affected_bike_id,
+                                                   workplan_description,
+                                                   completion_date,
+                                                   completion_notes,
+                                                   close_linked_incidents,
+                                                   update_mode)
 
     response = RedirectResponse(
         url=f"/workplan_details/{workplan_id}?success={success}&message={message}",
@@ -625,12 +668,14 @@ async def update_workplan(workplan_id: str = Form(...),
 
 @app.get("/refresh_all_bikes", response_class=HTMLResponse)
 async def refresh_all_bikes():
-    """Endpoint to manually refresh data for all bikes"""
+    """Endpoint to queue a refresh of data for all bikes. Progress is reported by /jobs/{job_id}"""
 
-    success, message = await business_logic.refresh_all_bikes()
+    job, created = business_logic.submit_refresh_all_bikes()
+    message = "Refresh of all bikes queued" if created else "Refresh of all bikes is already queued or running"
 
-    return JSONResponse({"success": success,
-                         "message": message})
+    return JSONResponse({"success": True,
+                         "message": message,
+                         "job_id": job.job_id})
 
 @app.post("/component_types_modify", response_class=HTMLResponse)
 async def component_types_modify(component_type: str = Form(...),
@@ -645,16 +690,17 @@ async def component_types_modify(component_type: str = Form(...),
                                  mode: str = Form("create")):
     """Endpoint to modify component types"""
 
-    success, message = business_logic.modify_component_type(component_type,
-                                                            expected_lifetime,
-                                                            lifetime_expected_days,
-                                                            service_interval,
-                                                            service_interval_days,
-                                                            threshold_km,
-                                                            threshold_days,
-                                                            mandatory,
-                                                            max_quantity,
-                                                            mode)
+    success, message = await worker_pool.run_write(business_logic.modify_component_type,
+                                                   component_type,
+                                                   expected_lifetime,
+                                                   lifetime_expected_days,
+                                                   service_interval,
+                                                   service_interval_days,
+                                                   threshold_km,
+                                                   threshold_days,
+                                                   mandatory,
+                                                   max_quantity,
+                                                   mode)
 
     response = RedirectResponse(
         url=f"/component_types_overview?success={success}&message={message}",
@@ -664,12 +710,19 @@ async def component_types_modify(component_type: str = Form(...),
 
 @app.get("/refresh_rides/{mode}", response_class=HTMLResponse)
 async def refresh_rides(mode: str):
-    """Endpoint to refresh data for a subset or all rides"""
+    """Endpoint to queue a refresh of data for a subset or all rides. Progress is reported by /jobs/{job_id}"""
 
-    success, message = await business_logic.update_rides_bulk(mode)
+    if mode not in ("incremental", "recent", "all"):
+        return JSONResponse({"success": False,
+                             "message": f"Invalid refresh mode: {mode}"},
+                            status_code=400)
 
-    return JSONResponse({"success": success,
-                         "message": message})
+    job, created = business_logic.submit_strava_sync(mode)
+    message = f"Strava sync ({mode}) queued" if created else f"Joined Strava sync ({job.params['mode']}) already queued or running"
+
+    return JSONResponse({"success": True,
+                         "message": message,
+                         "job_id": job.job_id})
 
 @app.post("/delete_record", response_class=HTMLResponse)
 async def delete_record(record_id: str = Form(...),
@@ -677,7 +730,8 @@ async def delete_record(record_id: str = Form(...),
                         source_page: str = Form(None)):
     """Endpoint to delete records"""
 
-    success, message, component_id, bike_id, collection_id = business_logic.delete_record(table_selector, record_id)
+    success, message, component_id, bike_id, collection_id = await worker_pool.run_write(business_logic.delete_record,
+                                                                                         table_selector, record_id)
 
     redirect_url = "/"
 
@@ -758,6 +812,143 @@ async def update_config(form_type: str = Form(...),
 
     return response
 
+@app.get("/jobs")
+async def jobs():
+    """Endpoint to list queued, running and recently finished background jobs"""
+
+    return JSONResponse(job_queue.get_jobs())
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Endpoint to get status, stage and progress counters of a background job"""
+
+    job = job_queue.get_job(job_id)
+    if job is None:
+        return JSONResponse({"success": False,
+                             "message": f"Job not found: {job_id}"},
+                            status_code=404)
+
+    return JSONResponse(job.to_dict())
+
+@app.get("/worker_pool_metrics")
+async def worker_pool_metrics():
+    """Endpoint to get queue depth and latency metrics for the worker pool"""
+
+    return JSONResponse(worker_pool.get_metrics())
+
+@app.get("/bike_usage_statistics/{bike_id}")
+async def bike_usage_statistics(bike_id: str):
+    """Endpoint to get ride totals per year, recent months and recent weeks for a bike"""
+
+    usage_statistics = await worker_pool.run(business_logic.get_bike_usage_statistics,
+                                             bike_id)
+    if usage_statistics is None:
+        return JSONResponse({"success": False,
+                             "message": f"Bike not found: {bike_id}"},
+                            status_code=404)
+
+    return JSONResponse(usage_statistics)
+
+@app.get("/api/components")
+async def api_components(status: Optional[str] = None,
+                         component_type: Optional[str] = None,
+                         bike_id: Optional[str] = None,
+                         search: Optional[str] = None,
+                         sort_by: str = "name",
+                         order: str = "asc",
+                         cursor: Optional[str] = None,
+                         limit: int = 50):
+    """Endpoint to get one page of components, filtered by installation status, type, bike or a search term"""
+
+    success, result = await worker_pool.run(business_logic.get_components_page,
+                                            status,
+                                            component_type,
+                                            bike_id,
+                                            search,
+                                            sort_by,
+                                            order,
+                                            cursor,
+                                            limit)
+    if not success:
+        return JSONResponse({"success": False,
+                             "message": result},
+                            status_code=400)
+
+    return JSONResponse(result)
+
+@app.get("/api/rides")
+async def api_rides(bike_id: Optional[str] = None,
+                    commute: Optional[bool] = None,
+                    start_date: Optional[str] = None,
+                    stop_date: Optional[str] = None,
+                    sort_by: str = "record_time",
+                    order: str = "desc",
+                    cursor: Optional[str] = None,
+                    limit: int = 50):
+    """Endpoint to get one page of rides, filtered by bike, commute or record time"""
+
+    success, result = await worker_pool.run(business_logic.get_rides_page,
+                                            bike_id,
+                                            commute,
+                                            start_date,
+                                            stop_date,
+                                            sort_by,
+                                            order,
+                                            cursor,
+                                            limit)
+    if not success:
+        return JSONResponse({"success": False,
+                             "message": result},
+                            status_code=400)
+
+    return JSONResponse(result)
+
+@app.get("/api/component_history")
+async def api_component_history(component_id: Optional[str] = None,
+                                bike_id: Optional[str] = None,
+                                update_reason: Optional[str] = None,
+                                sort_by: str = "updated_date",
+                                order: str = "desc",
+                                cursor: Optional[str] = None,
+                                limit: int = 50):
+    """Endpoint to get one page of installation log records, filtered by component, bike or reason"""
+
+    success, result = await worker_pool.run(business_logic.get_history_page,
+                                            component_id,
+                                            bike_id,
+                                            update_reason,
+                                            sort_by,
+                                            order,
+                                            cursor,
+                                            limit)
+    if not success:
+        return JSONResponse({"success": False,
+                             "message": result},
+                            status_code=400)
+
+    return JSONResponse(result)
+
+@app.get("/response_cache_statistics")
+async def response_cache_statistics():
+    """Endpoint to get size, hits, misses and 304 answers of the response cache"""
+
+    return JSONResponse(response_cache.get_statistics())
+
+@app.get("/backup_status")
+async def backup_status():
+    """Endpoint to get time, size and duration of the latest database backup"""
+
+    return JSONResponse(database_backup.get_status())
+
+@app.post("/run_backup")
+async def run_backup():
+    """Endpoint to take an online backup of the database"""
+
+    success, message = await database_backup.run_backup()
+
+    return JSONResponse({"success": success,
+                         "message": message})
+
 @app.get("/get_filtered_log")
 async def get_filtered_log():
     """Endpoint to read log and return only business events""" 
@@ -5,8 +5,12 @@ import logging
 import traceback
 from datetime import datetime
 from fastapi import HTTPException, Request
+from fastapi.responses import Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from business_logic import database_manager
+from response_cache import response_cache, CachedResponse
+from utils import get_formatted_datetime_now, get_config_version
 
 class Middleware(BaseHTTPMiddleware):
     """Class to handle exceptions that breaks the program and should be shown to the user"""
@@ -17,12 +21,63 @@ class Middleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         """Method to dispatch intercepted requests"""
         try:
-            response = await call_next(request)
+            if response_cache.is_cacheable(request.method, request.url.path):
+                return await self.dispatch_cached(request, call_next)
+
+            with database_manager.request_scope() as identity_map:
+                response = await call_next(request)
+
+            logging.debug(f"Request {request.method} {request.url.path} served {identity_map.hits} bike and component lookups from memory and issued {identity_map.misses} queries")
             return response
         
         except Exception as error:
             logging.exception("An error occurred")
             return await self.handle_exception(error, request)
+
+    def get_data_version(self, request: Request):
+        """Method to get what rendered pages depend on besides the request: database writes, configuration, the current minute and the latest Strava pull"""
+        return (database_manager.write_generation,
+                get_config_version(),
+                get_formatted_datetime_now(),
+                str(request.app.state.strava_last_pull))
+
+    async def dispatch_cached(self, request: Request, call_next):
+        """Method to answer a GET request from the response cache, with 304 if the client's copy is current"""
+        cache_key = (request.url.path, request.url.query)
+        data_version = self.get_data_version(request)
+        if_none_match = request.headers.get("if-none-match")
+
+        cached_response = response_cache.get(cache_key, data_version)
+
+        if cached_response is None:
+            with database_manager.request_scope() as identity_map:
+                response = await call_next(request)
+
+            logging.debug(f"Request {request.method} {request.url.path} served {identity_map.hits} bike and component lookups from memory and issued {identity_map.misses} queries")
+
+            if response.status_code != 200:
+                return response
+
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            headers = {name: value for name, value in response.headers.items() if name.lower() not in ("content-length", "etag", "last-modified")}
+            cached_response = CachedResponse(body, response.status_code, response.media_type, headers)
+
+            if self.get_data_version(request) == data_version:
+                response_cache.store(cache_key, data_version, cached_response)
+            else:
+                response_cache.count("discarded")
+
+        validators = {"ETag": cached_response.etag,
+                      "Cache-Control": "no-cache"}
+
+        if cached_response.matches(if_none_match):
+            response_cache.count("not_modified")
+            return Response(status_code=304, headers=validators)
+
+        return Response(content=cached_response.body,
+                        status_code=cached_response.status_code,
+                        headers={**cached_response.headers, **validators},
+                        media_type=cached_response.media_type)
           
     async def handle_exception(self, exc: Exception, request: Request):
         """Method to catch and handle exceptions"""
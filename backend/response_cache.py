@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Module to cache rendered responses and answer conditional requests until the database changes"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from utils import read_config
+
+# Load configuration
+CONFIG = read_config()
+
+CACHEABLE_PATH_PREFIXES = ("/bike_details/",
+                           "/component_overview",
+                           "/incident_reports",
+                           "/workplans",
+                           "/workplan_details/",
+                           "/component_details/",
+                           "/collection_details/",
+                           "/component_types_overview",
+                           "/bike_statistics/",
+                           "/bike_usage_statistics/",
+                           "/api/")
+
+class CachedResponse:
+    """Class to hold a rendered response body with its validators"""
+    def __init__(self, body, status_code, media_type, headers):
+        self.body = body
+        self.status_code = status_code
+        self.media_type = media_type
+        self.headers = headers
+        self.etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+    def matches(self, if_none_match):
+        """Method to check whether the client's copy is current by its ETag. Modification dates are not used, since they
+        only have a resolution of one second and would confirm a copy rendered just before a write in the same second"""
+        if not if_none_match:
+            return False
+
+        return any(tag.strip() in (self.etag, f"W/{self.etag}", "*") for tag in if_none_match.split(","))
+
+
+class ResponseCache:
+    """Class to keep rendered GET responses per path and query string for the current data version.
+    The data version combines the database write generation with anything else pages render, so a change drops all entries"""
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.version = None
+        self.lock = threading.Lock()
+        self.statistics = {"hits": 0,
+                           "misses": 0,
+                           "not_modified": 0,
+                           "stored": 0,
+                           "discarded": 0,
+                           "invalidations": 0,
+                           "evictions": 0}
+
+    def is_cacheable(self, method, path):
+        """Method to check whether a request may be answered from the cache"""
+        return method == "GET" and (path == "/" or path.startswith(CACHEABLE_PATH_PREFIXES))
+
+    def count(self, statistic):
+        """Method to count a cache event"""
+        with self.lock:
+            self.statistics[statistic] += 1
+
+    def get(self, key, version):
+        """Method to get the cached response for a key, dropping all entries first if the data version has changed"""
+        with self.lock:
+            if version != self.version:
+                if self.entries:
+                    self.statistics["invalidations"] += 1
+                self.entries.clear()
+                self.version = version
+
+            cached_response = self.entries.get(key)
+            if cached_response is None:
+                self.statistics["misses"] += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.statistics["hits"] += 1
+            return cached_response
+
+    def store(self, key, version, cached_response):
+        """Method to store a rendered response, unless the data version changed while it was rendered"""
+        with self.lock:
+            if version != self.version:
+                self.statistics["discarded"] += 1
+                return False
+
+            self.entries[key] = cached_response
+            self.entries.move_to_end(key)
+            self.statistics["stored"] += 1
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.statistics["evictions"] += 1
+
+            return True
+
+    def get_statistics(self):
+        """Method to report cache size and hit counts"""
+        with self.lock:
+            lookups = self.statistics["hits"] + self.statistics["misses"]
+            return {"entries": len(self.entries),
+                    "max_entries": self.max_entries,
+                    "hit_ratio": round(self.statistics["hits"] / lookups, 3) if lookups else None,
+                    **self.statistics}
+
+
+# Initialize response cache
+response_cache = ResponseCache(CONFIG.get('response_cache_size', 256))
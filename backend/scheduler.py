@@ -6,6 +6,12 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from business_logic import BusinessLogic
+from worker_pool import worker_pool
+from backup import database_backup
+from utils import read_config
+
+# Load configuration
+CONFIG = read_config()
 
 SCHEDULER = None
 APP_STATE = None
@@ -35,6 +41,13 @@ def start_scheduler(app_state=None):
                           replace_existing=True,
                           misfire_grace_time=3600)
 
+        SCHEDULER.add_job(database_backup_job,
+                          trigger=CronTrigger(hour=CONFIG.get('backup_hour', 2), minute=0),
+                          id='database_backup',
+                          name='Back up database',
+                          replace_existing=True,
+                          misfire_grace_time=3600)
+
         SCHEDULER.start()
         logging.info("APScheduler started successfully. Jobs registered:")
         logging.info(" * update_time_based_fields: Daily at 3:00 AM")
@@ -43,6 +56,10 @@ def start_scheduler(app_state=None):
         if strava_job:
             logging.info(f" * strava_sync: Every 4 hours (next run: {strava_job.next_run_time})")
 
+        backup_job = SCHEDULER.get_job('database_backup')
+        if backup_job:
+            logging.info(f" * database_backup: Daily (next run: {backup_job.next_run_time})")
+
     except Exception as exception:
         logging.error(f"Failed to start scheduler: {exception}")
         raise
@@ -70,7 +87,7 @@ async def update_time_based_fields_job():
 
         business_logic = BusinessLogic(app_state=None)
 
-        success, message = business_logic.update_time_based_fields()
+        success, message = await worker_pool.run_write(business_logic.update_time_based_fields)
 
         if success:
             logging.info(f"Scheduled job completed successfully: {message}")
@@ -84,11 +101,15 @@ async def update_time_based_fields_job():
 async def strava_sync_job():
     """Scheduled job to sync Strava activities"""
     try:
-        logging.info("Starting scheduled job: update_rides_bulk with parameter 'recent'")
+        logging.info("Starting scheduled job: update_rides_bulk with parameter 'incremental'")
 
         business_logic = BusinessLogic(app_state=APP_STATE)
 
-        success, message = await business_logic.update_rides_bulk("recent")
+        job, created = business_logic.submit_strava_sync("incremental")
+        if not created:
+            logging.info(f"Strava sync already queued or running as job {job.job_id}. Waiting for it instead of starting another")
+
+        success, message = await job.wait()
 
         if success:
             logging.info(f"Strava sync completed successfully: {message}")
@@ -98,3 +119,19 @@ async def strava_sync_job():
 
     except Exception as exception:
         logging.error(f"Critical error in scheduled job update_rides_bulk: {exception}")
+
+async def database_backup_job():
+    """Scheduled job to take an online backup of the database"""
+    try:
+        logging.info("Starting scheduled job: database_backup")
+
+        success, message = await database_backup.run_backup()
+
+        if success:
+            logging.info(f"Database backup completed successfully: {message}")
+
+        else:
+            logging.error(f"Database backup failed: {message}")
+
+    except Exception as exception:
+        logging.error(f"Critical error in scheduled job database_backup: {exception}")
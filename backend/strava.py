@@ -3,19 +3,24 @@
 
 import json
 import logging
+import asyncio
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth2Session
 
 class Strava:
     """Class to interact with Strava API"""
-    def __init__(self, oauth_file):
+    def __init__(self, oauth_file, max_concurrency=4):
         self.token = {}
         self.extra = {}
         self.json_response = ""
         self.payload_bikes = []
-        self.payload_rides = []
         self.bike_ids_recent_rides = set()
         self.oauth_file = oauth_file
+        self.max_concurrency = max_concurrency
+        self.max_retries = 3
+        self.client = None
+        self.semaphore = None
 
     def token_loader(self):
         """Method to read oauth options from file"""
@@ -38,104 +43,189 @@ class Strava:
         with open(self.oauth_file, 'w', encoding='utf-8') as file:
             file.write(json.dumps(secrets_output))
 
-    async def get_rides(self, mode):
-        """Method to authenticate and get data from Stravas activities API"""
-        page = 1
-        raw_response = ""
-        self.bike_ids_recent_rides.clear()
-        self.payload_rides.clear()
+    async def get_client(self):
+        """Method to load tokens, refresh them if expired and return a pooled session shared by all requests"""
         self.token_loader()
         refresh_url = "https://www.strava.com/oauth/token"
 
+        if self.client is None:
+            self.client = OAuth2Session(self.extra["client_id"], token=self.token)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+            self.client.mount("https://", adapter)
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        else:
+            self.client.token = self.token
+
         if self.token["expires_at"] < datetime.now().timestamp():
             logging.warning(f'Access token expired at {datetime.fromtimestamp(self.token["expires_at"])}. Refreshing tokens.')
 
             try:
-                client = OAuth2Session(self.extra["client_id"], token=self.token)
-                self.token = client.refresh_token(refresh_url, refresh_token=self.token["refresh_token"], **self.extra)
+                self.token = await asyncio.to_thread(self.client.refresh_token,
+                                                     refresh_url,
+                                                     refresh_token=self.token["refresh_token"],
+                                                     **self.extra)
                 self.token_saver()
                 self.token_loader()
+                self.client.token = self.token
 
             except Exception as error:
                 logging.error(f'An error occured refreshing tokens: {error}.')
 
+        logging.info(f'Access token valid. Expires at {datetime.fromtimestamp(self.token["expires_at"])},in {datetime.fromtimestamp(self.token["expires_at"]) - datetime.now()}.')
+        return self.client
+
+    def get_rate_limit_delay(self, headers):
+        """Method to find how many seconds to wait based on Strava rate limit headers. Returns None if the daily limit is spent"""
+        limits = headers.get("X-ReadRateLimit-Limit") or headers.get("X-RateLimit-Limit")
+        usages = headers.get("X-ReadRateLimit-Usage") or headers.get("X-RateLimit-Usage")
+        if not limits or not usages:
+            return 0
+
+        short_limit, daily_limit = (int(value) for value in limits.split(","))
+        short_usage, daily_usage = (int(value) for value in usages.split(","))
+
+        if daily_usage >= daily_limit:
+            return None
+
+        if short_usage >= short_limit:
+            now = datetime.now()
+            return (15 - now.minute % 15) * 60 - now.second
+
+        return 0
+
+    async def request_json(self, client, url):
+        """Method to send a GET request in a worker thread with bounded concurrency, backing off when rate limited.
+        The concurrency slot is released while backing off, so a long wait does not block other requests"""
+        for attempt in range(1, self.max_retries + 1):
+            async with self.semaphore:
+                raw_response = await asyncio.to_thread(client.get, url, timeout=30)
+
+            delay = self.get_rate_limit_delay(raw_response.headers)
+
+            if delay is None:
+                raise RuntimeError("Daily Strava API rate limit reached. Try again tomorrow")
+
+            if raw_response.status_code == 429:
+                delay = delay or 60 * attempt
+                logging.warning(f'Rate limited by Strava on attempt {attempt}. Waiting {delay} seconds before retrying.')
+                await asyncio.sleep(delay)
+                continue
+
+            logging.debug(f'API status for {url}: {raw_response.status_code} - {raw_response.reason}.')
+            raw_response.raise_for_status()
+
+            if delay > 0:
+                logging.warning(f'Strava short term rate limit reached. Waiting {delay} seconds before next request.')
+                await asyncio.sleep(delay)
+
+            return raw_response.json()
+
+        raise RuntimeError(f"Strava kept rate limiting after {self.max_retries} attempts")
+
+    async def iter_activity_pages(self, client, base_url, max_pages=None):
+        """Method to yield activity pages in order until an empty page is returned. The first page is fetched alone, so short syncs stay cheap,
+        then pages are fetched concurrently in batches, so at most one batch of pages is held at a time"""
+        page = 1
+        batch_size = 1
+        while True:
+            pages = range(page, page + batch_size)
+            responses = await asyncio.gather(*(self.request_json(client, f"{base_url}page={page_number}&per_page=200")
+                                               for page_number in pages))
+
+            for page_number, json_response in zip(pages, responses):
+                if not json_response:
+                    logging.debug(f'Reached last page. The last page with data was page {page_number-1}.')
+                    return
+
+                logging.debug(f'Page {page_number} contained {len(json_response)} activities.')
+                yield page_number, json_response
+
+                if max_pages is not None and page_number >= max_pages:
+                    return
+
+            page += batch_size
+            batch_size = self.max_concurrency
+
+    async def iter_rides(self, mode, after_timestamp=None, progress=None):
+        """Method to authenticate and yield rides from Stravas activities API one page at a time, so each page can be stored as it arrives.
+        Progress, if given, receives pages and rides fetched. Errors are logged and raised, so the caller knows the rides are incomplete"""
+        self.bike_ids_recent_rides.clear()
+        rides_fetched = 0
+
         try:
-            logging.info(f'Access token valid. Expires at {datetime.fromtimestamp(self.token["expires_at"])},in {datetime.fromtimestamp(self.token["expires_at"]) - datetime.now()}.')
-            client = OAuth2Session(self.extra["client_id"], token=self.token)
+            client = await self.get_client()
 
             if mode == "all":
-                while True:
-                    protected_url = f"https://www.strava.com/api/v3/athlete/activities?page={page}&per_page=200"
-                    raw_response = client.get(protected_url)
-                    self.json_response = raw_response.json()
-
-                    if not self.json_response:
-                        logging.debug(f'Reached last page. The last page with data was page {page-1}.')
-                        break
-
-                    logging.debug(f'API status for page {page}: {raw_response.status_code} - {raw_response.reason}.')
-                    logging.debug(f'Page contained {len(self.json_response)} activities.')
-                    page = page+1
-                    self.prepare_payload_rides()
-
-            if mode == "recent":
-                protected_url = "https://www.strava.com/api/v3/athlete/activities?page=1&per_page=200"
-                raw_response = client.get(protected_url)
-                self.json_response = raw_response.json()
-                logging.debug(f'API status for page {page}: {raw_response.status_code} - {raw_response.reason}')
-                logging.debug(f'Page contained {len(self.json_response)} activities')
-                self.prepare_payload_rides()
-                
-                for activity in self.json_response:
-                    if str(activity["type"]) == "Ride" and activity["gear_id"] != None:
-                        self.bike_ids_recent_rides.add(activity["gear_id"])
-                logging.debug(f'Found {len(self.bike_ids_recent_rides)} bikes in recent rides.')
+                pages = self.iter_activity_pages(client, "https://www.strava.com/api/v3/athlete/activities?")
+
+            elif mode == "recent":
+                pages = self.iter_activity_pages(client, "https://www.strava.com/api/v3/athlete/activities?", max_pages=1)
+
+            elif mode == "incremental":
+                logging.info(f'Retrieving activities started after {datetime.fromtimestamp(after_timestamp)}.')
+                pages = self.iter_activity_pages(client, f"https://www.strava.com/api/v3/athlete/activities?after={after_timestamp}&")
+
+            else:
+                raise ValueError(f'Unknown mode for retrieving rides: {mode}')
+
+            try:
+                async for page_number, json_response in pages:
+                    self.json_response = json_response
+                    page_rides = self.prepare_payload_rides()
+                    self.collect_bike_ids_recent_rides()
+                    rides_fetched += len(page_rides)
+
+                    if progress:
+                        progress.update_progress(pages_fetched=page_number, rides_fetched=rides_fetched)
+
+                    yield page_rides
+
+            finally:
+                await pages.aclose()
+
+            logging.debug(f'Found {len(self.bike_ids_recent_rides)} bikes in {rides_fetched} rides.')
 
         except Exception as error:
             logging.error(f'An error occured during the API call to fetch rides: {error}.')
+            raise
 
     async def get_bikes(self, bike_ids):
         """Method to authenticate and get data from Stravas gear API"""
-        raw_response = ""
         self.payload_bikes.clear()
-        self.token_loader()
-        refresh_url = "https://www.strava.com/oauth/token"
-
-        if self.token["expires_at"] < datetime.now().timestamp():
-            logging.warning(f'Access token expired at {datetime.fromtimestamp(self.token["expires_at"])}. Refreshing tokens.')
-
-            try:
-                client = OAuth2Session(self.extra["client_id"], token=self.token)
-                self.token = client.refresh_token(refresh_url, refresh_token=self.token["refresh_token"], **self.extra)
-                self.token_saver()
-                self.token_loader()
-
-            except Exception as error:
-                logging.error(f'An error occured refreshing tokens: {error}.')
 
         try:
-            logging.info(f'Access token valid. Expires at {datetime.fromtimestamp(self.token["expires_at"])},in {datetime.fromtimestamp(self.token["expires_at"]) - datetime.now()}.')
-            client = OAuth2Session(self.extra["client_id"], token=self.token)
+            client = await self.get_client()
 
             logging.debug(f"Retrieving data for {len(bike_ids)} bikes")
-            for bike in bike_ids:
-                protected_url = f"https://www.strava.com/api/v3/gear/{bike}?page=1&per_page=50"
-                raw_response = client.get(protected_url)
-                self.json_response = raw_response.json()
+            bike_ids = list(bike_ids)
+            responses = await asyncio.gather(*(self.request_json(client, f"https://www.strava.com/api/v3/gear/{bike}?page=1&per_page=50")
+                                               for bike in bike_ids),
+                                             return_exceptions=True)
+
+            for bike, json_response in zip(bike_ids, responses):
+                if isinstance(json_response, Exception):
+                    logging.error(f'An error occured during the API call to fetch bike {bike}: {json_response}.')
+                    continue
 
+                self.json_response = json_response
                 if self.json_response:
-                    logging.debug(f'API status for request: {raw_response.status_code} - {raw_response.reason}.')
                     self.prepare_payload_bikes()
 
                 if not self.json_response:
                     logging.debug(f'API returned {len(self.json_response)} bikes.')
 
-
         except Exception as error:
             logging.error(f'An error occured during the API call to fetch bikes: {error}.')
 
+    def collect_bike_ids_recent_rides(self):
+        """Method to collect ids of bikes used in the activities of the latest response"""
+        for activity in self.json_response:
+            if str(activity["type"]) == "Ride" and activity["gear_id"] != None:
+                self.bike_ids_recent_rides.add(activity["gear_id"])
+
     def prepare_payload_rides(self):
-        """Method to prepare a list of rides"""
+        """Method to prepare a list of rides from the activities of the latest response"""
+        payload_rides = []
 
         for activities in self.json_response:
 
@@ -151,16 +241,18 @@ class Strava:
                     ride.update({"ride_distance": float(activities["distance"]/1000)})
                     ride.update({"commute": bool(activities["commute"])})
 
-                    self.payload_rides.append(ride)
+                    payload_rides.append(ride)
                     logging.debug(f'Ride data written to list: {ride}.')
 
                 except Exception as error:
-                    logging.error(f'An error ocurred preparing payload for rides: {self.payload_rides}')
+                    logging.error(f'An error ocurred preparing payload for ride: {activities.get("id")}')
                     logging.error(f'More info about the error: {error}.')
 
             else:
                 logging.warning("Activity is not of type Ride. Skipping.")
 
+        return payload_rides
+
     def prepare_payload_bikes(self):
         """Method to prepare a list of bikes"""
 
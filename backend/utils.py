@@ -2,12 +2,14 @@
 """Module for auxiliary functions"""
 
 import json
+import os
+import base64
 import asyncio
 import uuid
 import time
 import sys
 import re
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 def get_formatted_datetime_now():
     """Function to get current datetime formatted as YYYY-MM-DD HH:MM"""
@@ -27,6 +29,13 @@ def read_config():
         config = json.load(file)
     return config
 
+def get_config_version():
+    """Function to get a version of the configuration file that changes whenever the file is written"""
+    try:
+        return os.stat('config.json').st_mtime_ns
+    except OSError:
+        return None
+
 def get_button_order(config, page_name):
     """Function to get button order for a specific page with defaults"""
     defaults = {'bike_details': ['new-collection',
@@ -240,6 +249,32 @@ def get_workplan_data_tuple(workplan, database_manager):
                                     workplan.workplan_description),
             parse_checkbox_progress(workplan.workplan_description))
 
+class FrozenDict(dict):
+    """Class for a dictionary that raises on any change, so a value shared between requests cannot be altered by one of them"""
+    def refuse_change(self, *args, **kwargs):
+        """Method to refuse changes to the dictionary"""
+        raise TypeError("Shared navigation context is read only. Copy it before changing it")
+
+    __setitem__ = __delitem__ = __ior__ = refuse_change
+    clear = pop = popitem = setdefault = update = refuse_change
+
+def freeze(value):
+    """Function to copy nested lists, tuples and dictionaries into a form that cannot be changed. Lists become tuples,
+    named tuples keep their type and dictionaries become FrozenDict. Other values are returned as is"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return value._make(freeze(item) for item in value)
+
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+
+    if isinstance(value, set):
+        return frozenset(value)
+
+    return value
+
 def calculate_percentage_reached(total, remaining):
     """Function to calculate remaining service interval or remaining lifetime as percentage"""
     if isinstance(total, int) and isinstance(remaining, int):
@@ -286,6 +321,76 @@ def calculate_elapsed_days(start_date, end_date):
     except ValueError:
         return False, "Failed to calculate elapsed days"
 
+def clip_installation_intervals(installation_intervals, window_start, window_stop):
+    """Function to clip installation periods to a window, keeping periods still active after window start. None leaves that end of the window open"""
+    clipped_intervals = []
+    for bike_id, start_date, stop_date in installation_intervals:
+        if window_stop is not None and start_date > window_stop:
+            continue
+        if window_start is not None and stop_date is not None and stop_date <= window_start:
+            continue
+
+        if window_start is not None:
+            start_date = max(start_date, window_start)
+        if window_stop is not None:
+            stop_date = window_stop if stop_date is None else min(stop_date, window_stop)
+
+        clipped_intervals.append((bike_id, start_date, stop_date))
+
+    return clipped_intervals
+
+def parse_moving_time(moving_time):
+    """Function to convert moving time stored as text, e.g. '1:02:03' or '1 day, 2:03:04', to seconds"""
+    try:
+        days = 0
+        if "day" in moving_time:
+            day_part, moving_time = moving_time.split(",")
+            days = int(day_part.split()[0])
+
+        hours, minutes, seconds = (int(part) for part in moving_time.strip().split(":"))
+        return days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+def get_sync_cursor(record_time, overlap_hours):
+    """Function to get the epoch timestamp to fetch activities after, from the record time of the latest stored ride"""
+    latest_record_time = datetime.strptime(record_time, "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc)
+    return int((latest_record_time - timedelta(hours=overlap_hours)).timestamp())
+
+def encode_page_cursor(cursor):
+    """Function to encode a (sort value, key) keyset cursor as an opaque URL-safe string"""
+    if cursor is None:
+        return None
+
+    return base64.urlsafe_b64encode(json.dumps(list(cursor)).encode()).decode()
+
+def is_cursor_value(value, allow_none=False):
+    """Function to check that a cursor element is a plain string or number, or None where a sort value may be NULL"""
+    if value is None:
+        return allow_none
+
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+def decode_page_cursor(encoded_cursor):
+    """Function to decode a keyset cursor. Raises ValueError if the cursor is malformed"""
+    if not encoded_cursor:
+        return None
+
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(encoded_cursor.encode()).decode())
+    except (UnicodeError, ValueError) as error:
+        raise ValueError(f"Invalid page cursor: {encoded_cursor}") from error
+
+    if not isinstance(cursor, list) or len(cursor) != 2:
+        raise ValueError(f"Invalid page cursor: {encoded_cursor}")
+
+    sort_value, key_value = cursor
+    if not is_cursor_value(sort_value, allow_none=True) or not is_cursor_value(key_value):
+        raise ValueError(f"Invalid page cursor: {encoded_cursor}")
+
+    return tuple(cursor)
+
 def parse_json_string(raw_json_string):
     """Function to load a JSON string and return the parsed data as a python object"""
     if raw_json_string is None:
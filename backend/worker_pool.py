@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Module to run blocking business logic in worker threads, keeping the event loop free"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils import read_config
+
+# Load configuration
+CONFIG = read_config()
+
+class WorkerLane:
+    """Class to run blocking calls in a bounded thread pool and keep queue depth and latency metrics"""
+    def __init__(self, name, max_workers):
+        self.name = name
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-worker")
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait_time = 0.0
+        self.total_run_time = 0.0
+        self.max_wait_time = 0.0
+        self.max_run_time = 0.0
+
+    async def run(self, function, *args, **kwargs):
+        """Method to run a blocking call in the pool. The call runs in a copy of the caller's context, so request scoped state follows it"""
+        context = contextvars.copy_context()
+        enqueued_at = time.perf_counter()
+
+        with self.lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+
+        def call():
+            started_at = time.perf_counter()
+            wait_time = started_at - enqueued_at
+
+            with self.lock:
+                self.queued -= 1
+                self.running += 1
+                self.total_wait_time += wait_time
+                self.max_wait_time = max(self.max_wait_time, wait_time)
+
+            succeeded = False
+            try:
+                result = context.run(function, *args, **kwargs)
+                succeeded = True
+                return result
+
+            finally:
+                run_time = time.perf_counter() - started_at
+
+                with self.lock:
+                    self.running -= 1
+                    self.total_run_time += run_time
+                    self.max_run_time = max(self.max_run_time, run_time)
+                    if succeeded:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+
+                logging.debug(f"{self.name} lane ran {getattr(function, '__name__', function)} in {run_time * 1000:.1f} ms after waiting {wait_time * 1000:.1f} ms")
+
+        return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+
+    def get_metrics(self):
+        """Method to get a snapshot of queue depth and latency metrics"""
+        with self.lock:
+            finished = self.completed + self.failed
+
+            return {"max_workers": self.max_workers,
+                    "queue_depth": self.queued,
+                    "running": self.running,
+                    "max_queue_depth": self.max_queue_depth,
+                    "completed": self.completed,
+                    "failed": self.failed,
+                    "average_wait_ms": round(self.total_wait_time / finished * 1000, 1) if finished else 0,
+                    "max_wait_ms": round(self.max_wait_time * 1000, 1),
+                    "average_run_ms": round(self.total_run_time / finished * 1000, 1) if finished else 0,
+                    "max_run_ms": round(self.max_run_time * 1000, 1)}
+
+    def shutdown(self):
+        """Method to stop accepting calls and wait for running calls to finish"""
+        self.executor.shutdown(wait=True)
+
+
+class WorkerPool:
+    """Class to offload blocking calls. Reads run concurrently, while writes run one at a time so recomputations do not interleave.
+    Peewee keeps one SQLite connection per thread, so each worker uses its own connection"""
+    def __init__(self, read_workers):
+        self.read_lane = WorkerLane("read", read_workers)
+        self.write_lane = WorkerLane("write", 1)
+
+    async def run(self, function, *args, **kwargs):
+        """Method to run a blocking call that only reads from the database"""
+        return await self.read_lane.run(function, *args, **kwargs)
+
+    async def run_write(self, function, *args, **kwargs):
+        """Method to run a blocking call that writes to the database"""
+        return await self.write_lane.run(function, *args, **kwargs)
+
+    def get_metrics(self):
+        """Method to get metrics for both lanes"""
+        return {"read": self.read_lane.get_metrics(),
+                "write": self.write_lane.get_metrics()}
+
+    def shutdown(self):
+        """Method to shut down both lanes"""
+        logging.info("Shutting down worker pool...")
+        self.read_lane.shutdown()
+        self.write_lane.shutdown()
+
+
+# Initialize worker pool
+worker_pool = WorkerPool(CONFIG.get('worker_threads', 4))
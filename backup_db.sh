@@ -1,11 +1,11 @@
 #!/bin/bash
 # Script to backup database for Velo Supervisor 2000
+# Takes an online backup through the running application, so the container keeps serving,
+# then copies the newest backup to the backup folder
 
 set -o xtrace
+set -o errexit
 
-docker container stop velo-supervisor-2000
-sleep 5
-rm -vf /home/pi/dataspace/backup/prod_db.sqlite
-cp /home/pi/code/container_data/prod_db.sqlite /home/pi/dataspace/backup/prod_db.sqlite
-docker container start velo-supervisor-2000
-
+curl --fail --silent --show-error -X POST http://localhost:8000/run_backup | grep --quiet '"success":true'
+latest_backup=$(ls -t /home/pi/code/container_data/backups/prod_db_*.sqlite* | head -n 1)
+cp -v "$latest_backup" /home/pi/dataspace/backup/
@@ -821,10 +821,12 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 
 // Handle "Change Status" buttons (used on collection_details, bike_details, and component_overview pages)
+// Buttons in rows loaded later are bound when the componentRowsAdded event arrives
 document.addEventListener('DOMContentLoaded', function() {
-    const changeStatusButtons = document.querySelectorAll('.change-status-btn');
+    function bindChangeStatusButtons(container) {
+        const changeStatusButtons = container.querySelectorAll('.change-status-btn');
+        if (changeStatusButtons.length === 0) return;
 
-    if (changeStatusButtons.length > 0) {
         const modal = document.getElementById('editComponentStatusModal');
 
         if (!modal) {
@@ -900,104 +902,111 @@ document.addEventListener('DOMContentLoaded', function() {
             });
         });
     }
+
+    bindChangeStatusButtons(document);
+    document.addEventListener('componentRowsAdded', event => bindChangeStatusButtons(event.detail.container));
 });
 
 // Function to delete records
 document.addEventListener('DOMContentLoaded', function() {
-    // Add confirm modal to the page if it doesn't exist
-
-    document.querySelectorAll('.delete-record').forEach(button => {
-        button.addEventListener('click', (event) => {
-            event.preventDefault();
-            event.stopPropagation();
+    // Buttons in rows loaded later are bound when the componentRowsAdded event arrives
+    function bindDeleteButtons(container) {
+        container.querySelectorAll('.delete-record').forEach(button => {
+            button.addEventListener('click', (event) => {
+                event.preventDefault();
+                event.stopPropagation();
             
-            // Get record details
-            const recordId = button.dataset.componentType ||
-                           button.dataset.componentId ||
-                           button.dataset.serviceId ||
-                           button.dataset.historyId ||
-                           button.dataset.incidentId ||
-                           button.dataset.workplanId ||
-                           button.dataset.collectionId;
-
-            let tableSelector, recordType;
+                // Get record details
+                const recordId = button.dataset.componentType ||
+                               button.dataset.componentId ||
+                               button.dataset.serviceId ||
+                               button.dataset.historyId ||
+                               button.dataset.incidentId ||
+                               button.dataset.workplanId ||
+                               button.dataset.collectionId;
+
+                let tableSelector, recordType;
             
-            if (button.dataset.componentType) {
-                tableSelector = 'ComponentTypes';
-                recordType = 'component type';
-            } else if (button.dataset.componentId) {
-                tableSelector = 'Components';
-                recordType = 'component';
-            } else if (button.dataset.serviceId) {
-                tableSelector = 'Services';
-                recordType = 'service record';
-            } else if (button.dataset.historyId) {
-                tableSelector = 'ComponentHistory';
-                recordType = 'history record';
-            } else if (button.dataset.incidentId) {
-                tableSelector = 'Incidents';
-                recordType = 'incident report';
-            } else if (button.dataset.workplanId) {
-                tableSelector = 'Workplans';
-                recordType = 'workplan';
-            } else if (button.dataset.collectionId) {
-                tableSelector = 'Collections';
-                recordType = 'collection';
-            }
+                if (button.dataset.componentType) {
+                    tableSelector = 'ComponentTypes';
+                    recordType = 'component type';
+                } else if (button.dataset.componentId) {
+                    tableSelector = 'Components';
+                    recordType = 'component';
+                } else if (button.dataset.serviceId) {
+                    tableSelector = 'Services';
+                    recordType = 'service record';
+                } else if (button.dataset.historyId) {
+                    tableSelector = 'ComponentHistory';
+                    recordType = 'history record';
+                } else if (button.dataset.incidentId) {
+                    tableSelector = 'Incidents';
+                    recordType = 'incident report';
+                } else if (button.dataset.workplanId) {
+                    tableSelector = 'Workplans';
+                    recordType = 'workplan';
+                } else if (button.dataset.collectionId) {
+                    tableSelector = 'Collections';
+                    recordType = 'collection';
+                }
             
-            // Set up the modal
-            const modalBody = document.getElementById('confirmModalBody');
-            modalBody.innerHTML = `You are about to delete this ${recordType}. This cannot be undone. Do you want to proceed?`;
+                // Set up the modal
+                const modalBody = document.getElementById('confirmModalBody');
+                modalBody.innerHTML = `You are about to delete this ${recordType}. This cannot be undone. Do you want to proceed?`;
             
-            // Show the modal
-            confirmModal.show();
+                // Show the modal
+                confirmModal.show();
             
-            // Handle confirm action
-            document.getElementById('confirmAction').addEventListener('click', function handleConfirm() {
-                // Remove the event listener after use
-                this.removeEventListener('click', handleConfirm);
-
-                // Detect source page from URL
-                const path = window.location.pathname;
-                let sourcePage = 'unknown';
-                if (path.includes('/component_overview')) {
-                    sourcePage = 'component_overview';
-                } else if (path.includes('/bike_details')) {
-                    sourcePage = 'bike_details';
-                } else if (path.includes('/component_details')) {
-                    sourcePage = 'component_details';
-                } else if (path.includes('/collection_details')) {
-                    sourcePage = 'collection_details';
-                }
+                // Handle confirm action
+                document.getElementById('confirmAction').addEventListener('click', function handleConfirm() {
+                    // Remove the event listener after use
+                    this.removeEventListener('click', handleConfirm);
+
+                    // Detect source page from URL
+                    const path = window.location.pathname;
+                    let sourcePage = 'unknown';
+                    if (path.includes('/component_overview')) {
+                        sourcePage = 'component_overview';
+                    } else if (path.includes('/bike_details')) {
+                        sourcePage = 'bike_details';
+                    } else if (path.includes('/component_details')) {
+                        sourcePage = 'component_details';
+                    } else if (path.includes('/collection_details')) {
+                        sourcePage = 'collection_details';
+                    }
 
-                // Create and submit the form
-                const formData = new FormData();
-                formData.append('record_id', recordId);
-                formData.append('table_selector', tableSelector);
-                formData.append('source_page', sourcePage);
+                    // Create and submit the form
+                    const formData = new FormData();
+                    formData.append('record_id', recordId);
+                    formData.append('table_selector', tableSelector);
+                    formData.append('source_page', sourcePage);
 
-                const form = document.createElement('form');
-                form.method = 'POST';
-                form.action = '/delete_record';
+                    const form = document.createElement('form');
+                    form.method = 'POST';
+                    form.action = '/delete_record';
                 
-                for (let [key, value] of formData.entries()) {
-                    const input = document.createElement('input');
-                    input.type = 'hidden';
-                    input.name = key;
-                    input.value = value;
-                    form.appendChild(input);
-                }
+                    for (let [key, value] of formData.entries()) {
+                        const input = document.createElement('input');
+                        input.type = 'hidden';
+                        input.name = key;
+                        input.value = value;
+                        form.appendChild(input);
+                    }
                 
-                document.body.appendChild(form);
-                form.submit();
-            }, { once: true }); // Ensure the event listener is only added once
+                    document.body.appendChild(form);
+                    form.submit();
+                }, { once: true }); // Ensure the event listener is only added once
             
-            // Handle cancel action (modal will close automatically)
-            document.getElementById('cancelAction').addEventListener('click', function handleCancel() {
-                this.removeEventListener('click', handleCancel);
-            }, { once: true });
+                // Handle cancel action (modal will close automatically)
+                document.getElementById('cancelAction').addEventListener('click', function handleCancel() {
+                    this.removeEventListener('click', handleCancel);
+                }, { once: true });
+            });
         });
-    });
+    }
+
+    bindDeleteButtons(document);
+    document.addEventListener('componentRowsAdded', event => bindDeleteButtons(event.detail.container));
 });
 
 // ----- Collection modals -----
@@ -1711,18 +1720,24 @@ window.forceCloseLoadingModal = function() {
             document.getElementById('quick-swap-collection-warning').classList.add('d-none');
         });
 
-        document.querySelectorAll('.quick-swap-btn').forEach(button => {
-            button.addEventListener('click', function(e) {
-                e.preventDefault();
-                e.stopPropagation();
+        // Buttons in rows loaded later are bound when the componentRowsAdded event arrives
+        function bindQuickSwapButtons(container) {
+            container.querySelectorAll('.quick-swap-btn').forEach(button => {
+                button.addEventListener('click', function(e) {
+                    e.preventDefault();
+                    e.stopPropagation();
 
-                const componentId = this.dataset.componentId;
-                selectedOldComponent = componentId;
+                    const componentId = this.dataset.componentId;
+                    selectedOldComponent = componentId;
 
-                const modal = new bootstrap.Modal(document.getElementById('quickSwapModal'));
-                modal.show();
+                    const modal = new bootstrap.Modal(document.getElementById('quickSwapModal'));
+                    modal.show();
+                });
             });
-        });
+        }
+
+        bindQuickSwapButtons(document);
+        document.addEventListener('componentRowsAdded', event => bindQuickSwapButtons(event.detail.container));
 
         document.getElementById('create_new_component').addEventListener('change', function() {
             const createNewForm = document.getElementById('create_new_form');
@@ -2271,265 +2286,220 @@ document.addEventListener('DOMContentLoaded', function() {
 // Component overview page functions
 // ====================================================================================
 
-// ----- Table sorting functionality -----
+// ----- All components table -----
 
-// Script to sort component table
+// Script to load the all components table page by page from the component list API.
+// Sorting, status filters and search are applied by the server, so only the rows shown are sent to the browser
 document.addEventListener('DOMContentLoaded', function() {
     // Check if we're on the component overview page
     if (document.querySelector('h1#component-overview') === null) return;
-    
-    const table = document.querySelector('#componentsTable');
-    const headers = table.querySelectorAll('th');
-    const tableBody = table.querySelector('tbody');
-    const rows = tableBody.querySelectorAll('tr');
 
-    // Skip if there are no rows or just one "no components" message row
-    if (rows.length === 0 || (rows.length === 1 && rows[0].cells.length === 1)) return;
+    const table = document.getElementById('componentsTable');
+    if (!table) return;
 
-    // Sorting function
-    const sortColumn = (index, asc = true) => {
-        const nodeList = Array.from(rows);
-        const compare = (rowA, rowB) => {
-            // Skip if td doesn't exist in row (for the "no components registered" row)
-            if (!rowA.querySelectorAll('td')[index] || !rowB.querySelectorAll('td')[index]) return 0;
-            
-            // Get cell content and prepare for comparison
-            let cellA = rowA.querySelectorAll('td')[index].innerText.trim();
-            let cellB = rowB.querySelectorAll('td')[index].innerText.trim();
-            
-            // Different handling based on column type
-            switch(index) {
-                case 0: // Component column
-                    // Remove emojis and compare case-insensitively for text columns
-                    cellA = cellA.replace(/[\u{1F300}-\u{1F6FF}\u{2600}-\u{26FF}⚡💤⛔🟢🟡🔴🟣⚪]/gu, '').trim().toLowerCase();
-                    cellB = cellB.replace(/[\u{1F300}-\u{1F6FF}\u{2600}-\u{26FF}⚡💤⛔🟢🟡🔴🟣⚪]/gu, '').trim().toLowerCase();
-                    break;
-                    
-                case 1: // Collection column
-                    // Case-insensitive text sorting for collection names
-                    cellA = cellA.toLowerCase();
-                    cellB = cellB.toLowerCase();
-                    break;
-                    
-                case 2: // Type column
-                    // Remove emojis and compare case-insensitively for text columns
-                    cellA = cellA.replace(/[\u{1F300}-\u{1F6FF}\u{2600}-\u{26FF}⚡💤⛔🟢🟡🔴🟣⚪]/gu, '').trim().toLowerCase();
-                    cellB = cellB.replace(/[\u{1F300}-\u{1F6FF}\u{2600}-\u{26FF}⚡💤⛔🟢🟡🔴🟣⚪]/gu, '').trim().toLowerCase();
-                    break;
-                    
-                case 3: // Distance column
-                    // Extract numeric value from "X km" format
-                    cellA = parseFloat(cellA.replace(/[^\d.-]/g, '')) || 0;
-                    cellB = parseFloat(cellB.replace(/[^\d.-]/g, '')) || 0;
-                    break;
-                    
-                case 4: // Status column
-                    // Remove emojis, then normalize status for comparison
-                    cellA = cellA.replace(/[\u{1F300}-\u{1F6FF}\u{2600}-\u{26FF}⚡💤⛔🟢🟡🔴🟣⚪]/gu, '').trim();
-                    cellB = cellB.replace(/[\u{1F300}-\u{1F6FF}\u{2600}-\u{26FF}⚡💤⛔🟢🟡🔴🟣⚪]/gu, '').trim();
-                    
-                    // Create custom order for statuses
-                    const statusOrder = {
-                        "Installed": 1,
-                        "Not installed": 2,
-                        "Retired": 3
-                    };
-                    
-                    cellA = statusOrder[cellA] || 999;
-                    cellB = statusOrder[cellB] || 999;
-                    break;
-                    
-                case 5: // Lifetime column
-                case 6: // Service column
-                    // Sort by emoji priority (critical components first when ascending)
-                    const emojiPriority = { '🔴': 1, '🟡': 2, '🟢': 3, '⚪': 4, '❓': 5 };
-                    // Use alternation to match specific status emojis (not trigger emojis like 📍📅)
-                    const emojiA = cellA.match(/🔴|🟡|🟢|⚪|❓/)?.[0] || '❓';
-                    const emojiB = cellB.match(/🔴|🟡|🟢|⚪|❓/)?.[0] || '❓';
-                    cellA = emojiPriority[emojiA] || 5;
-                    cellB = emojiPriority[emojiB] || 5;
-                    break;
-                    
-                case 7: // Bike column
-                    // Remove emojis and compare case-insensitively for text columns
-                    cellA = cellA.replace(/[\u{1F300}-\u{1F6FF}\u{2600}-\u{26FF}⚡💤⛔🟢🟡🔴🟣⚪]/gu, '').trim().toLowerCase();
-                    cellB = cellB.replace(/[\u{1F300}-\u{1F6FF}\u{2600}-\u{26FF}⚡💤⛔🟢🟡🔴🟣⚪]/gu, '').trim().toLowerCase();
-                    break;
-            }
-            
-            // Compare based on formatted values
-            if (typeof cellA === 'number' && typeof cellB === 'number') {
-                return asc ? cellA - cellB : cellB - cellA;
-            } else {
-                return asc ? (cellA > cellB ? 1 : -1) : (cellA < cellB ? 1 : -1);
-            }
-        };
-        
-        // Sort and reattach rows
-        nodeList.sort(compare);
-        nodeList.forEach(node => tableBody.appendChild(node));
-    };
+    const headers = table.querySelectorAll('th[data-sort]');
+    const statusBody = document.getElementById('componentsTableStatus');
+    const loadMoreButton = document.getElementById('loadMoreComponents');
+    const searchInput = document.getElementById('allComponentsSearchInput');
+    const filterSwitches = document.querySelectorAll('.filter-switch');
+    const pageSize = 100;
 
-    // Add click event to table headers (skip the last column with delete button)
-    headers.forEach((header, index) => {
-        // Skip the last column with delete buttons
-        if (index === headers.length - 1) return;
-        
-        header.addEventListener('click', () => {
-            const columnIndex = header.cellIndex;
-            const isAscending = !header.classList.contains('sorted-asc');
-            
-            // Remove sorted classes from all headers
-            headers.forEach(h => h.classList.remove('sorted-asc', 'sorted-desc'));
-            
-            // Add appropriate class to clicked header
-            header.classList.add(isAscending ? 'sorted-asc' : 'sorted-desc');
-            
-            sortColumn(columnIndex, isAscending);
-        });
-    });
+    let sortBy = 'name';
+    let sortOrder = 'asc';
+    let nextCursor = null;
+    let requestCount = 0;
+    let searchTimer = null;
 
-    // Initial sort by Component column (index 0) in ascending order
-    if (headers.length > 0 && rows.length > 1) {
-        // Add sorted-asc class to the Component column header
-        headers[0].classList.add('sorted-asc');
-        
-        // Sort by Component column (index 0) in ascending order
-        sortColumn(0, true);
+    headers[0].classList.add('sorted-asc');
+
+    const lifetimeIcons = { 'OK': '🟢', 'Due for replacement': '🟡', 'Lifetime exceeded': '🔴', 'Not defined': '⚪' };
+    const serviceIcons = { 'OK': '🟢', 'Due for service': '🟡', 'Service interval exceeded': '🔴', 'Not defined': '⚪' };
+    const installationIcons = { 'Installed': '⚡', 'Not installed': '💤', 'Retired': '⛔' };
+    const triggerIcons = { 'distance': '📍', 'time': '📅', 'both': '📍📅' };
+
+    // Get installation statuses selected by the filter switches
+    function getSelectedStatuses() {
+        const statuses = [];
+        if (document.getElementById('showInstalledComponents').checked) statuses.push('Installed');
+        const notInstalledSwitch = document.getElementById('showNotInstalledComponents');
+        if (notInstalledSwitch && notInstalledSwitch.checked) statuses.push('Not installed');
+        if (document.getElementById('showRetiredComponents').checked) statuses.push('Retired');
+        return statuses;
     }
-});
 
-// Function for filtering table all components
-document.addEventListener('DOMContentLoaded', function() {
-    // Check if we're on the component overview page
-    if (document.querySelector('h1#component-overview') === null) return;
-    const componentsTable = document.getElementById('componentsTable');
-    if (!componentsTable) return;
+    function setStatusMessage(message) {
+        statusBody.innerHTML = '';
+        if (message === '') return;
+        const row = statusBody.insertRow();
+        const cell = row.insertCell();
+        cell.colSpan = 9;
+        cell.className = 'text-center text-secondary';
+        cell.textContent = message;
+    }
 
-    const filterSwitches = document.querySelectorAll('.filter-switch');
-    const componentRows = componentsTable.querySelectorAll('tbody tr');
+    function formatStatusCell(cell, status, icons, trigger) {
+        cell.className = 'text-center';
+        let text = icons[status] || '❓';
+        if (status !== 'OK' && status !== 'Not defined' && triggerIcons[trigger]) {
+            text += ` ${triggerIcons[trigger]}`;
+        }
+        cell.textContent = text;
+    }
 
-    function updateComponentRowVisibility() {
-        // Get switch states
-        const showInstalled = document.getElementById('showInstalledComponents').checked;
-        const showRetired = document.getElementById('showRetiredComponents').checked;
-        const notInstalledSwitch = document.getElementById('showNotInstalledComponents');
-        const showNotInstalled = notInstalledSwitch ? notInstalledSwitch.checked : false;
+    function createActionButton(className, icon, component, disabled) {
+        const button = document.createElement('button');
+        button.type = 'button';
+        button.className = `btn ${className === 'delete-record' ? 'btn-outline-danger' : 'btn-outline-primary'} btn-sm ${className} mb-1`;
+        button.dataset.componentId = component.component_id;
+        button.disabled = disabled;
+        button.textContent = icon;
+        button.addEventListener('click', event => event.stopPropagation());
+        return button;
+    }
 
-        componentRows.forEach(row => {
-            const statusCell = row.querySelector('td:nth-child(4)');
-            if (statusCell) {
-                const status = statusCell.textContent.trim();
-                const shouldShow = (
-                    (status.includes('⚡') && showInstalled) ||
-                    (status.includes('💤') && showNotInstalled) ||
-                    (status.includes('⛔') && showRetired)
-                );
-                row.style.display = shouldShow ? '' : 'none';
-            }
+    // Build a table row with the same content as the other component tables
+    function buildComponentRow(component) {
+        const row = document.createElement('tr');
+        row.dataset.status = component.installation_status;
+        row.setAttribute('role', 'button');
+        row.addEventListener('click', () => {
+            window.location = `/component_details/${encodeURIComponent(component.component_id)}`;
         });
+
+        let nameText = component.component_name;
+        if (component.planned_workplan) nameText += ' 📝';
+        if (component.open_incident) nameText += ' 🚨';
+        row.insertCell().textContent = nameText;
+
+        const collectionCell = row.insertCell();
+        const collectionSpan = document.createElement('span');
+        if (component.collection_name) {
+            collectionSpan.className = 'clickable';
+            collectionSpan.setAttribute('role', 'button');
+            collectionSpan.textContent = component.collection_name;
+            collectionSpan.addEventListener('click', event => {
+                event.stopPropagation();
+                window.location.href = `/collection_details/${encodeURIComponent(component.collection_id)}`;
+            });
+        } else {
+            collectionSpan.className = 'text-muted';
+            collectionSpan.textContent = '-';
+        }
+        collectionCell.appendChild(collectionSpan);
+
+        row.insertCell().textContent = component.component_type;
+        row.insertCell().textContent = `${component.component_distance} km`;
+        row.insertCell().textContent = `${installationIcons[component.installation_status] || ''} ${component.installation_status}`;
+        formatStatusCell(row.insertCell(), component.lifetime_status, lifetimeIcons, component.lifetime_trigger);
+        formatStatusCell(row.insertCell(), component.service_status, serviceIcons, component.service_trigger);
+        row.insertCell().textContent = component.bike_name;
+
+        const actionCell = row.insertCell();
+        actionCell.className = 'text-end';
+        const changeStatusButton = createActionButton('change-status-btn', '🔄', component, component.installation_status === 'Retired');
+        changeStatusButton.dataset.componentName = component.component_name;
+        changeStatusButton.dataset.installationStatus = component.installation_status;
+        changeStatusButton.dataset.bikeId = component.bike_id || '';
+        changeStatusButton.dataset.updatedDate = component.updated_date;
+        changeStatusButton.dataset.pageContext = 'component_overview';
+        changeStatusButton.dataset.collectionName = component.collection_name || '';
+        actionCell.append(changeStatusButton, ' ',
+                          createActionButton('quick-swap-btn', '♻', component, component.installation_status !== 'Installed'), ' ',
+                          createActionButton('delete-record', '🗑', component, false));
+
+        return row;
     }
 
-    // Add event listeners
+    // Fetch the next page, or the first page after sorting, filters or search changed
+    function loadComponents(reset) {
+        const requestId = ++requestCount;
+
+        if (reset) {
+            table.querySelectorAll('tbody.component-page').forEach(pageBody => pageBody.remove());
+            nextCursor = null;
+        }
+
+        const statuses = getSelectedStatuses();
+        if (statuses.length === 0) {
+            loadMoreButton.classList.add('d-none');
+            setStatusMessage('No components match your criteria');
+            return;
+        }
+
+        const params = new URLSearchParams({ status: statuses.join(','), sort_by: sortBy, order: sortOrder, limit: pageSize });
+        const searchTerm = searchInput ? searchInput.value.trim() : '';
+        if (searchTerm !== '') params.set('search', searchTerm);
+        if (nextCursor) params.set('cursor', nextCursor);
+
+        loadMoreButton.disabled = true;
+        if (reset) setStatusMessage('Loading components...');
+
+        fetch(`/api/components?${params}`)
+            .then(response => response.json().then(data => ({ ok: response.ok, data })))
+            .then(({ ok, data }) => {
+                if (requestId !== requestCount) return;
+                if (!ok) throw new Error(data.message);
+
+                const pageBody = document.createElement('tbody');
+                pageBody.className = 'component-page';
+                data.items.forEach(component => pageBody.appendChild(buildComponentRow(component)));
+                table.insertBefore(pageBody, statusBody);
+                document.dispatchEvent(new CustomEvent('componentRowsAdded', { detail: { container: pageBody } }));
+
+                nextCursor = data.next_cursor;
+                loadMoreButton.disabled = false;
+                loadMoreButton.classList.toggle('d-none', !nextCursor);
+
+                const shownRows = table.querySelectorAll('tbody.component-page tr').length;
+                if (shownRows > 0) {
+                    setStatusMessage('');
+                } else {
+                    setStatusMessage(searchTerm !== '' || table.dataset.componentCount !== '0' ? 'No components match your criteria' : 'No components registered');
+                }
+            })
+            .catch(error => {
+                if (requestId !== requestCount) return;
+                console.error('Error loading components:', error);
+                loadMoreButton.disabled = false;
+                setStatusMessage('Components could not be loaded');
+            });
+    }
+
+    headers.forEach(header => {
+        header.addEventListener('click', () => {
+            const isAscending = !header.classList.contains('sorted-asc');
+            headers.forEach(h => h.classList.remove('sorted-asc', 'sorted-desc'));
+            header.classList.add(isAscending ? 'sorted-asc' : 'sorted-desc');
+
+            sortBy = header.dataset.sort;
+            sortOrder = isAscending ? 'asc' : 'desc';
+            loadComponents(true);
+        });
+    });
+
     filterSwitches.forEach(switchElement => {
-        switchElement.addEventListener('change', updateComponentRowVisibility);
+        switchElement.addEventListener('change', () => loadComponents(true));
     });
 
-    // Initial visibility update
-    updateComponentRowVisibility();
-});
+    if (searchInput) {
+        searchInput.addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => loadComponents(true), 300);
+        });
 
-// Add search filtering functionality for all components table
-document.addEventListener('DOMContentLoaded', function() {
-    // Check if we're on the component overview page
-    if (document.querySelector('h1#component-overview') === null) return;
-    
-    const searchInput = document.getElementById('allComponentsSearchInput');
-    if (!searchInput) return;
-    
-    const table = document.querySelector('#componentsTable');
-    const rows = table.querySelectorAll('tbody tr');
-    const filterSwitches = document.querySelectorAll('.filter-switch');
-    
-    // Skip if there are no rows or just one "no components" message row
-    if (rows.length === 0 || (rows.length === 1 && rows[0].cells.length === 1)) return;
-    
-    // Function to update row visibility based on both filters and search
-    function updateRowVisibility() {
-        const searchTerm = searchInput.value.toLowerCase().trim();
-        
-        // Get current filter states
-        const showInstalled = document.getElementById('showInstalledComponents').checked;
-        const showRetired = document.getElementById('showRetiredComponents').checked;
-        const notInstalledSwitch = document.getElementById('showNotInstalledComponents');
-        const showNotInstalled = notInstalledSwitch ? notInstalledSwitch.checked : false;
-        
-        rows.forEach(row => {
-            // Skip the "no components registered" row
-            if (row.cells.length === 1 && row.cells[0].colSpan) {
-                return;
-            }
-            
-            // Check if row should be visible based on status filter
-            let visibleByFilter = false;
-            const status = row.getAttribute('data-status');
-            
-            if ((status === 'Installed' && showInstalled) ||
-                (status === 'Not installed' && showNotInstalled) ||
-                (status === 'Retired' && showRetired)) {
-                visibleByFilter = true;
+        // Clear search on Escape
+        searchInput.addEventListener('keyup', function(event) {
+            if (event.key === 'Escape' && this.value !== '') {
+                this.value = '';
+                clearTimeout(searchTimer);
+                loadComponents(true);
             }
-            
-            // Check if row matches search term
-            const name = row.cells[0].textContent.toLowerCase();
-            const collection = row.cells[1].textContent.toLowerCase();
-            const type = row.cells[2].textContent.toLowerCase();
-            const bike = row.cells[7].textContent.toLowerCase();
-            const rowText = `${name} ${collection} ${type} ${bike}`;
-            const matchesSearch = searchTerm === '' || rowText.includes(searchTerm);
-            
-            // Show row only if it matches both filter and search criteria
-            row.style.display = (visibleByFilter && matchesSearch) ? '' : 'none';
         });
-        
-        // Show a message if no results found
-        const visibleRows = Array.from(rows).filter(row => row.style.display !== 'none');
-        const noResultsRow = table.querySelector('.no-results-row');
-        
-        if (visibleRows.length === 0 && (searchTerm !== '' || showInstalled || showNotInstalled || showRetired)) {
-            if (!noResultsRow) {
-                const tbody = table.querySelector('tbody');
-                const newRow = document.createElement('tr');
-                newRow.className = 'no-results-row';
-                newRow.innerHTML = '<td colspan="9" class="text-center">No components match your criteria</td>';
-                tbody.appendChild(newRow);
-            } else {
-                noResultsRow.style.display = '';
-            }
-        } else if (noResultsRow) {
-            noResultsRow.style.display = 'none';
-        }
     }
-    
-    // Listen for search input changes
-    searchInput.addEventListener('input', updateRowVisibility);
-    
-    // Listen for filter changes
-    filterSwitches.forEach(switchElement => {
-        switchElement.addEventListener('change', updateRowVisibility);
-    });
-    
-    // Clear search button
-    searchInput.addEventListener('keyup', function(event) {
-        if (event.key === 'Escape') {
-            this.value = '';
-            // Update visibility after clearing
-            updateRowVisibility();
-        }
-    });
-    
-    // Initial call to apply filter states on page load
-    updateRowVisibility();
+
+    loadMoreButton.addEventListener('click', () => loadComponents(false));
+
+    loadComponents(true);
 });
 
 // Initialize collections table search and sort functionality
@@ -6491,12 +6461,17 @@ function handleUpdate(endpoint, message) {
     
     // Show the loading modal with custom message
     document.getElementById('loadingMessage').textContent = message;
+    setLoadingProgress('');
     loadingModal.show();
 
-    // Make the API call
+    // Make the API call, which queues a background job when it returns a job id
     fetch(endpoint)
         .then(response => response.json())
         .then(data => {
+            if (data.success && data.job_id) {
+                pollJob(data.job_id);
+                return;
+            }
             loadingModal.hide();
             showToast(data.message, data.success);
         })
@@ -6506,6 +6481,54 @@ function handleUpdate(endpoint, message) {
         });
 }
 
+// Function to poll a background job and show its stage and counters in the loading modal
+function pollJob(jobId) {
+    fetch(`/jobs/${jobId}`, { cache: 'no-store' })
+        .then(response => response.json())
+        .then(job => {
+            if (job.status === 'succeeded' || job.status === 'failed') {
+                loadingModal.hide();
+                setLoadingProgress('');
+                showToast(job.message, job.success);
+                return;
+            }
+            if (job.status === undefined) {
+                loadingModal.hide();
+                showToast(job.message, false);
+                return;
+            }
+            setLoadingProgress(formatJobProgress(job));
+            setTimeout(() => pollJob(jobId), 1000);
+        })
+        .catch(error => {
+            loadingModal.hide();
+            showToast('Lost track of the update. Check the log for the outcome', false);
+        });
+}
+
+function formatJobProgress(job) {
+    const labels = {
+        pages_fetched: 'pages fetched',
+        rides_fetched: 'rides fetched',
+        rides_written: 'rides written',
+        rides_changed: 'rides new or changed',
+        bikes_refreshed: 'bikes refreshed',
+        bikes_recomputed: 'bikes recomputed',
+        components_recomputed: 'components recomputed'
+    };
+    const counters = Object.entries(job.progress)
+        .filter(([key]) => key in labels)
+        .map(([key, value]) => `${value} ${labels[key]}`);
+    return counters.length > 0 ? `${job.stage}: ${counters.join(', ')}` : job.stage;
+}
+
+function setLoadingProgress(text) {
+    const progressElement = document.getElementById('loadingProgress');
+    if (!progressElement) return;
+    progressElement.textContent = text;
+    progressElement.classList.toggle('d-none', text === '');
+}
+
 // ====================================================================================
 // Footer page functions
 // ====================================================================================